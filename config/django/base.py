@@ -51,6 +51,7 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = 'accounts_jwt.CustomUser'
 
 MIDDLEWARE = [
+    'images.middleware.TracingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -58,6 +59,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'images.middleware.TrafficCaptureMiddleware',
+    'images.middleware.RateLimitHeadersMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -135,6 +138,10 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_ROOT = BASE_DIR / 'media'
 MEDIA_URL = '/media/'
 
+# Where X-Profile requests save their profiles. Kept out of MEDIA_ROOT: they are only
+# served to staff, by the image-profile endpoint.
+IMAGE_PROFILE_ROOT = env('IMAGE_PROFILE_ROOT', default=str(BASE_DIR / 'profiles'))
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -162,6 +169,97 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
 }
 
+# Opt-in sampled capture of image conversion traffic, replayed with `manage.py replay_traffic`.
+# Raw uploads are only kept when STORE_IMAGES is enabled.
+IMAGE_TRAFFIC_CAPTURE = {
+    'ENABLED': env.bool('IMAGE_TRAFFIC_CAPTURE', default=False),
+    'SAMPLE_RATE': env.float('IMAGE_TRAFFIC_SAMPLE_RATE', default=0.05),
+    'LOG_PATH': env('IMAGE_TRAFFIC_LOG', default=str(BASE_DIR / 'traffic' / 'capture.jsonl')),
+    'STORE_IMAGES': env.bool('IMAGE_TRAFFIC_STORE_IMAGES', default=False),
+}
+
+# Admission control for POST /api/image/: requests whose planned pixel count, peak memory or
+# CPU time exceeds their tier's budget get 413; when the estimated peak bytes of in-flight
+# conversions would exceed MAX_INFLIGHT_BYTES, requests wait up to QUEUE_TIMEOUT seconds and
+# then get 503 with Retry-After.
+IMAGE_ADMISSION = {
+    'ENABLED': env.bool('IMAGE_ADMISSION', default=True),
+    'TIERS': {
+        'anonymous': {
+            'MAX_PIXELS': env.int('IMAGE_ANON_MAX_PIXELS', default=25_000_000),
+            'MAX_PEAK_BYTES': env.int('IMAGE_ANON_MAX_PEAK_BYTES', default=512 * 1024 ** 2),
+            'MAX_ESTIMATED_MS': env.float('IMAGE_ANON_MAX_ESTIMATED_MS', default=10_000),
+        },
+        'authenticated': {
+            'MAX_PIXELS': env.int('IMAGE_USER_MAX_PIXELS', default=100_000_000),
+            'MAX_PEAK_BYTES': env.int('IMAGE_USER_MAX_PEAK_BYTES', default=2 * 1024 ** 3),
+            'MAX_ESTIMATED_MS': env.float('IMAGE_USER_MAX_ESTIMATED_MS', default=60_000),
+        },
+    },
+    'MAX_INFLIGHT_BYTES': env.int('IMAGE_MAX_INFLIGHT_BYTES', default=2 * 1024 ** 3),
+    'QUEUE_TIMEOUT': env.float('IMAGE_ADMISSION_QUEUE_TIMEOUT', default=2.0),
+    'RETRY_AFTER': env.int('IMAGE_ADMISSION_RETRY_AFTER', default=5),
+}
+
+# Shortest-job-first scheduling of admitted conversions. SLOTS conversions run at once per process
+# (default: one per CPU); waiting jobs are picked by tier share, per-user usage and estimated cost,
+# and AGING_RATE ms of cost are forgiven per ms waited so large jobs are not starved.
+IMAGE_SCHEDULER = {
+    'ENABLED': env.bool('IMAGE_SCHEDULER', default=True),
+    'SLOTS': env.int('IMAGE_SCHEDULER_SLOTS', default=0),
+    'SHARES': {
+        'authenticated': env.float('IMAGE_SCHEDULER_USER_SHARE', default=3.0),
+        'anonymous': env.float('IMAGE_SCHEDULER_ANON_SHARE', default=1.0),
+    },
+    'AGING_RATE': env.float('IMAGE_SCHEDULER_AGING_RATE', default=1.0),
+    'QUEUE_TIMEOUT': env.float('IMAGE_SCHEDULER_QUEUE_TIMEOUT', default=30.0),
+    'RETRY_AFTER': env.int('IMAGE_SCHEDULER_RETRY_AFTER', default=5),
+}
+
+# Where conversions run. The async endpoint hands requests to a pool of MAX_WORKERS threads
+# (0: four per CPU). BACKEND "thread" transforms on that request thread; "process" sends the
+# upload's bytes to one of POOL_WORKERS worker processes (0: one per CPU). The scheduler's SLOTS still bound how many
+# conversions transform at once. BAND_WORKERS threads (0: one per CPU, 1: off) split single large
+# filters and resizes into horizontal bands; they are shared by all conversions of a worker.
+IMAGE_EXECUTOR = {
+    'BACKEND': env('IMAGE_EXECUTOR_BACKEND', default='thread'),
+    'MAX_WORKERS': env.int('IMAGE_EXECUTOR_MAX_WORKERS', default=0),
+    'POOL_WORKERS': env.int('IMAGE_EXECUTOR_POOL_WORKERS', default=0),
+    'BAND_WORKERS': env.int('IMAGE_EXECUTOR_BAND_WORKERS', default=0),
+}
+
+# Micro-batching of concurrent conversions with the same config (images.batching), off by default.
+# The first request waits up to WINDOW_MS (at most 50) for others to join, or until MAX_BATCH have;
+# the batch then runs as one call, on the worker pool if there is one. Only inputs of up to
+# MAX_PIXELS pixels are batched.
+IMAGE_BATCHING = {
+    'ENABLED': env.bool('IMAGE_BATCHING_ENABLED', default=False),
+    'WINDOW_MS': env.float('IMAGE_BATCHING_WINDOW_MS', default=5.0),
+    'MAX_BATCH': env.int('IMAGE_BATCHING_MAX_BATCH', default=16),
+    'MAX_PIXELS': env.int('IMAGE_BATCHING_MAX_PIXELS', default=1_000_000),
+}
+
+# Store for the cost-weighted throttles' token buckets (images.throttling). BACKEND is "sqlite"
+# (a local file shared by the workers on one host), "cache" (a Django cache alias shared across
+# hosts) or a dotted path to a BudgetStore subclass. OPTIONS go to its constructor.
+IMAGE_THROTTLE = {
+    'BACKEND': env('IMAGE_THROTTLE_BACKEND', default='sqlite'),
+    'OPTIONS': env.json('IMAGE_THROTTLE_OPTIONS', default={}),
+}
+
+# Per-request tracing spans. EXPORTER is "console", "file", "memory" or a dotted path to a
+# SpanExporter subclass; leave it empty to disable tracing. OPTIONS go to its constructor.
+IMAGE_TRACING = {
+    'EXPORTER': env('IMAGE_TRACING_EXPORTER', default=''),
+    'OPTIONS': env.json('IMAGE_TRACING_OPTIONS', default={}),
+}
+
+# Directory each worker process publishes its /metrics histograms to after every request
+# (images.metrics). /metrics then sums every worker's series, including those of recycled
+# workers. config/gunicorn.py points it at a fresh temporary directory; leave it empty to
+# serve only the answering process's series.
+IMAGE_METRICS_DIR = env('IMAGE_METRICS_DIR', default='')
+
 # Set the email backend
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -17,12 +17,13 @@ DEFAULT_FILE_STORAGE = env('DEFAULT_FILE_STORAGE')
 
 REST_FRAMEWORK = {
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'images.throttling.AnonCostRateThrottle',
+        'images.throttling.UserCostRateThrottle'
     ],
+    # Seconds of estimated conversion time per period; see images.throttling.CostRateThrottle.
     'DEFAULT_THROTTLE_RATES': {
-        'anon': '10/day',
-        'user': '50/day'
+        'anon_cost': env('ANON_COST_RATE', default='30/day'),
+        'user_cost': env('USER_COST_RATE', default='300/day')
     }
 }
 
@@ -0,0 +1,80 @@
+"""
+Gunicorn configuration for production serving.
+
+    gunicorn -c config/gunicorn.py config.wsgi:application
+
+The app is preloaded in the master, which then imports the transform registry,
+every Pillow codec and the cost model and primes each codec (`images.warmup`)
+before forking, so workers share those pages copy-on-write and are ready from
+their first request. Workers are recycled after `GUNICORN_MAX_REQUESTS`
+requests, or as soon as their resident memory exceeds `GUNICORN_MAX_RSS_MB`.
+
+Workers publish their `/metrics` histograms to `IMAGE_METRICS_DIR` (a fresh
+temporary directory unless set), which every scrape merges; the master folds
+the series of each exited worker into an archive there, so totals survive
+recycling.
+
+For the async endpoint, serve `config.asgi:application` with an ASGI worker
+class, e.g. `GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker`.
+"""
+import gc
+import os
+import resource
+import tempfile
+
+# Gunicorn reads this file before the project is importable, so settings come straight from the environment.
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', os.cpu_count() or 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+preload_app = True
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+max_rss_mb = int(os.environ.get('GUNICORN_MAX_RSS_MB', 1024))
+
+if not os.environ.get('IMAGE_METRICS_DIR'):
+    os.environ['IMAGE_METRICS_DIR'] = tempfile.mkdtemp(prefix='image-metrics-')
+
+accesslog = '-'
+errorlog = '-'
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process, from /proc where available, else its peak."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def on_starting(server):
+    from images.metrics import reset_directory
+    from images.warmup import warm_up
+
+    reset_directory(os.environ['IMAGE_METRICS_DIR'])
+
+    warmup = warm_up()
+    server.log.info("Warmup %s in %.1f ms: %s", warmup["state"], warmup["duration_ms"], warmup["codecs"])
+    for image_format, error in warmup["errors"].items():
+        server.log.error("Codec %s failed to prime: %s", image_format, error)
+    # Keep everything loaded so far out of the collector, so collections in the
+    # workers do not write to (and un-share) the master's pages.
+    gc.freeze()
+
+
+def post_request(worker, req, environ, resp):
+    rss = current_rss_bytes()
+    if max_rss_mb and rss > max_rss_mb * 1024 ** 2:
+        worker.log.info("Worker %s RSS %d MiB exceeds %d MiB; recycling", worker.pid, rss // 1024 ** 2, max_rss_mb)
+        worker.alive = False
+
+
+def child_exit(server, worker):
+    from images.metrics import archive_snapshot
+
+    archive_snapshot(os.environ['IMAGE_METRICS_DIR'], worker.pid)
@@ -20,12 +20,17 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from images.views import LivenessView, MetricsView, ReadinessView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('auth/', include('djoser.urls')),
     path('auth/', include('djoser.urls.jwt')),
     path('api/', include('accounts_jwt.urls')),
     path('api/', include('images.urls')),
+    path('metrics', MetricsView.as_view(), name='metrics'),
+    path('healthz', LivenessView.as_view(), name='healthz'),
+    path('readyz', ReadinessView.as_view(), name='readyz'),
 
     # drf-spectacular
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
@@ -0,0 +1,173 @@
+import threading
+import time
+from functools import lru_cache
+from typing import Any
+
+from PIL import Image
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.response import Response
+
+from .planner import plan_upload
+
+
+class WeightedSemaphore:
+    """
+    A semaphore whose permits are units of weight (here: bytes of pixel buffers).
+
+    A request heavier than the whole capacity is clamped to it, so it can still
+    run, but only alone.
+
+    Args:
+        capacity (int): Total weight that may be held at once.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_use = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, weight: int, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for `weight` to fit; return whether it was acquired."""
+        weight = min(weight, self.capacity)
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self.in_use + weight > self.capacity:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            self.in_use += weight
+            return True
+
+    def release(self, weight: int) -> None:
+        with self._condition:
+            self.in_use -= min(weight, self.capacity)
+            self._condition.notify_all()
+
+
+class Admission:
+    """
+    An admitted request's hold on the in-flight budget; release it with `with` or `release()`.
+
+    Attributes:
+        tier (str): The budget tier the request was checked against.
+        plan (dict): The EXPLAIN plan the estimates come from.
+        weight (int): Estimated peak bytes held on the semaphore.
+    """
+
+    def __init__(self, semaphore: WeightedSemaphore | None, tier: str, plan: dict | None, weight: int):
+        self.semaphore = semaphore
+        self.tier = tier
+        self.plan = plan
+        self.weight = weight
+
+    def release(self) -> None:
+        if self.semaphore is not None:
+            self.semaphore.release(self.weight)
+            self.semaphore = None
+
+    def __enter__(self) -> "Admission":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class AdmissionController:
+    """
+    Decide, before decoding, whether a conversion may run in this process.
+
+    The image header and config are planned with `plan_upload`. The
+    request is rejected with 413 when its pixel count, estimated peak memory or
+    estimated CPU time exceeds its tier's budget (this is also the
+    decompression-bomb guard: a tiny file with huge header dimensions never gets
+    decoded). Admitted requests then hold their estimated peak bytes on a
+    process-wide weighted semaphore, waiting up to `QUEUE_TIMEOUT` seconds;
+    when it stays saturated the request gets 503 with `Retry-After`.
+
+    Configured through `settings.IMAGE_ADMISSION`.
+    """
+
+    def __init__(self, options: dict[str, Any]):
+        self.enabled: bool = options.get("ENABLED", True)
+        self.tiers: dict[str, dict[str, float | None]] = options.get("TIERS", {})
+        self.queue_timeout: float = options.get("QUEUE_TIMEOUT", 2.0)
+        self.retry_after: int = options.get("RETRY_AFTER", 5)
+        self.semaphore = WeightedSemaphore(options.get("MAX_INFLIGHT_BYTES", 1024 ** 3))
+
+    @staticmethod
+    def tier_for(user) -> str:
+        """Return "authenticated" or "anonymous" for `user`."""
+        return "authenticated" if user is not None and user.is_authenticated else "anonymous"
+
+    def over_budget(self, tier: str, plan: dict) -> str | None:
+        """Describe the first budget `plan` exceeds for `tier`, or None if it fits."""
+        budget = self.tiers.get(tier, {})
+        pixels = max(
+            step["output"]["width"] * step["output"]["height"]
+            for step in plan["steps"] if "width" in step["output"]
+        )
+        checks = (
+            ("MAX_PIXELS", pixels, "pixels"),
+            ("MAX_PEAK_BYTES", plan["estimated_peak_bytes"], "bytes of peak memory"),
+            ("MAX_ESTIMATED_MS", plan["estimated_ms"], "ms of estimated CPU time"),
+        )
+        for name, value, unit in checks:
+            limit = budget.get(name)
+            if limit is not None and value > limit:
+                return f"Request needs {value:,.0f} {unit}; the {tier} limit is {limit:,.0f}."
+        return None
+
+    def admit(self, request, image_file, config: dict) -> Admission | Response:
+        """
+        Check one conversion against its tier's budget and the in-flight limit.
+
+        Args:
+            request: The conversion request; its user picks the tier (anonymous
+                users have their own), and the cost throttle may already have
+                planned it (see `plan_upload`).
+            image_file: The uploaded file; only its header is read.
+            config (dict): The parsed conversion config.
+
+        Returns:
+            Admission: Hold it while the image is decoded, transformed and encoded.
+            Response: 400 for invalid params, 413 when over budget, 503 when saturated.
+        """
+        tier = self.tier_for(request.user)
+        if not self.enabled:
+            return Admission(semaphore=None, tier=tier, plan=None, weight=0)
+
+        try:
+            plan = plan_upload(request, image_file, config)
+        except Image.DecompressionBombError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        except (ValueError, TypeError, OSError, NotImplementedError) as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        reason = self.over_budget(tier, plan)
+        if reason is not None:
+            return Response({"detail": reason}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        weight = plan["estimated_peak_bytes"]
+        if not self.semaphore.acquire(weight, timeout=self.queue_timeout):
+            return Response(
+                {"detail": "Server is busy converting other images; retry later."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        return Admission(semaphore=self.semaphore, tier=tier, plan=plan, weight=weight)
+
+
+@lru_cache(maxsize=None)
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide controller configured by `settings.IMAGE_ADMISSION`."""
+    return AdmissionController(getattr(settings, "IMAGE_ADMISSION", {}))
+
+
+@receiver(setting_changed)
+def reset_admission_controller(setting, **kwargs) -> None:
+    if setting == "IMAGE_ADMISSION":
+        get_admission_controller.cache_clear()
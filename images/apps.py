@@ -6,4 +6,9 @@ class ImagesConfig(AppConfig):
     name = 'images'
 
     def ready(self):
+        from django.core.signals import request_finished
+
         import images.signals
+        from images.metrics import publish_metrics
+
+        request_finished.connect(publish_metrics, dispatch_uid="images.publish_metrics")
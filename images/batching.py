@@ -0,0 +1,164 @@
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .executor import get_worker_pool
+from .metrics import BATCH_SIZE
+from .services import config_hash
+from .workers import convert_batch
+
+# Upper bound on WINDOW_MS: a batch never holds its first request back longer than this.
+MAX_WINDOW_MS = 50.0
+
+RunBatch = Callable[[list[bytes], dict], list[Any]]
+
+
+class Batch:
+    """Requests with the same plan waiting to run together."""
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.items: list[bytes] = []
+        self.futures: list[Future] = []
+        self.full = threading.Event()
+
+
+class MicroBatcher:
+    """
+    Groups concurrent conversions of the same plan into one execution.
+
+    The first request for a plan opens a batch and waits up to `window_ms`
+    for others to join (less if `max_batch` requests arrive first); it then
+    runs the whole batch with one call of `run` and hands every waiting
+    request its own result. A request therefore waits at most one window plus
+    the time its batch takes to run.
+
+    Args:
+        run: Converts a list of uploads sharing a config, returning one
+            result or exception per upload.
+        window_ms (float): How long a batch stays open, at most `MAX_WINDOW_MS`.
+        max_batch (int): Requests after which a batch runs without waiting further.
+
+    Raises:
+        ValueError: If `window_ms` or `max_batch` is out of range.
+    """
+
+    def __init__(self, run: RunBatch, window_ms: float, max_batch: int):
+        if not 0 <= window_ms <= MAX_WINDOW_MS:
+            raise ValueError(f"window_ms must be between 0 and {MAX_WINDOW_MS}; got {window_ms}")
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be at least 1; got {max_batch}")
+        self.run = run
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._open: dict[str, Batch] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, data: bytes, config: dict) -> Any:
+        """
+        Convert `data` together with other concurrent requests for the same `key`.
+
+        Blocks until its batch has run.
+
+        Args:
+            key (str): The plan signature; requests only share a batch with equal keys.
+            data (bytes): The uploaded file's content.
+            config (dict): The conversion config `key` was derived from.
+
+        Returns:
+            The result `run` produced for `data`.
+
+        Raises:
+            Exception: Whatever converting `data` raised.
+        """
+        future: Future = Future()
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._open[key] = Batch(config)
+            batch.items.append(data)
+            batch.futures.append(future)
+            if len(batch.items) >= self.max_batch:
+                del self._open[key]
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._open.get(key) is batch:
+                    del self._open[key]
+            self.execute(batch)
+        return future.result()
+
+    def execute(self, batch: Batch) -> None:
+        """Run `batch` and resolve each of its futures."""
+        BATCH_SIZE.observe(len(batch.items))
+        try:
+            results = self.run(batch.items, batch.config)
+        except Exception as e:
+            results = [e] * len(batch.items)
+        for future, result in zip(batch.futures, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+def run_batch(data: list[bytes], config: dict) -> list[Any]:
+    """Convert a batch on the worker pool in one dispatch, or on this thread without one."""
+    pool = get_worker_pool()
+    if pool is None:
+        return convert_batch(data, config)
+    return pool.submit(convert_batch, data, config).result()
+
+
+class BatchingGate:
+    """
+    Applies `settings.IMAGE_BATCHING` to scheduled conversions; a no-op when disabled.
+    """
+
+    def __init__(self, options: dict[str, Any]):
+        self.enabled: bool = options.get("ENABLED", False)
+        self.max_pixels: int = options.get("MAX_PIXELS", 1_000_000)
+        self.batcher = MicroBatcher(
+            run=run_batch,
+            window_ms=options.get("WINDOW_MS", 5.0),
+            max_batch=options.get("MAX_BATCH", 16),
+        )
+
+    def accepts(self, plan: dict | None) -> bool:
+        """Return whether a conversion with this EXPLAIN plan may wait for a batch."""
+        if not self.enabled or plan is None:
+            return False
+        return plan["input"]["width"] * plan["input"]["height"] <= self.max_pixels
+
+    def convert(self, image_file, config: dict) -> tuple[bytes, str, str]:
+        """
+        Convert an upload as part of a batch of concurrent same-config requests.
+
+        Returns:
+            tuple[bytes, str, str]: The encoded output, its format and the original format.
+
+        Raises:
+            ValueError, TypeError: If a transformation rejects its parameters.
+        """
+        image_file.seek(0)
+        return self.batcher.submit(config_hash(config), image_file.read(), config)
+
+
+@lru_cache(maxsize=None)
+def get_batching() -> BatchingGate:
+    """Return the process-wide batching gate configured by `settings.IMAGE_BATCHING`."""
+    return BatchingGate(getattr(settings, "IMAGE_BATCHING", {}))
+
+
+@receiver(setting_changed)
+def reset_batching(setting, **kwargs) -> None:
+    if setting == "IMAGE_BATCHING":
+        get_batching.cache_clear()
@@ -0,0 +1,65 @@
+import json
+from collections import defaultdict
+from typing import Any, Iterable
+
+from images.cost_model import ANY_MODE, fit_linear
+from images.transformations import TRANSFORM_MAP
+
+Points = dict[str, dict[str, list[tuple[float, float]]]]
+
+
+def transform_points(rows: Iterable[dict[str, Any]]) -> Points:
+    """
+    Turn `bench_transforms` rows into (cost units, mean ms) samples per step and mode.
+
+    Cost units come from each transform's `output_shape` and `cost_units`, so
+    the fitted coefficients apply to any size and params, not just the
+    benchmarked ones. Unsupported cases and unregistered keys are skipped.
+    """
+    points: Points = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        transformer = TRANSFORM_MAP.get(row["key"])
+        if not row.get("supported") or transformer is None:
+            continue
+        size, params = (row["width"], row["height"]), json.loads(row["params"])
+        output_size, _ = transformer.output_shape(size, row["mode"], params)
+        units = transformer.cost_units(size, output_size, params)
+        points[f"transform.{row['key']}"][row["mode"]].append((units, row["mean_ms"]))
+    return points
+
+
+def codec_points(rows: Iterable[dict[str, Any]]) -> Points:
+    """
+    Turn `bench_codecs` rows into (pixels, ms) samples for "decode.<FORMAT>" and "encode.<FORMAT>.q<quality>".
+    """
+    points: Points = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        if not row.get("supported"):
+            continue
+        pixels = row["width"] * row["height"]
+        points[f"decode.{row['format']}"][row["mode"]].append((pixels, row["decode_ms"]))
+        points[f"encode.{row['format']}.q{row['quality']}"][row["mode"]].append((pixels, row["encode_ms"]))
+    return points
+
+
+def calibrate(transform_rows: Iterable[dict[str, Any]], codec_rows: Iterable[dict[str, Any]]) -> dict:
+    """
+    Fit cost model coefficients for every benchmarked step.
+
+    Each step gets one fit per benchmarked mode plus a "*" fit over all of them.
+
+    Args:
+        transform_rows: Results of `bench_transforms`.
+        codec_rows: Results of `bench_codecs`.
+
+    Returns:
+        dict: {step name: {mode: {"fixed_ms", "ms_per_munit", "samples"}}}, sorted by name.
+    """
+    points = {**transform_points(transform_rows), **codec_points(codec_rows)}
+    coefficients = {}
+    for name in sorted(points):
+        by_mode = points[name]
+        fits = {mode: fit_linear(samples) for mode, samples in sorted(by_mode.items())}
+        fits[ANY_MODE] = fit_linear([sample for samples in by_mode.values() for sample in samples])
+        coefficients[name] = fits
+    return coefficients
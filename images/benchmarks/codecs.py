@@ -0,0 +1,110 @@
+from io import BytesIO
+from itertools import product
+from typing import Any, Iterable
+
+from PIL import Image
+
+from images.benchmarks.corpus import SIZES, MODES, synthetic_image
+from images.benchmarks.measure import time_call, peak_rss_kib
+from images.models import FORMAT_CHOICES
+from images.services import save_conversion
+
+FORMATS: tuple[str, ...] = tuple(value for value, _ in FORMAT_CHOICES)
+QUALITIES: tuple[int, ...] = (60, 85, 100)
+METRICS: tuple[str, ...] = ("encode_ms", "decode_ms", "output_bytes", "peak_kib")
+
+
+def case_name(image_format: str, quality: int, size: tuple[int, int], mode: str) -> str:
+    """Return the stable identifier used to match a case against the baseline."""
+    return f"{image_format}/q{quality}/{size[0]}x{size[1]}/{mode}"
+
+
+def encode(image: Image.Image, image_format: str, quality: int) -> bytes:
+    """Encode `image` exactly as the conversion endpoint does."""
+    _, buffer, _ = save_conversion(
+        image=image,
+        original_name="bench.png",
+        original_format=image_format,
+        config={"format": image_format, "optimize": quality},
+    )
+    return buffer.getvalue()
+
+
+def decode(data: bytes) -> Image.Image:
+    """Fully decode `data` into pixel memory."""
+    image = Image.open(BytesIO(data))
+    image.load()
+    return image
+
+
+def run_case(
+        image_format: str,
+        quality: int,
+        size: tuple[int, int],
+        mode: str,
+        repeat: int = 3,
+        memory: bool = True
+) -> dict[str, Any]:
+    """
+    Measure one format/quality/size/mode combination.
+
+    Encoders that cannot write the mode (e.g. RGBA as JPEG) are reported with
+    `supported: False` rather than raising, so the matrix stays rectangular.
+
+    Args:
+        image_format (str): Pillow format name, e.g. "JPEG".
+        quality (int): Value passed as the `optimize` config key.
+        size (tuple[int, int]): Corpus image size.
+        mode (str): Corpus image mode.
+        repeat (int): Timed runs per measurement.
+        memory (bool): Whether to measure peak RSS in a forked child.
+
+    Returns:
+        dict: A report row with timings, throughput, output size and peak memory.
+    """
+    image = synthetic_image(size=size, mode=mode)
+    megapixels = size[0] * size[1] / 1_000_000
+    row: dict[str, Any] = {
+        "case": case_name(image_format, quality, size, mode),
+        "format": image_format,
+        "quality": quality,
+        "width": size[0],
+        "height": size[1],
+        "mode": mode,
+    }
+
+    try:
+        data = encode(image, image_format, quality)
+    except (OSError, ValueError, KeyError):
+        row["supported"] = False
+        return row
+
+    encode_stats = time_call(lambda: encode(image, image_format, quality), repeat=repeat)
+    decode_stats = time_call(lambda: decode(data), repeat=repeat)
+    row.update({
+        "supported": True,
+        "encode_ms": encode_stats["mean_ms"],
+        "encode_p95_ms": encode_stats["p95_ms"],
+        "encode_mps": megapixels / (encode_stats["mean_ms"] / 1000),
+        "decode_ms": decode_stats["mean_ms"],
+        "decode_p95_ms": decode_stats["p95_ms"],
+        "decode_mps": megapixels / (decode_stats["mean_ms"] / 1000),
+        "output_bytes": len(data),
+        "peak_kib": peak_rss_kib(lambda: decode(encode(image, image_format, quality))) if memory else None,
+    })
+    return row
+
+
+def run_matrix(
+        formats: Iterable[str] = FORMATS,
+        qualities: Iterable[int] = QUALITIES,
+        sizes: Iterable[tuple[int, int]] = SIZES.values(),
+        modes: Iterable[str] = MODES,
+        repeat: int = 3,
+        memory: bool = True
+) -> list[dict[str, Any]]:
+    """Run `run_case` for every combination of the given axes."""
+    return [
+        run_case(image_format, quality, size, mode, repeat=repeat, memory=memory)
+        for image_format, quality, size, mode in product(formats, qualities, sizes, modes)
+    ]
@@ -0,0 +1,186 @@
+import os
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable
+
+from PIL import Image
+
+from images.benchmarks.corpus import synthetic_image
+from images.benchmarks.measure import time_call
+from images.executor import build_executor
+from images.transformations import TRANSFORM_MAP
+from images.transformations.bands import BandPool, filter_in_bands, resize_in_bands
+from images.transformations.rank import rank_filter
+from images.workers import convert
+
+WORKERS: tuple[int, ...] = (1, 2, 4, 8)
+
+SCALING_CONFIG: dict[str, Any] = {
+    "resize": {"width": 1024, "height": 768},
+    "basic_filter": ["SMOOTH", "SHARPEN"],
+    "multiband_filter": {"radius": 2, "filter_name": "GAUSSIANBLUR"},
+    "format": "webp",
+    "optimize": 80,
+}
+
+# One large request per band-parallel transform, for the single-request latency benchmark.
+BAND_CASES: dict[str, Any] = {
+    "basic_filter": ["SMOOTH", "SHARPEN"],
+    "rank_filter": {"size": 5, "filter_name": "MEDIAN"},
+    "multiband_filter": {"radius": 4, "filter_name": "GAUSSIANBLUR"},
+    "resize": {"width": 1024, "height": 768},
+}
+
+# How each band case's transform runs its Pillow calls on a given band pool, as its `apply` does.
+BAND_RUNNERS: dict[str, Callable[[Any, Image.Image, Any, BandPool], Image.Image]] = {
+    "basic_filter": lambda transformer, image, params, pool: filter_in_bands(image, transformer.filters(params), pool),
+    "rank_filter": lambda transformer, image, params, pool: rank_filter(image, transformer.filters(params), pool),
+    "multiband_filter": lambda transformer, image, params, pool: filter_in_bands(
+        image, [transformer.filter(params)], pool
+    ),
+    "resize": lambda transformer, image, params, pool: resize_in_bands(image, transformer.validate_size(params), pool),
+}
+
+
+def convert_bytes(data: bytes, config: dict) -> bytes:
+    """Decode, transform and encode one image, as a request does, and return the encoded bytes."""
+    return convert(data, config)[0]
+
+
+def tree_rss_bytes(pid: int | None = None) -> int:
+    """
+    Return the resident memory of a process and its child processes, read from /proc.
+
+    Threads live in the process itself; a process pool's workers are its
+    children. Pages shared after fork count once per process, as `ps` reports
+    them. Returns 0 where /proc is unavailable.
+    """
+    pid = pid or os.getpid()
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    for status in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = status.read_text().rsplit(")", 1)[1].split()
+            statm = (status.parent / "statm").read_text().split()
+        except OSError:
+            continue
+        if status.parent.name == str(pid) or int(fields[1]) == pid:
+            total += int(statm[1]) * page_size
+    return total
+
+
+def scaling_input(size: tuple[int, int]) -> bytes:
+    """Encode the benchmark's input image as a JPEG upload."""
+    buffer = BytesIO()
+    synthetic_image(size=size, mode="RGB").save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def run_scaling(
+        workers: list[int],
+        jobs: int,
+        size: tuple[int, int],
+        config: dict | None = None,
+        backend: str = "thread",
+) -> list[dict[str, Any]]:
+    """
+    Measure how conversion throughput scales with the workers of one executor.
+
+    For each worker count, `jobs` identical conversions are submitted at once
+    to a fresh executor of `backend` (after one untimed round to start its
+    workers) and the wall time to finish them all is recorded. Speedup and
+    efficiency are relative to the first worker count; with the GIL enabled
+    they show how much of the pipeline runs in Pillow's GIL-free C code, and on
+    a free-threaded build how close one process gets to using every core.
+    The process backend is measured the same way, plus the memory it costs:
+    `rss_mb` is the resident memory of this process and its pool workers once
+    the round finishes.
+
+    Args:
+        workers (list[int]): Worker counts to measure, e.g. [1, 2, 4, 8].
+        jobs (int): Conversions per measurement.
+        size (tuple[int, int]): Input image size.
+        config (dict, optional): Conversion config; defaults to SCALING_CONFIG.
+        backend (str): An `images.executor` backend.
+
+    Returns:
+        list[dict]: One row per worker count with wall time, throughput,
+            speedup, efficiency and resident memory.
+    """
+    config = config or SCALING_CONFIG
+    data = scaling_input(size)
+    rows: list[dict[str, Any]] = []
+    for count in workers:
+        with build_executor(backend, count) as executor:
+            list(executor.map(convert_bytes, [data] * count, [config] * count))
+            start = time.perf_counter()
+            list(executor.map(convert_bytes, [data] * jobs, [config] * jobs))
+            wall = time.perf_counter() - start
+            rss = tree_rss_bytes()
+
+        throughput = jobs / wall
+        speedup = throughput / rows[0]["jobs_per_s"] if rows else 1.0
+        rows.append({
+            "case": f"{backend}/{count}",
+            "backend": backend,
+            "workers": count,
+            "jobs": jobs,
+            "wall_ms": round(wall * 1000, 3),
+            "jobs_per_s": round(throughput, 3),
+            "speedup": round(speedup, 3),
+            "efficiency": round(speedup * workers[0] / count, 3),
+            "rss_mb": round(rss / 2**20, 1),
+        })
+    return rows
+
+
+def run_band_latency(
+        workers: list[int],
+        size: tuple[int, int],
+        repeat: int = 5,
+        cases: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Measure how the latency of one large transform falls with band workers.
+
+    Each case in `cases` (default BAND_CASES) is applied as its registered
+    transform does (see BAND_RUNNERS) on a `BandPool` of each worker count in
+    turn; one worker runs the unsplit Pillow call. Every result is compared with
+    the unsplit one, so a row also records whether banding changed any byte.
+
+    Args:
+        workers (list[int]): Band worker counts to measure, e.g. [1, 2, 4, 8].
+        size (tuple[int, int]): Input image size.
+        repeat (int): Timed calls per measurement.
+        cases (dict, optional): Transform key (one of BAND_RUNNERS) → params.
+
+    Returns:
+        list[dict]: One row per case and worker count with mean and p95
+            latency, speedup over the first worker count and `identical`.
+    """
+    image = synthetic_image(size=size, mode="RGB")
+    rows: list[dict[str, Any]] = []
+    for key, params in (cases or BAND_CASES).items():
+        transformer = TRANSFORM_MAP[key]
+        expected = None
+        first_ms = None
+        for count in workers:
+            with BandPool(count) as pool:
+                def run() -> Image.Image:
+                    return BAND_RUNNERS[key](transformer, image, params, pool)
+
+                result = run().tobytes()
+                timing = time_call(run, repeat=repeat)
+            expected = expected if expected is not None else result
+            first_ms = first_ms or timing["mean_ms"]
+            rows.append({
+                "case": f"{key}/bands-{count}",
+                "transform": key,
+                "workers": count,
+                "mean_ms": round(timing["mean_ms"], 3),
+                "p95_ms": round(timing["p95_ms"], 3),
+                "speedup": round(first_ms / timing["mean_ms"], 3),
+                "identical": result == expected,
+            })
+    return rows
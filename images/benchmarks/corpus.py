@@ -0,0 +1,92 @@
+import random
+from io import BytesIO
+
+from PIL import Image
+
+MODES: tuple[str, ...] = ("RGB", "RGBA", "L", "P")
+
+SIZES: dict[str, tuple[int, int]] = {
+    "small": (256, 256),
+    "medium": (1024, 768),
+    "large": (2048, 1536),
+}
+
+
+def _noise(size: tuple[int, int], rng: random.Random) -> Image.Image:
+    """Return an "L" image filled with seeded uniform noise."""
+    width, height = size
+    return Image.frombytes("L", size, rng.randbytes(width * height))
+
+
+def synthetic_image(size: tuple[int, int], mode: str, seed: int = 0) -> Image.Image:
+    """
+    Build a deterministic test image of the given size and mode.
+
+    The image mixes smooth gradients with a small amount of seeded noise so
+    codecs see photo-like entropy instead of flat colors, and the same
+    arguments always yield the same pixels (and therefore the same encoded size).
+
+    Args:
+        size (tuple[int, int]): Target (width, height).
+        mode (str): One of MODES.
+        seed (int): Seed for the noise generator.
+
+    Returns:
+        Image.Image: The generated image.
+
+    Raises:
+        ValueError: If `mode` is not one of MODES.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unsupported corpus mode {mode!r}; must be one of {list(MODES)}")
+
+    rng = random.Random(seed)
+    linear = Image.linear_gradient("L").resize(size)
+    radial = Image.radial_gradient("L").resize(size)
+    bands = [
+        Image.blend(linear, _noise(size, rng), 0.15),
+        Image.blend(radial, _noise(size, rng), 0.15),
+        Image.blend(linear.transpose(Image.Transpose.ROTATE_180), _noise(size, rng), 0.15),
+    ]
+
+    if mode == "L":
+        return bands[0]
+    rgb = Image.merge("RGB", bands)
+    if mode == "RGBA":
+        rgba = rgb.copy()
+        rgba.putalpha(radial)
+        return rgba
+    if mode == "P":
+        return rgb.convert("P", palette=Image.Palette.ADAPTIVE, colors=256)
+    return rgb
+
+
+def encode_upload(image: Image.Image, image_format: str) -> bytes:
+    """Encode `image` as an upload file in `image_format`, converting modes the format cannot store."""
+    if image_format == "JPEG" and image.mode not in ("RGB", "L", "CMYK"):
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def synthetic_upload(size: tuple[int, int], mode: str, image_format: str, seed: int = 0) -> bytes:
+    """
+    Build upload bytes shaped like a recorded input: same size, mode and format.
+
+    Modes outside MODES (e.g. CMYK, LA) are converted from the RGB corpus image.
+
+    Args:
+        size (tuple[int, int]): Recorded (width, height).
+        mode (str): Recorded Pillow mode.
+        image_format (str): Recorded Pillow format name.
+        seed (int): Seed for the noise generator.
+
+    Returns:
+        bytes: The encoded image.
+    """
+    if mode in MODES:
+        image = synthetic_image(size=size, mode=mode, seed=seed)
+    else:
+        image = synthetic_image(size=size, mode="RGB", seed=seed).convert(mode)
+    return encode_upload(image, image_format)
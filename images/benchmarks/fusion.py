@@ -0,0 +1,178 @@
+from typing import Any, Iterable
+
+from PIL import Image, ImageChops, ImageFilter, ImageStat
+
+from images.benchmarks.corpus import synthetic_image
+from images.benchmarks.measure import time_call
+from images.instrumentation import StageTimings
+from images.pipeline import apply_steps, compile_steps
+
+# Geometric chains that fuse into one resample, as they would appear in a config.
+FUSION_CASES: dict[str, dict[str, Any]] = {
+    "crop+rotate+resize": {
+        "region_crop": {"left": 64, "upper": 48, "right": 960, "lower": 720},
+        "rotate": {"angle": 17, "expand": True},
+        "resize": {"width": 640, "height": 480},
+    },
+    "rotate+flip+crop": {
+        "rotate": {"angle": 10},
+        "flip": None,
+        "region_crop": {"left": 100, "upper": 100, "right": 900, "lower": 600},
+    },
+    "border+expand+resize": {
+        "border_crop": 16,
+        "expand": {"border": 24},
+        "resize": {"width": 1600, "height": 1200},
+    },
+    "mirror+transpose+resize": {
+        "mirror": None,
+        "transpose": "ROTATE_90",
+        "resize": {"width": 360, "height": 480},
+    },
+}
+
+
+# Linear color chains that fuse into one color matrix, as they would appear in a config.
+COLOR_CHAINS: dict[str, dict[str, Any]] = {
+    "color+brightness": {"color": 0.5, "brightness": 0.8},
+    "grayscale+brightness+invert": {"grayscale": None, "brightness": 0.9, "invert": None},
+    "invert+color+brightness": {"invert": None, "color": 0.7, "brightness": 1.3},
+    "color+invert+grayscale+brightness": {"color": 0.8, "invert": None, "grayscale": None, "brightness": 0.9},
+}
+
+
+# Chains of per-band lookup steps, with the histogram-driven ones that share one histogram.
+HISTOGRAM_CHAINS: dict[str, dict[str, Any]] = {
+    "autocontrast": {"autocontrast": {"cutoff": 1.0}},
+    "autocontrast+equalize": {"autocontrast": {"cutoff": 2.0}, "equalize": None},
+    "equalize+posterize+invert": {"equalize": None, "posterize": 4, "invert": None},
+}
+
+
+def sharpness(image: Image.Image) -> float:
+    """Return the variance of the image's edges: higher means more retained detail."""
+    return ImageStat.Stat(image.convert("L").filter(ImageFilter.FIND_EDGES)).var[0]
+
+
+def run_fusion(
+        size: tuple[int, int] = (1024, 768),
+        repeat: int = 5,
+        cases: Iterable[str] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Compare each geometric chain run step by step against the same chain fused.
+
+    Args:
+        size (tuple[int, int]): Input image size.
+        repeat (int): Timed runs per measurement.
+        cases (Iterable[str], optional): Names from `FUSION_CASES`; defaults to all.
+
+    Returns:
+        list[dict]: One row per case with both timings, the speedup, both
+            sharpness scores and whether the output sizes agree.
+    """
+    image = synthetic_image(size=size, mode="RGB")
+    rows = []
+    for name in cases or FUSION_CASES:
+        steps = compile_steps(FUSION_CASES[name])
+        outputs = {fuse: apply_steps(image, steps, fuse, StageTimings()) for fuse in (False, True)}
+        stepwise = time_call(lambda: apply_steps(image, steps, False, StageTimings()), repeat=repeat)
+        fused = time_call(lambda: apply_steps(image, steps, True, StageTimings()), repeat=repeat)
+        rows.append({
+            "case": name,
+            "stepwise_ms": stepwise["mean_ms"],
+            "fused_ms": fused["mean_ms"],
+            "speedup": stepwise["mean_ms"] / fused["mean_ms"],
+            "stepwise_sharpness": sharpness(outputs[False]),
+            "fused_sharpness": sharpness(outputs[True]),
+            "same_size": outputs[False].size == outputs[True].size,
+        })
+    return rows
+
+
+def max_difference(first: Image.Image, second: Image.Image) -> int:
+    """Return the largest per-channel difference between two images of the same size and mode."""
+    extrema = ImageChops.difference(first, second).getextrema()
+    return max(high for _, high in extrema) if isinstance(extrema[0], tuple) else extrema[1]
+
+
+def run_color_fusion(
+        size: tuple[int, int] = (1024, 768),
+        repeat: int = 5,
+        cases: Iterable[str] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Compare each linear color chain run step by step against the same chain as one color matrix.
+
+    Args:
+        size (tuple[int, int]): Input image size.
+        repeat (int): Timed runs per measurement.
+        cases (Iterable[str], optional): Names from `COLOR_CHAINS`; defaults to all.
+
+    Returns:
+        list[dict]: One row per chain with both timings, the speedup and the
+            largest channel difference between the outputs.
+    """
+    image = synthetic_image(size=size, mode="RGB")
+    rows = []
+    for name in cases or COLOR_CHAINS:
+        steps = compile_steps(COLOR_CHAINS[name])
+        stepwise = time_call(lambda: apply_steps(image, steps, False, StageTimings()), repeat=repeat)
+        fused = time_call(lambda: apply_steps(image, steps, False, StageTimings(), fuse_color=True), repeat=repeat)
+        rows.append({
+            "case": name,
+            "stepwise_ms": stepwise["mean_ms"],
+            "fused_ms": fused["mean_ms"],
+            "speedup": stepwise["mean_ms"] / fused["mean_ms"],
+            "max_difference": max_difference(
+                apply_steps(image, steps, False, StageTimings()),
+                apply_steps(image, steps, False, StageTimings(), fuse_color=True),
+            ),
+        })
+    return rows
+
+
+def run_histogram_sharing(
+        size: tuple[int, int] = (4000, 3000),
+        repeat: int = 3,
+        cases: Iterable[str] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Compare lookup chains run step by step against one shared-histogram pass, exact and with a proxy histogram.
+
+    Args:
+        size (tuple[int, int]): Input image size.
+        repeat (int): Timed runs per measurement.
+        cases (Iterable[str], optional): Names from `HISTOGRAM_CHAINS`; defaults to all.
+
+    Returns:
+        list[dict]: One row per chain with the three timings, whether the
+            shared pass matches step by step, and the largest channel
+            difference of the proxy output.
+    """
+    image = synthetic_image(size=size, mode="RGB")
+    rows = []
+    for name in cases or HISTOGRAM_CHAINS:
+        steps = compile_steps(HISTOGRAM_CHAINS[name])
+
+        def separate() -> Image.Image:
+            result = image
+            for _, transformer, params in steps:
+                result = transformer.apply(result, params)
+            return result
+
+        stepwise = time_call(separate, repeat=repeat)
+        shared = time_call(lambda: apply_steps(image, steps, False, StageTimings()), repeat=repeat)
+        proxy = time_call(lambda: apply_steps(image, steps, False, StageTimings(), proxy=True), repeat=repeat)
+        expected = separate()
+        rows.append({
+            "case": name,
+            "stepwise_ms": stepwise["mean_ms"],
+            "shared_ms": shared["mean_ms"],
+            "proxy_ms": proxy["mean_ms"],
+            "identical": apply_steps(image, steps, False, StageTimings()).tobytes() == expected.tobytes(),
+            "proxy_max_difference": max_difference(
+                apply_steps(image, steps, False, StageTimings(), proxy=True), expected
+            ),
+        })
+    return rows
@@ -0,0 +1,233 @@
+import json
+import multiprocessing
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from io import BytesIO
+from itertools import product
+from typing import Any, Iterable
+
+from django.core.files.base import ContentFile
+from django.db import connections
+from django.test.client import encode_multipart, BOUNDARY, MULTIPART_CONTENT
+
+from images.benchmarks.corpus import synthetic_image, encode_upload
+from images.benchmarks.measure import percentile, current_rss_kib, max_rss_kib
+
+DEFAULT_CONFIGS: list[dict[str, Any]] = [
+    {"thumbnail": {"size": [128.0, 128.0]}, "format": "webp"},
+    {"grayscale": None, "format": "png"},
+    {"rotate": {"angle": 90, "expand": True}, "resize": {"width": 640, "height": 480}, "format": "jpeg", "optimize": 85},
+    {"basic_filter": ["SHARPEN"], "autocontrast": {"cutoff": 1.0}},
+]
+
+DEFAULT_INPUTS: list[tuple[tuple[int, int], str]] = [
+    ((1024, 768), "JPEG"),
+    ((256, 256), "PNG"),
+]
+
+
+def multipart_request(config: dict[str, Any], image: bytes, filename: str) -> tuple[bytes, str]:
+    """Encode one conversion request as a multipart body and its content type."""
+    body = encode_multipart(BOUNDARY, {
+        "config": json.dumps(config),
+        "image": ContentFile(image, name=filename),
+    })
+    return body, MULTIPART_CONTENT
+
+
+def build_workload(
+        configs: Iterable[dict[str, Any]] = DEFAULT_CONFIGS,
+        inputs: Iterable[tuple[tuple[int, int], str]] = DEFAULT_INPUTS
+) -> list[tuple[bytes, str]]:
+    """
+    Build a mixed workload: every config paired with every synthetic input file.
+
+    Bodies are encoded up front so the load loop only measures the server.
+
+    Args:
+        configs: Conversion configs to cycle through.
+        inputs: (size, format) pairs of the uploaded images.
+
+    Returns:
+        list[tuple[bytes, str]]: (body, content_type) request payloads.
+    """
+    files = [
+        (encode_upload(synthetic_image(size=size, mode="RGB"), image_format), f"bench.{image_format.lower()}")
+        for size, image_format in inputs
+    ]
+    return [
+        multipart_request(config, data, filename)
+        for config, (data, filename) in product(list(configs), files)
+    ]
+
+
+class WSGITransport:
+    """Send requests straight into a WSGI application in this process."""
+
+    def __init__(self, application, path: str):
+        self.application = application
+        self.path = path
+
+    def post(self, body: bytes, content_type: str, headers: dict[str, str]) -> int:
+        environ = {
+            "REQUEST_METHOD": "POST",
+            "PATH_INFO": self.path,
+            "SCRIPT_NAME": "",
+            "QUERY_STRING": "",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "CONTENT_TYPE": content_type,
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        }
+        for name, value in headers.items():
+            environ["HTTP_" + name.upper().replace("-", "_")] = value
+
+        status: list[str] = []
+        result = self.application(environ, lambda response_status, *_: status.append(response_status))
+        try:
+            for _ in result:
+                pass
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        return int(status[0].split()[0])
+
+
+class HTTPTransport:
+    """Send requests to a running server over HTTP."""
+
+    def __init__(self, url: str, timeout: float = 120):
+        self.url = url
+        self.timeout = timeout
+
+    def post(self, body: bytes, content_type: str, headers: dict[str, str]) -> int:
+        request = urllib.request.Request(
+            self.url, data=body, method="POST", headers={"Content-Type": content_type, **headers}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+        except (urllib.error.URLError, OSError):
+            return 0
+
+
+def drive(transport, workload, headers, concurrency: int, duration: float) -> dict[str, Any]:
+    """Run `concurrency` client threads against `transport` for `duration` seconds."""
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    start_rss = current_rss_kib()
+
+    def client(offset: int) -> None:
+        index = offset
+        while time.monotonic() < deadline:
+            body, content_type = workload[index % len(workload)]
+            start = time.perf_counter()
+            status = transport.post(body, content_type, headers)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] += 1
+            index += 1
+
+    threads = [threading.Thread(target=client, args=(offset,)) for offset in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "latencies": latencies,
+        "statuses": dict(statuses),
+        "start_rss_kib": start_rss,
+        "peak_rss_kib": max_rss_kib(),
+    }
+
+
+def _worker(transport, workload, headers, concurrency, duration, conn) -> None:
+    conn.send(drive(transport, workload, headers, concurrency, duration))
+    conn.close()
+
+
+def run_load(
+        transport,
+        workload: list[tuple[bytes, str]],
+        headers: dict[str, str] | None = None,
+        workers: int = 1,
+        concurrency: int = 4,
+        duration: float = 10.0
+) -> dict[str, Any]:
+    """
+    Drive `transport` from `workers` forked processes with `concurrency` threads each.
+
+    With a WSGITransport each forked worker is its own copy of the application,
+    so the reported per-worker RSS is what a pre-fork server worker would use.
+
+    Args:
+        transport: A WSGITransport or HTTPTransport.
+        workload: Payloads from `build_workload`, cycled by every client thread.
+        headers: Extra request headers, e.g. Authorization.
+        workers (int): Number of forked worker processes.
+        concurrency (int): Client threads per worker.
+        duration (float): Seconds to generate load for.
+
+    Returns:
+        dict: requests, errors, rps, p50/p95/p99 latency (ms), status counts and per-worker RSS.
+    """
+    headers = headers or {}
+    started = time.perf_counter()
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        pipes, processes = [], []
+        for _ in range(workers):
+            parent_conn, child_conn = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_worker, args=(transport, workload, headers, concurrency, duration, child_conn)
+            )
+            process.start()
+            child_conn.close()
+            pipes.append(parent_conn)
+            processes.append(process)
+        results = [pipe.recv() for pipe in pipes]
+        for process in processes:
+            process.join()
+    else:
+        results = [drive(transport, workload, headers, concurrency * workers, duration)]
+
+    elapsed = time.perf_counter() - started
+    latencies = [latency for result in results for latency in result["latencies"]]
+    statuses: Counter = Counter()
+    for result in results:
+        statuses.update(result["statuses"])
+
+    return {
+        "requests": len(latencies),
+        "errors": sum(count for status, count in statuses.items() if not 200 <= status < 300),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) if latencies else None,
+        "p95_ms": percentile(latencies, 95) if latencies else None,
+        "p99_ms": percentile(latencies, 99) if latencies else None,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "worker_rss_kib": [result["peak_rss_kib"] for result in results],
+        "worker_start_rss_kib": [result["start_rss_kib"] for result in results],
+    }
@@ -0,0 +1,97 @@
+import math
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import time
+from typing import Any, Callable
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile `pct` (0–100) of `samples`."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def time_call(fn: Callable[[], Any], repeat: int = 5, warmup: int = 1) -> dict[str, float]:
+    """
+    Time repeated calls of `fn` with a monotonic clock.
+
+    Args:
+        fn: Zero-argument callable to measure.
+        repeat (int): Number of timed calls.
+        warmup (int): Number of untimed calls made first.
+
+    Returns:
+        dict: `mean_ms`, `p95_ms` and `min_ms` over the timed calls.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples: list[float] = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "mean_ms": statistics.fmean(samples),
+        "p95_ms": percentile(samples, 95),
+        "min_ms": min(samples),
+    }
+
+
+def current_rss_kib() -> int:
+    """Return the resident set size of this process in KiB."""
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return max_rss_kib()
+
+
+def max_rss_kib() -> int:
+    """Return the process high-water RSS in KiB (macOS reports bytes)."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+def _peak_child(fn: Callable[[], Any], conn) -> None:
+    start = current_rss_kib()
+    fn()
+    conn.send(max(0, max_rss_kib() - start))
+    conn.close()
+
+
+def peak_rss_kib(fn: Callable[[], Any]) -> int | None:
+    """
+    Measure how far one call of `fn` raises the resident set size.
+
+    Pillow allocates pixel buffers outside the Python allocator, so tracemalloc
+    cannot see them. Instead `fn` runs once in a forked child whose high-water
+    RSS starts at its current RSS; the growth is the call's peak footprint.
+
+    Args:
+        fn: Zero-argument callable to measure. It must not rely on state
+            mutated in the parent after the fork.
+
+    Returns:
+        int | None: Peak RSS growth in KiB, or None where fork is unavailable.
+    """
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return None
+
+    context = multiprocessing.get_context("fork")
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_peak_child, args=(fn, child_conn))
+    process.start()
+    child_conn.close()
+    try:
+        return parent_conn.recv() if parent_conn.poll(timeout=600) else None
+    except EOFError:
+        return None
+    finally:
+        process.join()
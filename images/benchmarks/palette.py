@@ -0,0 +1,50 @@
+from io import BytesIO
+from typing import Any
+
+from PIL import Image
+
+from images.benchmarks.corpus import synthetic_image
+from images.benchmarks.measure import time_call
+from images.transformations import TRANSFORM_MAP
+
+# Point operations that map a palette image's palette rather than its pixels.
+PALETTE_STEPS: dict[str, Any] = {"invert": None, "posterize": 3, "solarize": 100, "brightness": 0.7}
+
+
+def png_bytes(image: Image.Image) -> int:
+    """Return the size of `image` saved as a PNG."""
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.tell()
+
+
+def run_palette(size: tuple[int, int] = (2048, 1536), repeat: int = 5) -> list[dict[str, Any]]:
+    """
+    Compare each point operation on a palette image against expanding it to RGB first.
+
+    Args:
+        size (tuple[int, int]): Input image size.
+        repeat (int): Timed runs per measurement.
+
+    Returns:
+        list[dict]: One row per step with both timings, the speedup, both
+            PNG sizes and whether the palette result shows the same colors.
+    """
+    image = synthetic_image(size=size, mode="P")
+    rows = []
+    for key, params in PALETTE_STEPS.items():
+        transformer = TRANSFORM_MAP[key]
+        expanded = time_call(lambda: transformer.apply(image.convert("RGB"), params), repeat=repeat)
+        palette = time_call(lambda: transformer.apply(image, params), repeat=repeat)
+        expected = transformer.apply(image.convert("RGB"), params)
+        result = transformer.apply(image, params)
+        rows.append({
+            "case": key,
+            "rgb_ms": expanded["mean_ms"],
+            "palette_ms": palette["mean_ms"],
+            "speedup": expanded["mean_ms"] / palette["mean_ms"],
+            "rgb_png_bytes": png_bytes(expected),
+            "palette_png_bytes": png_bytes(result),
+            "identical": result.mode == "P" and result.convert("RGB").tobytes() == expected.tobytes(),
+        })
+    return rows
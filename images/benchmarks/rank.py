@@ -0,0 +1,49 @@
+from typing import Any, Iterable
+
+from PIL import Image
+
+from images.benchmarks.corpus import synthetic_image
+from images.benchmarks.measure import time_call
+from images.transformations.bands import filter_in_bands
+from images.transformations.filters_mapping import RANK_FILTERS
+from images.transformations.rank import rank_filter
+
+# Window sizes from the smallest rank filter to ones too slow to serve with Pillow's.
+RANK_SIZES: tuple[int, ...] = (3, 5, 9, 15, 31)
+
+
+def run_rank_engine(
+        size: tuple[int, int] = (1024, 768),
+        repeat: int = 3,
+        sizes: Iterable[int] = RANK_SIZES,
+        names: Iterable[str] = ("MIN", "MAX"),
+) -> list[dict[str, Any]]:
+    """
+    Compare Pillow's rank filters against `rank_filter` at growing window sizes.
+
+    Args:
+        size (tuple[int, int]): Input image size.
+        repeat (int): Timed runs per measurement.
+        sizes (Iterable[int]): Odd window sizes.
+        names (Iterable[str]): Filter names from `RANK_FILTERS`.
+
+    Returns:
+        list[dict]: One row per filter and window size with both timings, the
+            speedup and whether the outputs are byte-identical.
+    """
+    image = synthetic_image(size=size, mode="RGB")
+    rows = []
+    for name in names:
+        for window in sizes:
+            filters = [RANK_FILTERS[name](size=window)]
+            pillow = time_call(lambda: filter_in_bands(image, filters), repeat=repeat)
+            engine = time_call(lambda: rank_filter(image, filters), repeat=repeat)
+            expected: Image.Image = filter_in_bands(image, filters)
+            rows.append({
+                "case": f"{name} {window}x{window}",
+                "pillow_ms": pillow["mean_ms"],
+                "engine_ms": engine["mean_ms"],
+                "speedup": pillow["mean_ms"] / engine["mean_ms"],
+                "identical": rank_filter(image, filters).tobytes() == expected.tobytes(),
+            })
+    return rows
@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from images.benchmarks.corpus import synthetic_upload
+from images.benchmarks.load import multipart_request
+from images.benchmarks.measure import percentile
+
+
+def load_capture(path: str | Path, limit: int | None = None) -> list[dict[str, Any]]:
+    """
+    Read records written by TrafficCaptureMiddleware.
+
+    Args:
+        path: The capture log (JSON lines).
+        limit (int, optional): Keep only the first `limit` records.
+
+    Returns:
+        list[dict]: The records in capture order.
+    """
+    records: list[dict[str, Any]] = []
+    with Path(path).open() as log:
+        for line in log:
+            if line.strip():
+                records.append(json.loads(line))
+            if limit is not None and len(records) >= limit:
+                break
+    return records
+
+
+def replay_workload(records: list[dict[str, Any]], images_dir: str | Path) -> tuple[list[tuple[bytes, str]], int]:
+    """
+    Turn captured records back into request payloads.
+
+    The original upload is used when it was stored (matched by SHA-256);
+    otherwise a synthetic image with the recorded size, mode and format
+    stands in for it.
+
+    Args:
+        records: Records from `load_capture`.
+        images_dir: Directory holding stored uploads named `<sha256>.<ext>`.
+
+    Returns:
+        tuple: The (body, content_type) payloads and how many used original images.
+    """
+    images_dir = Path(images_dir)
+    synthetic: dict[tuple, bytes] = {}
+    workload: list[tuple[bytes, str]] = []
+    originals = 0
+
+    for record in records:
+        image_format = record["format"]
+        extension = image_format.lower()
+        stored = images_dir / f"{record['sha256']}.{extension}"
+        if stored.exists():
+            data = stored.read_bytes()
+            originals += 1
+        else:
+            shape = (record["width"], record["height"], record["mode"], image_format)
+            if shape not in synthetic:
+                synthetic[shape] = synthetic_upload(
+                    size=(record["width"], record["height"]), mode=record["mode"], image_format=image_format
+                )
+            data = synthetic[shape]
+        workload.append(multipart_request(json.loads(record["config"]), data, f"replay.{extension}"))
+
+    return workload, originals
+
+
+def recorded_latency(records: list[dict[str, Any]]) -> dict[str, float | None]:
+    """Return p50/p95/p99 of the latencies observed when the traffic was captured."""
+    latencies = [record["latency_ms"] for record in records]
+    return {
+        f"p{pct}_ms": percentile(latencies, pct) if latencies else None
+        for pct in (50, 95, 99)
+    }
@@ -0,0 +1,101 @@
+import csv
+import json
+import os
+import platform
+import sys
+import sysconfig
+from pathlib import Path
+from typing import Any, Iterable
+
+import PIL
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+
+def environment() -> dict[str, str]:
+    """Describe the interpreter and library versions a report was produced with."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "free_threaded": str(bool(sysconfig.get_config_var("Py_GIL_DISABLED"))),
+        "gil_enabled": str(getattr(sys, "_is_gil_enabled", lambda: True)()),
+        "pillow": PIL.__version__,
+        "machine": platform.machine(),
+        "cpus": str(os.cpu_count()),
+    }
+
+
+def write_report(rows: list[dict[str, Any]], path: str | Path) -> None:
+    """
+    Write benchmark rows to `path` as JSON or CSV, chosen by the file suffix.
+
+    JSON reports also carry an `environment` block so baselines can be traced
+    back to the Pillow/Python build that produced them.
+
+    Args:
+        rows (list[dict]): One dict per measured case; each must have a `case` key.
+        path (str | Path): Destination file ending in `.json` or `.csv`.
+
+    Raises:
+        ValueError: If the suffix is neither `.json` nor `.csv`.
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        payload = {"environment": environment(), "results": rows}
+        path.write_text(json.dumps(payload, indent=2) + "\n")
+    elif path.suffix == ".csv":
+        fieldnames = list(dict.fromkeys(field for row in rows for field in row))
+        with path.open("w", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        raise ValueError(f"Unsupported report format {path.suffix!r}; use .json or .csv")
+
+
+def load_baseline(path: str | Path) -> dict[str, dict[str, Any]]:
+    """Load a JSON report and index its results by `case`; missing files yield {}."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    payload = json.loads(path.read_text())
+    return {row["case"]: row for row in payload.get("results", [])}
+
+
+def compare_to_baseline(
+        rows: Iterable[dict[str, Any]],
+        baseline: dict[str, dict[str, Any]],
+        metrics: Iterable[str],
+        threshold: float
+) -> list[str]:
+    """
+    List every metric that grew more than `threshold` over its baseline value.
+
+    Cases or metrics absent from the baseline (or recorded as null) are skipped,
+    so adding new cases never fails a comparison.
+
+    Args:
+        rows: Current benchmark rows.
+        baseline: Baseline rows indexed by `case`.
+        metrics: Names of the lower-is-better metrics to check.
+        threshold (float): Allowed relative growth, e.g. 0.25 for +25%.
+
+    Returns:
+        list[str]: Human-readable regression descriptions; empty if none.
+    """
+    metrics = list(metrics)
+    regressions: list[str] = []
+    for row in rows:
+        reference = baseline.get(row["case"])
+        if reference is None:
+            continue
+        for metric in metrics:
+            current, previous = row.get(metric), reference.get(metric)
+            if current is None or not previous:
+                continue
+            if current > previous * (1 + threshold):
+                regressions.append(
+                    f"{row['case']} {metric}: {current:.2f} vs baseline {previous:.2f} "
+                    f"(+{(current / previous - 1) * 100:.0f}%)"
+                )
+    return regressions
@@ -0,0 +1,113 @@
+import json
+from itertools import product
+from typing import Any, Iterable
+
+from images.benchmarks.corpus import MODES, synthetic_image
+from images.benchmarks.measure import time_call, peak_rss_kib
+from images.transformations import TRANSFORM_MAP
+
+SIZES: dict[str, tuple[int, int]] = {
+    "small": (256, 256),
+    "medium": (1024, 768),
+}
+METRICS: tuple[str, ...] = ("mean_ms", "peak_kib")
+
+
+def params_label(params: Any) -> str:
+    """Return a compact, stable text form of `params` for case names."""
+    return json.dumps(params, separators=(",", ":"), sort_keys=True)
+
+
+def case_name(key: str, params: Any, size: tuple[int, int], mode: str) -> str:
+    """Return the stable identifier used to match a case against the baseline."""
+    return f"{key}/{params_label(params)}/{size[0]}x{size[1]}/{mode}"
+
+
+def iter_cases(keys: Iterable[str] | None = None) -> Iterable[tuple[str, Any]]:
+    """
+    Yield (key, params) for every registered transform and each of its benchmark params.
+
+    Cases come from the registry, so a newly registered transform is benchmarked
+    without touching this module.
+
+    Args:
+        keys: Restrict to these transform keys; all registered keys when None.
+
+    Raises:
+        KeyError: If a requested key is not registered.
+    """
+    for key in sorted(keys or TRANSFORM_MAP):
+        transformer = TRANSFORM_MAP[key]
+        for params in transformer.benchmark_params():
+            yield key, params
+
+
+def run_case(
+        key: str,
+        params: Any,
+        size: tuple[int, int],
+        mode: str,
+        repeat: int = 5,
+        memory: bool = True
+) -> dict[str, Any]:
+    """
+    Measure one transform/params/size/mode combination.
+
+    Each timed call gets its own pre-made copy of the input, so transforms that
+    mutate in place (e.g. thumbnail) see identical input and the copy is not timed.
+    Transforms that reject the mode are reported with `supported: False`.
+
+    Args:
+        key (str): Registered transform key.
+        params: Params passed to `apply`.
+        size (tuple[int, int]): Corpus image size.
+        mode (str): Corpus image mode.
+        repeat (int): Timed runs.
+        memory (bool): Whether to measure peak RSS in a forked child.
+
+    Returns:
+        dict: A report row with mean/p95 time, throughput and peak memory.
+    """
+    transformer = TRANSFORM_MAP[key]
+    source = synthetic_image(size=size, mode=mode)
+    row: dict[str, Any] = {
+        "case": case_name(key, params, size, mode),
+        "key": key,
+        "params": params_label(params),
+        "width": size[0],
+        "height": size[1],
+        "mode": mode,
+    }
+
+    try:
+        transformer.apply(source.copy(), params)
+    except (ValueError, TypeError, OSError, NotImplementedError):
+        row["supported"] = False
+        return row
+
+    warmup = 1
+    copies = [source.copy() for _ in range(warmup + max(1, repeat))]
+    stats = time_call(lambda: transformer.apply(copies.pop(), params), repeat=repeat, warmup=warmup)
+    row.update({
+        "supported": True,
+        "mean_ms": stats["mean_ms"],
+        "p95_ms": stats["p95_ms"],
+        "mps": size[0] * size[1] / 1_000_000 / (stats["mean_ms"] / 1000),
+        "peak_kib": peak_rss_kib(lambda: transformer.apply(source, params)) if memory else None,
+    })
+    return row
+
+
+def run_suite(
+        keys: Iterable[str] | None = None,
+        sizes: Iterable[tuple[int, int]] = SIZES.values(),
+        modes: Iterable[str] = MODES,
+        repeat: int = 5,
+        memory: bool = True
+) -> list[dict[str, Any]]:
+    """Run `run_case` for every registered transform, params set, size and mode."""
+    sizes, modes = list(sizes), list(modes)
+    return [
+        run_case(key, params, size, mode, repeat=repeat, memory=memory)
+        for (key, params), size, mode in product(list(iter_cases(keys)), sizes, modes)
+    ]
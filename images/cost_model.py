@@ -0,0 +1,103 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+COST_MODEL_PATH = Path(__file__).resolve().parent / "cost_model.json"
+ANY_MODE = "*"
+
+
+def pixel_bytes(mode: str) -> int:
+    """Return the bytes Pillow allocates per pixel for `mode` (multi-band modes are padded to 4)."""
+    if mode in ("1", "L", "P"):
+        return 1
+    if mode.startswith("I;16"):
+        return 2
+    return 4
+
+
+def image_bytes(size: tuple[int, int], mode: str) -> int:
+    """Return the size of the pixel buffer Pillow holds for an image of `size` and `mode`."""
+    return size[0] * size[1] * pixel_bytes(mode)
+
+
+class CostModel:
+    """
+    Predicts the CPU time of pipeline steps from calibrated linear coefficients.
+
+    Each entry maps a step name ("transform.<key>", "decode.<FORMAT>" or
+    "encode.<FORMAT>.q<quality>") and an input mode to
+    `ms = fixed_ms + ms_per_munit * units / 1e6`, where `units` is the step's
+    work in pixels (see `Transformation.cost_units`). A "*" mode entry, fitted
+    over every mode, is the fallback for modes that were not benchmarked.
+
+    Args:
+        coefficients (dict): {step name: {mode: {"fixed_ms": float, "ms_per_munit": float}}}.
+    """
+
+    def __init__(self, coefficients: dict[str, dict[str, dict[str, float]]]):
+        self.coefficients = coefficients
+
+    @classmethod
+    def load(cls, path: str | Path = COST_MODEL_PATH) -> "CostModel":
+        """Load a model written by `manage.py calibrate_cost_model`; a missing file yields an empty model."""
+        path = Path(path)
+        if not path.exists():
+            return cls({})
+        return cls(json.loads(path.read_text()).get("coefficients", {}))
+
+    def estimate_ms(self, name: str, mode: str, units: float) -> float | None:
+        """
+        Estimate the milliseconds step `name` takes on `units` pixels of `mode`.
+
+        Returns:
+            float | None: The estimate, or None if the step was never calibrated.
+        """
+        by_mode = self.coefficients.get(name, {})
+        coefficients = by_mode.get(mode) or by_mode.get(ANY_MODE)
+        if coefficients is None:
+            return None
+        return coefficients["fixed_ms"] + coefficients["ms_per_munit"] * units / 1_000_000
+
+    def encode_step(self, image_format: str, quality: int) -> str:
+        """Return the calibrated encode step for `image_format` whose quality is nearest to `quality`."""
+        prefix = f"encode.{image_format.upper()}.q"
+        qualities = [int(name[len(prefix):]) for name in self.coefficients if name.startswith(prefix)]
+        if not qualities:
+            return f"{prefix}{quality}"
+        return f"{prefix}{min(qualities, key=lambda calibrated: abs(calibrated - quality))}"
+
+
+@lru_cache(maxsize=None)
+def get_cost_model() -> CostModel:
+    """Return the process-wide cost model loaded from COST_MODEL_PATH."""
+    return CostModel.load()
+
+
+def fit_linear(points: list[tuple[float, float]]) -> dict[str, Any]:
+    """
+    Fit `ms = fixed_ms + ms_per_munit * units / 1e6` by least squares.
+
+    Both coefficients are kept non-negative: a negative intercept refits the
+    line through the origin, and a negative slope falls back to the mean.
+
+    Args:
+        points: (units, milliseconds) samples.
+
+    Returns:
+        dict: {"fixed_ms", "ms_per_munit", "samples"}.
+    """
+    xs = [units / 1_000_000 for units, _ in points]
+    ys = [ms for _, ms in points]
+    count = len(points)
+    mean_x, mean_y = sum(xs) / count, sum(ys) / count
+    variance = sum((x - mean_x) ** 2 for x in xs)
+
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance if variance else 0.0
+    intercept = mean_y - slope * mean_x
+    if slope < 0:
+        slope, intercept = 0.0, mean_y
+    elif intercept < 0:
+        squares = sum(x * x for x in xs)
+        slope, intercept = (sum(x * y for x, y in zip(xs, ys)) / squares if squares else 0.0), 0.0
+    return {"fixed_ms": round(intercept, 6), "ms_per_munit": round(slope, 6), "samples": count}
@@ -0,0 +1,114 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .transformations.bands import BandPool
+from .workers import convert, init_worker
+
+
+def thread_pool(max_workers: int) -> Executor:
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-pipeline")
+
+
+def process_pool(max_workers: int) -> Executor:
+    return ProcessPoolExecutor(
+        max_workers=max_workers, initializer=init_worker, initargs=(settings.SETTINGS_MODULE,)
+    )
+
+
+EXECUTOR_BACKENDS: dict[str, Callable[[int], Executor]] = {
+    "thread": thread_pool,
+    "process": process_pool,
+}
+
+
+def build_executor(backend: str, max_workers: int) -> Executor:
+    """
+    Create a pipeline executor.
+
+    Args:
+        backend (str): A key of `EXECUTOR_BACKENDS`.
+        max_workers (int): Workers in the pool.
+
+    Raises:
+        ValueError: If `backend` is unknown.
+    """
+    factory = EXECUTOR_BACKENDS.get(backend)
+    if factory is None:
+        raise ValueError(f"Unknown executor backend {backend!r}; choose one of {sorted(EXECUTOR_BACKENDS)}")
+    return factory(max_workers)
+
+
+@lru_cache(maxsize=None)
+def get_pipeline_executor() -> Executor:
+    """
+    Return the process-wide thread pool async views run conversions on.
+
+    `settings.IMAGE_EXECUTOR["MAX_WORKERS"]` bounds how many conversions an
+    event loop hands off at once; the scheduler still caps how many of them
+    transform at the same time, so the rest wait in its shortest-job-first
+    queue rather than in the executor's FIFO.
+    """
+    options = getattr(settings, "IMAGE_EXECUTOR", {})
+    max_workers = options.get("MAX_WORKERS") or 4 * (os.cpu_count() or 1)
+    return thread_pool(max_workers)
+
+
+@lru_cache(maxsize=None)
+def get_worker_pool() -> Executor | None:
+    """
+    Return the process-wide pool that runs pipelines off the request thread, if any.
+
+    With `settings.IMAGE_EXECUTOR["BACKEND"]` set to "process", conversions
+    are decoded, transformed and encoded in one of `POOL_WORKERS` child
+    processes (0: one per CPU) while the request thread waits; with "thread"
+    they run on the request thread and this returns None.
+    """
+    options = getattr(settings, "IMAGE_EXECUTOR", {})
+    backend = options.get("BACKEND", "thread")
+    if backend == "thread":
+        return None
+    return build_executor(backend, options.get("POOL_WORKERS") or os.cpu_count() or 1)
+
+
+def convert_on_pool(image_file, config: dict) -> tuple[bytes, str, str]:
+    """
+    Convert an upload on the worker pool, blocking until it is done.
+
+    Returns:
+        tuple[bytes, str, str]: The encoded output, its format and the original format.
+
+    Raises:
+        ValueError, TypeError: If a transformation rejects its parameters.
+    """
+    image_file.seek(0)
+    return get_worker_pool().submit(convert, image_file.read(), config).result()
+
+
+@lru_cache(maxsize=None)
+def get_band_pool() -> BandPool | None:
+    """
+    Return the process-wide pool that splits one large filter or resize into bands.
+
+    `settings.IMAGE_EXECUTOR["BAND_WORKERS"]` sets its threads (0: one per
+    CPU); 1 turns band parallelism off and this returns None. The pool is
+    shared by all conversions, so it bounds the extra threads they use
+    together rather than per request.
+    """
+    options = getattr(settings, "IMAGE_EXECUTOR", {})
+    workers = options.get("BAND_WORKERS", 0) or os.cpu_count() or 1
+    return BandPool(workers) if workers > 1 else None
+
+
+@receiver(setting_changed)
+def reset_pipeline_executor(setting, **kwargs) -> None:
+    if setting == "IMAGE_EXECUTOR":
+        for getter in (get_pipeline_executor, get_worker_pool, get_band_pool):
+            if getter.cache_info().currsize and getter() is not None:
+                getter().shutdown(wait=False)
+            getter.cache_clear()
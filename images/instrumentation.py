@@ -0,0 +1,71 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from .metrics import STAGE_DURATION, TRANSFORM_DURATION, TRANSFORM_PIXELS
+from .tracing import Span, get_tracer
+
+TRANSFORM_PREFIX = "transform."
+
+
+class StageTimings:
+    """
+    Collects the duration of each stage of one conversion request.
+
+    Stages are named after what they time: "parse", "verify", "decode",
+    "encode", "storage", and "transform.<key>" for each applied transformation
+    (which also records the pixel count it processed), or "transform.fused"
+    for a run of geometric transforms fused into one resample; conversions run on a
+    worker pool report one "pool" stage, and batched ones one "batch" stage,
+    instead of decode, transforms and encode. The collected stages are
+    reported back in a `Server-Timing` header and aggregated into the
+    Prometheus histograms in `images.metrics`. Each stage is also a tracing
+    span (see `images.tracing`).
+    """
+
+    def __init__(self):
+        self.stages: list[tuple[str, float, int | None]] = []
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str, pixels: int | None = None) -> Iterator[Span]:
+        """Time the body of the `with` block as stage `name`, even if it raises, and yield its span."""
+        attributes = {"image.pixels": pixels} if pixels is not None else None
+        with get_tracer().start_span(name, attributes=attributes) as span:
+            start = time.perf_counter()
+            try:
+                yield span
+            finally:
+                self.stages.append((name, time.perf_counter() - start, pixels))
+
+    def server_timing(self) -> str:
+        """
+        Render the stages as a `Server-Timing` header value.
+
+        Returns:
+            str: e.g. 'parse;dur=1.20, transform.resize;dur=3.41;desc="786432 px", total;dur=9.80'
+        """
+        metrics = []
+        for name, duration, pixels in self.stages:
+            metric = f"{name};dur={duration * 1000:.2f}"
+            if pixels is not None:
+                metric += f';desc="{pixels} px"'
+            metrics.append(metric)
+        metrics.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(metrics)
+
+    def attach(self, response):
+        """Set the `Server-Timing` header on `response` and return it."""
+        response["Server-Timing"] = self.server_timing()
+        return response
+
+    def observe(self, output_format: str) -> None:
+        """Add every stage to the process-wide histograms, labelled with `output_format`."""
+        for name, duration, pixels in self.stages:
+            if name.startswith(TRANSFORM_PREFIX):
+                transform = name[len(TRANSFORM_PREFIX):]
+                TRANSFORM_DURATION.observe(duration, transform=transform, format=output_format)
+                if pixels is not None:
+                    TRANSFORM_PIXELS.observe(pixels, transform=transform, format=output_format)
+            else:
+                STAGE_DURATION.observe(duration, stage=name, format=output_format)
@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from images.benchmarks.codecs import FORMATS, QUALITIES, METRICS, run_matrix
+from images.benchmarks.corpus import SIZES, MODES
+from images.benchmarks.report import BASELINE_DIR, write_report, load_baseline, compare_to_baseline
+
+
+def parse_size(value: str) -> tuple[int, int]:
+    """Accept a corpus size name ("small") or an explicit "WIDTHxHEIGHT"."""
+    if value in SIZES:
+        return SIZES[value]
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise CommandError(f"Invalid size {value!r}; use one of {list(SIZES)} or WIDTHxHEIGHT")
+    return width, height
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark encode/decode time, throughput, output size and peak memory for every "
+        "format, quality, size and mode combination, and compare against a stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=FORMATS)
+        parser.add_argument("--qualities", nargs="+", type=int, default=list(QUALITIES))
+        parser.add_argument("--sizes", nargs="+", default=list(SIZES))
+        parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement.")
+        parser.add_argument("--no-memory", action="store_true", help="Skip forked peak-RSS measurement.")
+        parser.add_argument("--output", help="Write the report to this .json or .csv file.")
+        parser.add_argument("--baseline", default=str(BASELINE_DIR / "codecs.json"))
+        parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with this run.")
+        parser.add_argument(
+            "--threshold", type=float, default=25.0,
+            help="Allowed growth over the baseline, in percent, before a metric is flagged."
+        )
+
+    def handle(self, *args, **options):
+        rows = run_matrix(
+            formats=options["formats"],
+            qualities=options["qualities"],
+            sizes=[parse_size(size) for size in options["sizes"]],
+            modes=options["modes"],
+            repeat=options["repeat"],
+            memory=not options["no_memory"],
+        )
+
+        for row in rows:
+            if not row["supported"]:
+                self.stdout.write(f"{row['case']:<28} unsupported")
+                continue
+            self.stdout.write(
+                f"{row['case']:<28} encode {row['encode_ms']:8.2f} ms ({row['encode_mps']:7.1f} MP/s)  "
+                f"decode {row['decode_ms']:8.2f} ms ({row['decode_mps']:7.1f} MP/s)  "
+                f"{row['output_bytes']:>9} B  peak {row['peak_kib'] or '-'} KiB"
+            )
+
+        if options["output"]:
+            write_report(rows, options["output"])
+        if options["update_baseline"]:
+            write_report(rows, options["baseline"])
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['baseline']}"))
+            return
+
+        regressions = compare_to_baseline(
+            rows=rows,
+            baseline=load_baseline(options["baseline"]),
+            metrics=METRICS,
+            threshold=options["threshold"] / 100,
+        )
+        if regressions:
+            raise CommandError("Codec regressions against baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
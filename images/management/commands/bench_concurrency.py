@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from images.benchmarks.concurrency import WORKERS, run_band_latency, run_scaling
+from images.benchmarks.report import environment, write_report
+from images.executor import EXECUTOR_BACKENDS
+from images.management.commands.bench_codecs import parse_size
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how conversion throughput and memory scale with the number of workers of the "
+        "thread and process executors. Run it on a standard and a free-threaded "
+        "(3.13t) build to compare. With --bands, measure the latency of one large filter or resize "
+        "split into bands across the same worker counts instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backends", nargs="+", default=["thread"], choices=sorted(EXECUTOR_BACKENDS))
+        parser.add_argument("--workers", nargs="+", type=int, default=list(WORKERS))
+        parser.add_argument("--jobs", type=int, default=32, help="Conversions per measurement.")
+        parser.add_argument("--size", default="2048x1536", help="Input image size, e.g. 2048x1536.")
+        parser.add_argument(
+            "--bands", action="store_true",
+            help="Measure single-request latency of band-parallel filters and resize.",
+        )
+        parser.add_argument("--output", help="Write the report to this .json or .csv file.")
+        parser.add_argument(
+            "--min-efficiency", type=float,
+            help="Fail if efficiency at the largest worker count drops below this fraction, e.g. 0.6.",
+        )
+
+    def handle(self, *args, **options):
+        env = environment()
+        self.stdout.write(
+            f"Python {env['python']} (free-threaded: {env['free_threaded']}, GIL enabled: {env['gil_enabled']}), "
+            f"Pillow {env['pillow']}, {env['cpus']} CPUs"
+        )
+        if options["bands"]:
+            return self.handle_bands(options)
+
+        rows = []
+        for backend in options["backends"]:
+            try:
+                rows += run_scaling(
+                    workers=options["workers"], jobs=options["jobs"], size=parse_size(options["size"]), backend=backend,
+                )
+            except RuntimeError as e:
+                raise CommandError(str(e))
+
+        for row in rows:
+            self.stdout.write(
+                f"{row['case']:<16} {row['jobs_per_s']:8.2f} jobs/s  speedup {row['speedup']:5.2f}x  "
+                f"efficiency {row['efficiency']:6.1%}  RSS {row['rss_mb']:8.1f} MB"
+            )
+        if options["output"]:
+            write_report(rows, options["output"])
+
+        if options["min_efficiency"] is not None:
+            largest = max(options["workers"])
+            weak = [row for row in rows if row["workers"] == largest and row["efficiency"] < options["min_efficiency"]]
+            if weak:
+                raise CommandError(
+                    "Scaling below target: " + ", ".join(f"{row['case']} {row['efficiency']:.0%}" for row in weak)
+                )
+
+    def handle_bands(self, options):
+        rows = run_band_latency(workers=options["workers"], size=parse_size(options["size"]))
+        for row in rows:
+            self.stdout.write(
+                f"{row['case']:<28} {row['mean_ms']:9.2f} ms  p95 {row['p95_ms']:9.2f} ms  "
+                f"speedup {row['speedup']:5.2f}x  {'identical' if row['identical'] else 'DIFFERS'}"
+            )
+        if options["output"]:
+            write_report(rows, options["output"])
+
+        differing = [row["case"] for row in rows if not row["identical"]]
+        if differing:
+            raise CommandError("Band-parallel output differs from the single call: " + ", ".join(differing))
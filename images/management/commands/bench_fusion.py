@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from images.benchmarks.fusion import FUSION_CASES, run_color_fusion, run_fusion, run_histogram_sharing
+from images.benchmarks.report import write_report
+from images.management.commands.bench_codecs import parse_size
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare chains of geometric transforms (crop, rotate, resize, flips, borders) run step by "
+        "step against the same chains fused into one resample (`fuse_geometry`), reporting time "
+        "and edge sharpness for both. With --color, compare linear color chains (grayscale, brightness, "
+        "color, invert) against one color matrix (`fuse_color`). "
+        "With --histogram, compare autocontrast/equalize chains against one pass sharing their histogram, "
+        "exact and from a decimated proxy (`histogram_proxy`)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cases", nargs="+", default=list(FUSION_CASES), choices=FUSION_CASES)
+        parser.add_argument("--size", default="1024x768", help="Input image size, e.g. 1024x768.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement.")
+        parser.add_argument("--color", action="store_true", help="Measure fused color matrices.")
+        parser.add_argument("--histogram", action="store_true", help="Measure shared and proxy histograms.")
+        parser.add_argument("--output", help="Write the report to this .json or .csv file.")
+
+    def handle(self, *args, **options):
+        if options["color"]:
+            return self.handle_color(options)
+        if options["histogram"]:
+            return self.handle_histogram(options)
+
+        rows = run_fusion(size=parse_size(options["size"]), repeat=options["repeat"], cases=options["cases"])
+        for row in rows:
+            self.stdout.write(
+                f"{row['case']:<26} step by step {row['stepwise_ms']:8.2f} ms  fused {row['fused_ms']:8.2f} ms  "
+                f"speedup {row['speedup']:5.2f}x  sharpness {row['stepwise_sharpness']:8.1f} -> "
+                f"{row['fused_sharpness']:8.1f}"
+            )
+        if options["output"]:
+            write_report(rows, options["output"])
+
+        mismatched = [row["case"] for row in rows if not row["same_size"]]
+        if mismatched:
+            raise CommandError("Fused output size differs from the step-by-step one: " + ", ".join(mismatched))
+
+    def handle_color(self, options):
+        rows = run_color_fusion(size=parse_size(options["size"]), repeat=options["repeat"])
+        for row in rows:
+            self.stdout.write(
+                f"{row['case']:<36} step by step {row['stepwise_ms']:8.2f} ms  fused {row['fused_ms']:8.2f} ms  "
+                f"speedup {row['speedup']:5.2f}x  max difference {row['max_difference']}"
+            )
+        if options["output"]:
+            write_report(rows, options["output"])
+
+    def handle_histogram(self, options):
+        rows = run_histogram_sharing(size=parse_size(options["size"]), repeat=options["repeat"])
+        for row in rows:
+            self.stdout.write(
+                f"{row['case']:<28} step by step {row['stepwise_ms']:8.2f} ms  shared {row['shared_ms']:8.2f} ms  "
+                f"proxy {row['proxy_ms']:8.2f} ms  proxy max difference {row['proxy_max_difference']}"
+            )
+        if options["output"]:
+            write_report(rows, options["output"])
+
+        different = [row["case"] for row in rows if not row["identical"]]
+        if different:
+            raise CommandError("Shared-histogram output differs from the step-by-step one: " + ", ".join(different))
@@ -0,0 +1,106 @@
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import DatabaseError
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from images.benchmarks.load import DEFAULT_INPUTS, WSGITransport, HTTPTransport, build_workload, run_load
+from images.benchmarks.report import write_report
+from images.management.commands.bench_codecs import parse_size
+
+PATHS = ("anonymous", "authenticated")
+
+
+def bench_user_token() -> str:
+    """Return an access token for a dedicated benchmark user, creating it if needed."""
+    user, _ = get_user_model().objects.get_or_create(
+        email="bench@example.com", defaults={"username": "bench"}
+    )
+    return str(AccessToken.for_user(user))
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test POST /api/image/ end to end (parsing, validation, pipeline, encode, response) "
+        "for anonymous and authenticated requests, in-process through the WSGI application or "
+        "against a server URL, reporting RPS, p50/p95/p99 latency and per-worker RSS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", help="Target a running server instead, e.g. http://127.0.0.1:8000/api/image/.")
+        parser.add_argument("--token", help="Access token for the authenticated path when using --url.")
+        parser.add_argument("--paths", nargs="+", default=list(PATHS), choices=PATHS)
+        parser.add_argument("--workers", type=int, default=2, help="Forked worker processes.")
+        parser.add_argument("--concurrency", type=int, default=4, help="Client threads per worker.")
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per path.")
+        parser.add_argument(
+            "--sizes", nargs="+",
+            help="Input image sizes for the workload (default: one large JPEG and one small PNG)."
+        )
+        parser.add_argument("--output", help="Write the report to this .json or .csv file.")
+
+    def build_workload(self, options) -> list[tuple[bytes, str]]:
+        inputs = DEFAULT_INPUTS
+        if options["sizes"]:
+            inputs = [(parse_size(size), image_format) for size in options["sizes"] for image_format in ("JPEG", "PNG")]
+        return build_workload(inputs=inputs)
+
+    def handle(self, *args, **options):
+        workload = self.build_workload(options)
+        if not workload:
+            raise CommandError("The workload is empty.")
+
+        if options["url"]:
+            rows = self.run_paths(HTTPTransport(options["url"]), workload, options, token=options["token"])
+        else:
+            # Authenticated results go to a throwaway filesystem storage instead of the configured bucket.
+            with tempfile.TemporaryDirectory() as media_root, override_settings(
+                MEDIA_ROOT=media_root,
+                STORAGES={
+                    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+                },
+            ):
+                token = None
+                if "authenticated" in options["paths"]:
+                    try:
+                        token = bench_user_token()
+                    except DatabaseError as e:
+                        raise CommandError(f"Could not create the benchmark user ({e}); run `manage.py migrate` first.")
+                transport = WSGITransport(get_wsgi_application(), reverse("image-list"))
+                rows = self.run_paths(transport, workload, options, token=token)
+
+        if options["output"]:
+            write_report(rows, options["output"])
+
+    def run_paths(self, transport, workload, options, token: str | None) -> list[dict]:
+        rows = []
+        # Over --url the forked processes are load generators, not server workers.
+        rss_label = "client RSS" if options["url"] else "worker RSS"
+        for path in options["paths"]:
+            headers = {}
+            if path == "authenticated":
+                if not token:
+                    raise CommandError("The authenticated path needs --token when using --url.")
+                headers["Authorization"] = f"Bearer {token}"
+
+            result = run_load(
+                transport=transport,
+                workload=workload,
+                headers=headers,
+                workers=options["workers"],
+                concurrency=options["concurrency"],
+                duration=options["duration"],
+            )
+            rows.append({"case": path, **result})
+            self.stdout.write(
+                f"{path:<14} {result['requests']:>6} req  {result['errors']:>4} err  {result['rps']:8.1f} RPS  "
+                f"p50 {result['p50_ms'] or 0:8.1f} ms  p95 {result['p95_ms'] or 0:8.1f} ms  "
+                f"p99 {result['p99_ms'] or 0:8.1f} ms  {rss_label} {result['worker_rss_kib']} KiB  "
+                f"statuses {result['statuses']}"
+            )
+        return rows
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from images.benchmarks.palette import run_palette
+from images.benchmarks.report import write_report
+from images.management.commands.bench_codecs import parse_size
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare invert, posterize, solarize and brightness on a palette image, applied to its "
+        "palette, against expanding it to RGB first, reporting time and PNG size for both."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", default="2048x1536", help="Input image size, e.g. 2048x1536.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement.")
+        parser.add_argument("--output", help="Write the report to this .json or .csv file.")
+
+    def handle(self, *args, **options):
+        rows = run_palette(size=parse_size(options["size"]), repeat=options["repeat"])
+        for row in rows:
+            self.stdout.write(
+                f"{row['case']:<12} rgb {row['rgb_ms']:8.2f} ms  palette {row['palette_ms']:6.2f} ms  "
+                f"speedup {row['speedup']:7.2f}x  png {row['rgb_png_bytes']} -> {row['palette_png_bytes']} bytes"
+            )
+        if options["output"]:
+            write_report(rows, options["output"])
+
+        different = [row["case"] for row in rows if not row["identical"]]
+        if different:
+            raise CommandError("Palette output differs from the RGB one: " + ", ".join(different))
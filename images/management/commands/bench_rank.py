@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from images.benchmarks.rank import RANK_SIZES, run_rank_engine
+from images.benchmarks.report import write_report
+from images.management.commands.bench_codecs import parse_size
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare Pillow's min, max and median filters against the rank filter engine at growing "
+        "window sizes, and fail if their outputs differ."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="+", type=int, default=list(RANK_SIZES), help="Odd window sizes.")
+        parser.add_argument("--filters", nargs="+", default=["MIN", "MAX"], choices=["MIN", "MEDIAN", "MAX"])
+        parser.add_argument("--size", default="1024x768", help="Input image size, e.g. 1024x768.")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement.")
+        parser.add_argument("--output", help="Write the report to this .json or .csv file.")
+
+    def handle(self, *args, **options):
+        if any(size < 1 or size % 2 == 0 for size in options["sizes"]):
+            raise CommandError("Window sizes must be positive odd numbers.")
+
+        rows = run_rank_engine(
+            size=parse_size(options["size"]), repeat=options["repeat"],
+            sizes=options["sizes"], names=options["filters"],
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['case']:<14} pillow {row['pillow_ms']:10.2f} ms  engine {row['engine_ms']:8.2f} ms  "
+                f"speedup {row['speedup']:7.2f}x"
+            )
+        if options["output"]:
+            write_report(rows, options["output"])
+
+        different = [row["case"] for row in rows if not row["identical"]]
+        if different:
+            raise CommandError("Engine output differs from Pillow's: " + ", ".join(different))
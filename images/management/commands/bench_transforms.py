@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from images.benchmarks.corpus import MODES
+from images.benchmarks.report import BASELINE_DIR, write_report, load_baseline, compare_to_baseline
+from images.benchmarks.transforms import SIZES, METRICS, run_suite
+from images.management.commands.bench_codecs import parse_size
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark every transform registered in TRANSFORM_MAP with its representative "
+        "params at several sizes and modes, and fail when one regresses beyond a threshold."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keys", nargs="+", help="Only benchmark these transform keys.")
+        parser.add_argument("--sizes", nargs="+", default=list(SIZES))
+        parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case.")
+        parser.add_argument("--no-memory", action="store_true", help="Skip forked peak-RSS measurement.")
+        parser.add_argument("--output", help="Write the report to this .json or .csv file.")
+        parser.add_argument("--baseline", default=str(BASELINE_DIR / "transforms.json"))
+        parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with this run.")
+        parser.add_argument(
+            "--threshold", type=float, default=30.0,
+            help="Allowed growth over the baseline, in percent, before a case is flagged."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            rows = run_suite(
+                keys=options["keys"],
+                sizes=[parse_size(size) for size in options["sizes"]],
+                modes=options["modes"],
+                repeat=options["repeat"],
+                memory=not options["no_memory"],
+            )
+        except KeyError as e:
+            raise CommandError(f"Unknown transform key: {e}")
+
+        for row in rows:
+            if not row["supported"]:
+                self.stdout.write(f"{row['case']:<72} unsupported")
+                continue
+            self.stdout.write(
+                f"{row['case']:<72} mean {row['mean_ms']:8.2f} ms  p95 {row['p95_ms']:8.2f} ms  "
+                f"{row['mps']:8.1f} MP/s  peak {row['peak_kib'] or '-'} KiB"
+            )
+
+        if options["output"]:
+            write_report(rows, options["output"])
+        if options["update_baseline"]:
+            write_report(rows, options["baseline"])
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['baseline']}"))
+            return
+
+        regressions = compare_to_baseline(
+            rows=rows,
+            baseline=load_baseline(options["baseline"]),
+            metrics=METRICS,
+            threshold=options["threshold"] / 100,
+        )
+        if regressions:
+            raise CommandError("Transform regressions against baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
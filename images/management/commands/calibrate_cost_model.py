@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from images.benchmarks.calibration import calibrate
+from images.benchmarks.report import BASELINE_DIR, environment
+from images.cost_model import COST_MODEL_PATH
+
+
+class Command(BaseCommand):
+    help = (
+        "Fit the EXPLAIN cost model from bench_transforms and bench_codecs JSON reports "
+        "and write its coefficients as data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--transforms", default=str(BASELINE_DIR / "transforms.json"))
+        parser.add_argument("--codecs", default=str(BASELINE_DIR / "codecs.json"))
+        parser.add_argument("--output", default=str(COST_MODEL_PATH))
+
+    def handle(self, *args, **options):
+        reports = {}
+        for name in ("transforms", "codecs"):
+            path = Path(options[name])
+            if not path.exists():
+                raise CommandError(f"Benchmark report not found: {path}")
+            reports[name] = json.loads(path.read_text())
+
+        coefficients = calibrate(
+            transform_rows=reports["transforms"].get("results", []),
+            codec_rows=reports["codecs"].get("results", []),
+        )
+        payload = {
+            "environment": environment(),
+            "calibrated_from": {name: report.get("environment") for name, report in reports.items()},
+            "formula": "ms = fixed_ms + ms_per_munit * units / 1e6",
+            "coefficients": coefficients,
+        }
+        Path(options["output"]).write_text(json.dumps(payload, indent=2) + "\n")
+
+        for name, by_mode in coefficients.items():
+            fit = by_mode["*"]
+            self.stdout.write(
+                f"{name:<32} fixed {fit['fixed_ms']:9.3f} ms  {fit['ms_per_munit']:10.3f} ms/Munit  "
+                f"({fit['samples']} samples)"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Cost model written to {options['output']}"))
@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+import images.transformations as transformations
+from images.transformations.registry import MANIFEST_PATH, build_manifest, load_manifest
+
+
+class Command(BaseCommand):
+    help = (
+        "Import every transform module and write the key → module manifest the lazy "
+        "transform registry reads at startup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check", action="store_true",
+            help="Exit with an error if the manifest on disk is missing or out of date, without writing it.",
+        )
+
+    def handle(self, *args, **options):
+        manifest = build_manifest(transformations.__path__, transformations.__name__)
+        if options["check"]:
+            if load_manifest() != manifest:
+                raise CommandError(
+                    f"{MANIFEST_PATH} is out of date; run `manage.py generate_transform_manifest`."
+                )
+            self.stdout.write(self.style.SUCCESS(f"{MANIFEST_PATH} is up to date."))
+            return
+
+        MANIFEST_PATH.write_text(json.dumps(manifest, indent=2) + "\n")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(manifest)} transforms to {MANIFEST_PATH}"))
@@ -0,0 +1,65 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_TARGET = "import django; django.setup(); import config.urls"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_import_times(stderr: str) -> list[tuple[str, int, int]]:
+    """
+    Parse `python -X importtime` output.
+
+    Returns:
+        list[tuple[str, int, int]]: (module, self µs, cumulative µs) per imported module.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def by_package(rows: list[tuple[str, int, int]]) -> dict[str, int]:
+    """Sum self time per top-level package, which attributes every microsecond exactly once."""
+    totals: dict[str, int] = defaultdict(int)
+    for module, self_us, _ in rows:
+        totals[module.split(".")[0]] += self_us
+    return dict(totals)
+
+
+class Command(BaseCommand):
+    help = (
+        "Start a fresh interpreter under `-X importtime`, run a startup statement (by default "
+        "Django setup plus the URLconf) and report where import time goes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", default=DEFAULT_TARGET, help="Python statement to time.")
+        parser.add_argument("--top", type=int, default=15, help="Rows to show per table.")
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", options["target"]],
+            capture_output=True, text=True, env=os.environ.copy(),
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Target failed:\n{result.stderr[-2000:]}")
+
+        rows = parse_import_times(result.stderr)
+        total_us = sum(self_us for _, self_us, _ in rows)
+        self.stdout.write(f"{len(rows)} modules imported in {total_us / 1000:.1f} ms\n")
+
+        self.stdout.write("Self time by top-level package:")
+        for package, self_us in sorted(by_package(rows).items(), key=lambda item: -item[1])[:options["top"]]:
+            self.stdout.write(f"  {package:<32} {self_us / 1000:9.1f} ms  {self_us / total_us:6.1%}")
+
+        self.stdout.write("\nSlowest modules (cumulative):")
+        for module, _, cumulative_us in sorted(rows, key=lambda row: -row[2])[:options["top"]]:
+            self.stdout.write(f"  {module:<48} {cumulative_us / 1000:9.1f} ms")
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import CommandError
+
+from images.benchmarks.replay import load_capture, replay_workload, recorded_latency
+from images.management.commands.bench_http import Command as BenchHTTPCommand
+
+
+class Command(BenchHTTPCommand):
+    help = (
+        "Replay traffic recorded by TrafficCaptureMiddleware against this build, using the stored "
+        "originals where kept and synthetic images of the recorded shape otherwise, and report "
+        "RPS and latency next to the latencies seen at capture time."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--log", default=settings.IMAGE_TRAFFIC_CAPTURE["LOG_PATH"],
+            help="Capture log to replay (defaults to IMAGE_TRAFFIC_CAPTURE['LOG_PATH'])."
+        )
+        parser.add_argument("--limit", type=int, help="Replay only the first N records.")
+
+    def build_workload(self, options) -> list[tuple[bytes, str]]:
+        log_path = Path(options["log"])
+        if not log_path.exists():
+            raise CommandError(f"Capture log {log_path} does not exist; enable IMAGE_TRAFFIC_CAPTURE first.")
+
+        records = load_capture(log_path, limit=options["limit"])
+        workload, originals = replay_workload(records, images_dir=log_path.parent / "images")
+
+        recorded = recorded_latency(records)
+        self.stdout.write(
+            f"Replaying {len(records)} records ({originals} original images, "
+            f"{len(records) - originals} synthetic); captured latency "
+            f"p50 {recorded['p50_ms'] or 0:.1f} ms  p95 {recorded['p95_ms'] or 0:.1f} ms  "
+            f"p99 {recorded['p99_ms'] or 0:.1f} ms"
+        )
+        return workload
@@ -0,0 +1,250 @@
+import fcntl
+import json
+import os
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from django.conf import settings
+
+# A series as written to a snapshot file: [label values, per-bucket counts, sum].
+Series = list
+
+# In a shared metrics directory: one `<pid>.json` per live worker, the merged
+# series of exited workers, and the file readers and the archiver lock.
+SNAPSHOT_SUFFIX = ".json"
+ARCHIVE_NAME = "archive.json"
+LOCK_NAME = ".lock"
+
+DURATION_BUCKETS: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PIXEL_BUCKETS: tuple[float, ...] = (1e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7, 2.5e7, 5e7, 1e8)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text exposition format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+class Histogram:
+    """
+    A thread-safe Prometheus histogram with fixed label names.
+
+    Observations are kept in this process; `write_snapshot` publishes them
+    for `collect` to merge with other workers' at scrape time.
+
+    Args:
+        name (str): Metric name, e.g. "image_stage_duration_seconds".
+        documentation (str): The HELP text.
+        labelnames (Iterable[str]): Label names every observation must provide.
+        buckets (Iterable[float]): Upper bounds of the cumulative buckets.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str], buckets: Iterable[float]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+        self.changes = 0
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record `value` in the series identified by `labels`."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.setdefault(key, [[0] * len(self.buckets), 0.0])
+            counts[index] += 1
+            self._series[key][1] = total + value
+            self.changes += 1
+
+    def clear(self) -> None:
+        """Drop every recorded series."""
+        with self._lock:
+            self._series.clear()
+            self.changes += 1
+
+    def snapshot(self) -> list[Series]:
+        """Return every series in the form `merge` and snapshot files use."""
+        with self._lock:
+            return [[list(key), list(counts), total] for key, (counts, total) in self._series.items()]
+
+    def merge(self, series: Iterable[Series]) -> None:
+        """Add `series`, e.g. another process's `snapshot`, to this histogram."""
+        with self._lock:
+            for key, counts, total in series:
+                entry = self._series.setdefault(tuple(key), [[0] * len(self.buckets), 0.0])
+                entry[0] = [mine + theirs for mine, theirs in zip(entry[0], counts)]
+                entry[1] += total
+            self.changes += 1
+
+    def empty_copy(self) -> "Histogram":
+        """Return a histogram with this one's name, labels and buckets and no series."""
+        return Histogram(self.name, self.documentation, self.labelnames, self.buckets[:-1])
+
+    def render(self) -> list[str]:
+        """Return the exposition lines for this histogram."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, list(counts), total) for key, (counts, total) in self._series.items())
+        for key, counts, total in series:
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key))
+            prefix = labels + "," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{_format_bound(bound)}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+STAGE_DURATION = Histogram(
+    name="image_stage_duration_seconds",
+    documentation="Time spent in each stage of an image conversion request.",
+    labelnames=("stage", "format"),
+    buckets=DURATION_BUCKETS,
+)
+TRANSFORM_DURATION = Histogram(
+    name="image_transform_duration_seconds",
+    documentation="Time spent applying each transformation.",
+    labelnames=("transform", "format"),
+    buckets=DURATION_BUCKETS,
+)
+TRANSFORM_PIXELS = Histogram(
+    name="image_transform_pixels",
+    documentation="Input pixel count of each applied transformation.",
+    labelnames=("transform", "format"),
+    buckets=PIXEL_BUCKETS,
+)
+
+QUEUE_WAIT = Histogram(
+    name="image_queue_wait_seconds",
+    documentation="Time conversions waited in the scheduler queue for an execution slot.",
+    labelnames=("tier",),
+    buckets=DURATION_BUCKETS,
+)
+
+BATCH_SIZE = Histogram(
+    name="image_batch_size",
+    documentation="Conversions run together per micro-batch.",
+    labelnames=(),
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+REGISTRY: list[Histogram] = [STAGE_DURATION, TRANSFORM_DURATION, TRANSFORM_PIXELS, QUEUE_WAIT, BATCH_SIZE]
+
+
+_snapshot_lock = threading.Lock()
+_written_changes = -1
+
+
+@contextmanager
+def _locked(directory: str, exclusive: bool) -> Iterator[None]:
+    """Hold the metrics directory's lock: shared to read snapshots, exclusive to archive one."""
+    with open(os.path.join(directory, LOCK_NAME), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read(path: str) -> dict[str, list[Series]]:
+    try:
+        with open(path) as snapshot:
+            return json.load(snapshot)
+    except FileNotFoundError:
+        return {}
+
+
+def _write(path: str, data: dict[str, list[Series]]) -> None:
+    """Replace `path` with `data` atomically, so readers never see a partial file."""
+    partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(partial, "w") as snapshot:
+        json.dump(data, snapshot)
+    os.replace(partial, path)
+
+
+def write_snapshot(directory: str) -> None:
+    """Publish this process's series as `<pid>.json` in `directory`, unless nothing changed since last time."""
+    global _written_changes
+    with _snapshot_lock:
+        changes = sum(metric.changes for metric in REGISTRY)
+        if changes == _written_changes:
+            return
+        data = {metric.name: metric.snapshot() for metric in REGISTRY}
+        _write(os.path.join(directory, f"{os.getpid()}{SNAPSHOT_SUFFIX}"), data)
+        _written_changes = changes
+
+
+def archive_snapshot(directory: str, pid: int) -> None:
+    """
+    Fold the snapshot of exited process `pid` into the directory's archive.
+
+    Histogram totals must never drop, so a recycled worker's series stay in
+    every scrape; archiving them keeps the directory at one file per live
+    worker.
+    """
+    path = os.path.join(directory, f"{pid}{SNAPSHOT_SUFFIX}")
+    with _locked(directory, exclusive=True):
+        snapshot = _read(path)
+        if not snapshot:
+            return
+        archive_path = os.path.join(directory, ARCHIVE_NAME)
+        archive = _read(archive_path)
+        merged = {}
+        for metric in REGISTRY:
+            merged[metric.name] = metric.empty_copy()
+            merged[metric.name].merge(archive.get(metric.name, []))
+            merged[metric.name].merge(snapshot.get(metric.name, []))
+        _write(archive_path, {name: metric.snapshot() for name, metric in merged.items()})
+        os.remove(path)
+
+
+def reset_directory(directory: str) -> None:
+    """Create `directory` if needed and delete snapshots left in it by an earlier run."""
+    os.makedirs(directory, exist_ok=True)
+    with _locked(directory, exclusive=True):
+        for name in os.listdir(directory):
+            if name.endswith(SNAPSHOT_SUFFIX):
+                os.remove(os.path.join(directory, name))
+
+
+def collect(directory: str) -> list[Histogram]:
+    """Return the registered histograms with the series of every snapshot in `directory` merged."""
+    merged = {metric.name: metric.empty_copy() for metric in REGISTRY}
+    with _locked(directory, exclusive=False):
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(SNAPSHOT_SUFFIX):
+                for metric_name, series in _read(os.path.join(directory, name)).items():
+                    if metric_name in merged:
+                        merged[metric_name].merge(series)
+    return list(merged.values())
+
+
+def publish_metrics(**kwargs) -> None:
+    """`request_finished` receiver: write this process's snapshot when `settings.IMAGE_METRICS_DIR` is set."""
+    if settings.IMAGE_METRICS_DIR:
+        write_snapshot(settings.IMAGE_METRICS_DIR)
+
+
+def render_metrics() -> str:
+    """
+    Render every registered metric in the Prometheus text exposition format.
+
+    With `settings.IMAGE_METRICS_DIR` set, the series of every worker that
+    publishes there are summed, so each scrape covers the whole server
+    whichever worker answers it; otherwise only this process's are shown.
+    """
+    directory = settings.IMAGE_METRICS_DIR
+    metrics = REGISTRY
+    if directory:
+        write_snapshot(directory)
+        metrics = collect(directory)
+    return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
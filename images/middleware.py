@@ -0,0 +1,225 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .services import canonical_config
+from .tracing import get_tracer, parse_traceparent
+
+
+class TrafficCaptureMiddleware:
+    """
+    Record a sampled stream of image conversion requests for later replay.
+
+    For each sampled `POST /api/image/` or `POST /api/image/async/` one JSON line is appended to the capture
+    log with the canonical config, the input's dimensions, mode, format, byte
+    size and SHA-256, the response status and the end-to-end latency. Raw
+    uploads are kept next to the log only when `STORE_IMAGES` is enabled.
+
+    Configured through `settings.IMAGE_TRAFFIC_CAPTURE`; when `ENABLED` is
+    false Django drops the middleware at startup, so it costs nothing.
+    """
+    sync_capable = True
+    async_capable = True
+    _lock = threading.Lock()
+
+    # URL names of the conversion endpoints whose requests are captured.
+    url_names = frozenset({"image-list", "image-async"})
+
+    def __init__(self, get_response):
+        options = getattr(settings, "IMAGE_TRAFFIC_CAPTURE", {})
+        if not options.get("ENABLED"):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate: float = options.get("SAMPLE_RATE", 1.0)
+        self.log_path = Path(options["LOG_PATH"])
+        self.store_images: bool = options.get("STORE_IMAGES", False)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def sampled(self, request) -> bool:
+        """Return whether to capture `request`; its URL is only resolved once the response is built."""
+        match = request.resolver_match
+        return (
+            request.method == "POST"
+            and match is not None
+            and match.url_name in self.url_names
+            and random.random() < self.sample_rate
+        )
+
+    def capture(self, request, status_code: int, latency_ms: float) -> None:
+        record = self.build_record(request, status_code, latency_ms)
+        if record is not None:
+            self.write(record)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        start = time.perf_counter()
+        response = self.get_response(request)
+        if self.sampled(request):
+            self.capture(request, response.status_code, (time.perf_counter() - start) * 1000)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        if self.sampled(request):
+            latency_ms = (time.perf_counter() - start) * 1000
+            await sync_to_async(self.capture, thread_sensitive=False)(request, response.status_code, latency_ms)
+        return response
+
+    def build_record(self, request, status_code: int, latency_ms: float) -> dict[str, Any] | None:
+        """Describe one request, or return None if it carried no usable config or image."""
+        uploaded_file = request.FILES.get("image")
+        try:
+            config = json.loads(request.POST.get("config", ""))
+        except json.JSONDecodeError:
+            return None
+        if uploaded_file is None or not isinstance(config, dict):
+            return None
+
+        uploaded_file.seek(0)
+        data = uploaded_file.read()
+        uploaded_file.seek(0)
+        digest = hashlib.sha256(data).hexdigest()
+        try:
+            with Image.open(uploaded_file) as image:
+                width, height = image.size
+                image_format, mode = image.format, image.mode
+        except Exception:
+            return None
+        finally:
+            uploaded_file.seek(0)
+
+        if self.store_images:
+            self.store_image(digest, image_format, data)
+
+        return {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "config": canonical_config(config),
+            "width": width,
+            "height": height,
+            "format": image_format,
+            "mode": mode,
+            "bytes": len(data),
+            "sha256": digest,
+            "status": status_code,
+            "authenticated": bool(getattr(request, "user", None) and request.user.is_authenticated),
+            "latency_ms": round(latency_ms, 3),
+        }
+
+    def store_image(self, digest: str, image_format: str, data: bytes) -> None:
+        """Keep the raw upload, content-addressed, beside the capture log."""
+        path = self.log_path.parent / "images" / f"{digest}.{image_format.lower()}"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Append `record` to the capture log as one JSON line."""
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.log_path.open("a") as log:
+                log.write(line)
+
+
+class TracingMiddleware:
+    """
+    Open the root span of each request's trace.
+
+    Should be listed first so the span also covers the other middleware. An
+    incoming W3C `traceparent` header is honoured, so the request joins the
+    caller's trace. Configured through `settings.IMAGE_TRACING`; without an
+    exporter Django drops the middleware at startup.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.tracer = get_tracer()
+        if not self.tracer.enabled:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def start_span(self, request):
+        remote_parent = parse_traceparent(request.headers.get("traceparent"))
+        trace_id, parent_id = remote_parent or (None, None)
+        attributes = {"http.method": request.method, "http.target": request.path}
+        return self.tracer.start_span(
+            f"HTTP {request.method}", attributes=attributes, trace_id=trace_id, parent_id=parent_id
+        )
+
+    @staticmethod
+    def finish_span(span, request, response) -> None:
+        match = getattr(request, "resolver_match", None)
+        if match is not None:
+            route = match.route.replace("^", "").replace("$", "")
+            span.update_name(f"HTTP {request.method} {route}")
+            span.set_attribute("http.route", route)
+        span.set_attribute("http.status_code", response.status_code)
+        if response.status_code >= 500:
+            span.set_status("ERROR")
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self.start_span(request) as span:
+            response = self.get_response(request)
+            self.finish_span(span, request, response)
+        return response
+
+    async def __acall__(self, request):
+        with self.start_span(request) as span:
+            response = await self.get_response(request)
+            self.finish_span(span, request, response)
+        return response
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Report the cost-weighted throttle's budget in `X-RateLimit-*` response headers.
+
+    `CostRateThrottle` leaves the limit, the remaining budget and this
+    request's charge (all in seconds of estimated conversion time) on the
+    request; responses of unthrottled requests are left untouched.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def add_headers(request, response):
+        rate_limit = getattr(request, "rate_limit", None)
+        if rate_limit is not None:
+            response["X-RateLimit-Limit"] = str(rate_limit["limit"])
+            response["X-RateLimit-Remaining"] = f"{rate_limit['remaining']:.3f}"
+            response["X-RateLimit-Cost"] = f"{rate_limit['cost']:.3f}"
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.add_headers(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.add_headers(request, await self.get_response(request))
@@ -1,19 +1,64 @@
+from itertools import takewhile
+from typing import Any
+
 from PIL import Image
 
+from .instrumentation import StageTimings, TRANSFORM_PREFIX
+from .tracing import Span
 from .transformations import TRANSFORM_MAP
+from .transformations.color import COLOR_MATRIX_MODES, ColorMatrix, apply_color_matrix
+from .transformations.geometry import FUSABLE_MODES, Box, Geometry, apply_geometry
+from .transformations.histogram import LOOKUP_MODES, TableFn, apply_tables
+from .transformations.transform_classes.transformation_abstract import Transformation
+
+# Config key that opts a request into geometric fusion.
+FUSE_KEY = "fuse_geometry"
+
+# Config key that opts a request into color matrix fusion.
+FUSE_COLOR_KEY = "fuse_color"
+
+# Config key that lets autocontrast and equalize build their tables from a decimated histogram.
+HISTOGRAM_PROXY_KEY = "histogram_proxy"
+
+Step = tuple[str, Transformation, Any]
+
+# Steps whose output is a window of their input, so the steps before them can be limited to it.
+CROP_KEYS = ("region_crop", "border_crop")
+
+# Decoders that write rows top to bottom, so they can stop after the last row a conversion needs.
+SEQUENTIAL_CODECS = frozenset({"zip"})
+
+# Formats whose (non-interlaced) images are decoded by one of SEQUENTIAL_CODECS.
+SEQUENTIAL_FORMATS = frozenset({"PNG"})
+
+
+def set_image_attributes(span: Span, img: Image.Image) -> None:
+    """Record the dimensions and mode of `img` on `span`."""
+    span.set_attribute("image.width", img.width)
+    span.set_attribute("image.height", img.height)
+    span.set_attribute("image.mode", img.mode)
 
 
-def process_image_pipeline(image_file: Image, config: dict) -> tuple[Image.Image, str]:
+def process_image_pipeline(
+        image_file: Image,
+        config: dict,
+        timings: StageTimings | None = None
+) -> tuple[Image.Image, str]:
     """
     Process an image through a sequence of registered transformations.
 
-    Opens the given image file, records its original format, and applies each
-    transformation found in the global TRANSFORM_MAP according to the provided
-    configuration.
+    Opens and decodes the given image file, records its original format, and
+    applies each transformation found in the global TRANSFORM_MAP according to
+    the provided configuration.
 
     Args:
         image_file: A file path or file-like object representing the input image.
         config (dict): Mapping of transformation keys (str) to their parameter values.
+        timings (StageTimings, optional): Receives the "decode" stage and one
+            "transform.<key>" stage per applied transformation (one
+            "transform.fused" stage per fused geometric or color run and one
+            "transform.lut" stage per run of lookup steps, see `apply_steps`); their
+            spans carry the dimensions and mode of the image they received.
 
     Returns:
         tuple[Image.Image, str]:
@@ -23,13 +68,346 @@ def process_image_pipeline(image_file: Image, config: dict) -> tuple[Image.Image
     Raises:
         KeyError: If a transformation key in `config` is not present in TRANSFORM_MAP.
         ValueError: If a transformation's `apply` method raises an error for invalid params.
+        TypeError: If `fuse_geometry`, `fuse_color` or `histogram_proxy` is not a boolean.
+    """
+    timings = timings or StageTimings()
+    fuse = fusion_requested(config)
+    fuse_color = fusion_requested(config, FUSE_COLOR_KEY)
+    proxy = fusion_requested(config, HISTOGRAM_PROXY_KEY)
+
+    with timings.stage("decode") as span:
+        img = Image.open(image_file)
+        original_format = img.format
+        steps, window = push_down_crop(compile_steps(config), img.size, img.mode)
+        if window is not None:
+            limit_decode(img, window[3])
+        img.load()
+        span.set_attribute("image.format", original_format)
+        set_image_attributes(span, img)
+
+    return apply_steps(img, steps, fuse, timings, fuse_color, proxy), original_format
+
+
+def compile_steps(config: dict) -> list[Step]:
+    """Return (key, transformer, params) for each registered key of `config`, in order."""
+    return [(key, TRANSFORM_MAP[key], params) for key, params in config.items() if TRANSFORM_MAP.get(key)]
+
+
+def fusion_requested(config: dict, key: str = FUSE_KEY) -> bool:
+    """
+    Return whether `config` opts into geometric fusion, or the option named by `key`.
+
+    Raises:
+        TypeError: If the key is given but is not a boolean.
+    """
+    fuse = config.get(key, False)
+    if not isinstance(fuse, bool):
+        raise TypeError(f"{key} must be a boolean; got {fuse!r}")
+    return fuse
+
+
+def crop_params(box: Box) -> dict[str, int]:
+    """Return the `region_crop` params that crop `box`."""
+    left, upper, right, lower = box
+    return {"left": left, "upper": upper, "right": right, "lower": lower}
+
+
+def push_down_crop(steps: list[Step], size: tuple[int, int], mode: str) -> tuple[list[Step], Box | None]:
+    """
+    Limit the steps before the last crop in `steps` to the part of the image it keeps.
+
+    Walking back from the crop, each step's `input_region` widens the window
+    by the margin it reads around it, until a step needs the whole image. The
+    returned steps crop that window first (a "roi" step), run the steps in
+    between on it alone, and cut the crop's own box out of the result, which
+    gives the same pixels as running every step on the whole image.
+
+    Args:
+        steps (list[Step]): The compiled config.
+        size (tuple[int, int]): The size of the image the steps receive.
+        mode (str): Its PIL mode.
+
+    Returns:
+        tuple: The rewritten steps, and the window when the "roi" crop is the
+            first step (so decoding can stop below it), else None. Steps are
+            returned unchanged when no crop can be moved, including when a
+            step rejects its params; `apply` then raises as usual.
+    """
+    crops = [index for index, (key, _, _) in enumerate(steps) if key in CROP_KEYS]
+    if not crops:
+        return steps, None
+    end = crops[-1]
+    try:
+        shapes = [(size, mode)]
+        for _, transformer, params in steps[:end]:
+            shapes.append(transformer.output_shape(*shapes[-1], params))
+        key, transformer, params = steps[end]
+        crop = transformer.geometry(*shapes[end], params)
+        left, upper = int(crop.matrix[2]), int(crop.matrix[5])
+        crop_box = (left, upper, left + crop.size[0], upper + crop.size[1])
+
+        window, start = crop_box, end
+        while start > 0:
+            _, transformer, params = steps[start - 1]
+            region = transformer.input_region(window, *shapes[start - 1], params)
+            if region is None:
+                break
+            window, start = region, start - 1
+    except (ValueError, TypeError, OSError, NotImplementedError):
+        return steps, None
+    if start == end or window == (0, 0, *shapes[start][0]):
+        return steps, None
+
+    region_crop = TRANSFORM_MAP["region_crop"]
+    inner = (crop_box[0] - window[0], crop_box[1] - window[1], crop_box[2] - window[0], crop_box[3] - window[1])
+    rewritten = [
+        *steps[:start],
+        ("roi", region_crop, crop_params(window)),
+        *steps[start:end],
+        (key, region_crop, crop_params(inner)),
+        *steps[end + 1:],
+    ]
+    return rewritten, window if start == 0 else None
+
+
+def limit_decode(img: Image.Image, lower: int) -> bool:
+    """
+    Make an opened, not yet loaded image decode only its first `lower` rows.
+
+    Only formats decoded top to bottom in one pass qualify (non-interlaced
+    PNG); Pillow exposes no region decoding for JPEG or WebP, which are
+    decoded in full. Returns whether the decode was limited.
     """
-    img = Image.open(image_file)
-    original_format = img.format
+    if lower >= img.height or len(img.tile) != 1 or getattr(img, "n_frames", 1) != 1:
+        return False
+    tile = img.tile[0]
+    if tile.codec_name not in SEQUENTIAL_CODECS or img.info.get("interlace") or tile.extents != (0, 0, *img.size):
+        return False
+    img._size = (img.width, lower)
+    img.tile = [tile._replace(extents=(0, 0, img.width, lower))]
+    return True
 
-    for key, params in config.items():
-        transformer = TRANSFORM_MAP.get(key)
-        if transformer:
+
+def geometric_run(steps: list[Step], size: tuple[int, int], mode: str) -> tuple[list[Step], Geometry | None]:
+    """
+    Return the longest prefix of `steps` that composes into one affine resample, and its geometry.
+
+    A run ends at the first step that is not geometric or whose fill color
+    differs from one the run already exposes.
+    """
+    if mode not in FUSABLE_MODES:
+        return [], None
+    run: list[Step] = []
+    fused: Geometry | None = None
+    for step in steps:
+        _, transformer, params = step
+        geometry = transformer.geometry(fused.size if fused else size, mode, params)
+        combined = geometry if fused is None or geometry is None else fused.then(geometry)
+        if combined is None:
+            break
+        run.append(step)
+        fused = combined
+    return run, fused
+
+
+def color_run(steps: list[Step], mode: str) -> tuple[list[Step], ColorMatrix | None]:
+    """
+    Return the longest prefix of `steps` that composes into one color matrix, and the matrix.
+
+    A run ends at the first step that is not a linear color step, and after
+    the first step whose composed matrix can leave the 8-bit range (see
+    `ColorMatrix.in_range`), since the separate steps would clip there.
+    """
+    if mode not in COLOR_MATRIX_MODES:
+        return [], None
+    run: list[Step] = []
+    fused: ColorMatrix | None = None
+    for step in steps:
+        if fused is not None and not fused.in_range():
+            break
+        _, transformer, params = step
+        matrix = transformer.color_matrix(fused.mode if fused else mode, params)
+        if matrix is None:
+            break
+        run.append(step)
+        fused = matrix if fused is None else fused.then(matrix)
+    return run, fused
+
+
+def lookup_run(steps: list[Step], mode: str) -> tuple[list[Step], list[TableFn]]:
+    """Return the longest prefix of `steps` that are per-band lookups, and their table functions."""
+    if mode not in LOOKUP_MODES:
+        return [], []
+    run: list[Step] = []
+    tables: list[TableFn] = []
+    for step in steps:
+        _, transformer, params = step
+        table_fn = transformer.lookup_table(mode, params)
+        if table_fn is None:
+            break
+        run.append(step)
+        tables.append(table_fn)
+    return run, tables
+
+
+def apply_steps(
+        img: Image.Image,
+        steps: list[Step],
+        fuse: bool,
+        timings: StageTimings,
+        fuse_color: bool = False,
+        proxy: bool = False,
+) -> Image.Image:
+    """
+    Apply `steps` to `img`, each in its own "transform.<key>" stage.
+
+    With `fuse`, every run of two or more adjacent geometric steps (crops,
+    borders, resizes, rotations, flips) is instead composed into one affine
+    map and resampled once, with the strongest filter any of them uses, in a
+    "transform.fused" stage. That is one pass over the pixels instead of one
+    per step, and the image is interpolated once rather than repeatedly.
+
+    With `fuse_color`, every run of two or more adjacent linear color steps
+    (grayscale, brightness, color, invert) on an RGB image is likewise
+    composed into one 3×4 matrix and applied with a single `Image.convert`,
+    with no intermediate images; the result differs from separate steps by
+    their intermediate rounding only.
+
+    Every run of two or more adjacent per-band lookup steps (autocontrast,
+    equalize, invert, posterize, solarize, brightness) on an L or RGB image
+    runs as one `Image.point` pass with their tables composed, in a
+    "transform.lut" stage. The histogram autocontrast and equalize need is
+    counted once and remapped through the tables before each of them, so
+    the output is identical to separate steps. With `proxy`, lone lookup
+    steps go the same way and that histogram is counted over a decimated
+    view of the image instead.
+    """
+    index = 0
+    while index < len(steps):
+        run, geometry = geometric_run(steps[index:], img.size, img.mode) if fuse else ([], None)
+        if len(run) > 1:
+            with timings.stage(TRANSFORM_PREFIX + "fused", pixels=img.width * img.height) as span:
+                set_image_attributes(span, img)
+                span.set_attribute("image.fused", ",".join(key for key, _, _ in run))
+                img = apply_geometry(img, geometry)
+            index += len(run)
+            continue
+        run, matrix = color_run(steps[index:], img.mode) if fuse_color else ([], None)
+        if len(run) > 1:
+            with timings.stage(TRANSFORM_PREFIX + "fused", pixels=img.width * img.height) as span:
+                set_image_attributes(span, img)
+                span.set_attribute("image.fused", ",".join(key for key, _, _ in run))
+                img = apply_color_matrix(img, matrix)
+            index += len(run)
+            continue
+        run, tables = lookup_run(steps[index:], img.mode)
+        if len(run) > 1 or (proxy and run):
+            name = "lut" if len(run) > 1 else run[0][0]
+            with timings.stage(TRANSFORM_PREFIX + name, pixels=img.width * img.height) as span:
+                set_image_attributes(span, img)
+                span.set_attribute("image.fused", ",".join(key for key, _, _ in run))
+                img = apply_tables(img, tables, proxy)
+            index += len(run)
+            continue
+
+        key, transformer, params = steps[index]
+        with timings.stage(TRANSFORM_PREFIX + key, pixels=img.width * img.height) as span:
+            set_image_attributes(span, img)
             img = transformer.apply(img, params)
+        index += 1
+    return img
+
+
+# Modes whose images can share one stacked Pillow call; palette images each carry their own palette.
+STACKABLE_MODES = frozenset({"1", "L", "LA", "I", "F", "RGB", "RGBA", "RGBX", "CMYK", "YCbCr", "LAB", "HSV"})
+
+
+def stack_pointwise(images: list[Image.Image], steps: list[tuple[Transformation, object]]) -> list[Image.Image]:
+    """
+    Apply pointwise `steps` once to `images` stacked vertically and split the result.
+
+    Every image must have the same size and mode. Each part gets the `info`
+    the steps would have left on it alone, found by running them on a one-pixel
+    crop of it, so encoders see the same metadata as in the single pipeline.
+    """
+    width, height = images[0].size
+    stacked = Image.new(images[0].mode, (width, height * len(images)))
+    for index, img in enumerate(images):
+        stacked.paste(img, (0, index * height))
+    for transformer, params in steps:
+        stacked = transformer.apply(stacked, params)
+
+    parts = []
+    for index, img in enumerate(images):
+        probe = img.crop((0, 0, 1, 1))
+        for transformer, params in steps:
+            probe = transformer.apply(probe, params)
+        part = stacked.crop((0, index * height, width, (index + 1) * height))
+        part.info = probe.info.copy()
+        parts.append(part)
+    return parts
+
+
+def process_batch(image_files: list, config: dict) -> list[tuple[Image.Image, str] | Exception]:
+    """
+    Process several images through the same config, sharing work between them.
+
+    The registered transforms are looked up once for the whole batch. Images
+    of the same size and mode run the config's leading pointwise transforms as
+    one call on their vertical stack; the remaining transforms, and everything
+    for images with no twin, run image by image. Results are identical to
+    `process_image_pipeline` on each image.
+
+    Args:
+        image_files (list): File paths or file-like objects, one per image.
+        config (dict): Mapping of transformation keys to their parameters.
+
+    Returns:
+        list: For each input, either the processed image and its original
+            format, or the exception processing it raised.
+    """
+    fuse = fusion_requested(config)
+    fuse_color = fusion_requested(config, FUSE_COLOR_KEY)
+    proxy = fusion_requested(config, HISTOGRAM_PROXY_KEY)
+    steps = compile_steps(config)
+    shared = list(takewhile(lambda step: step[1].pointwise, steps))
+    timings = StageTimings()
+
+    results: list[tuple[Image.Image, str] | Exception] = []
+    for image_file in image_files:
+        try:
+            img = Image.open(image_file)
+            original_format = img.format
+            img.load()
+            results.append((img, original_format))
+        except Exception as e:
+            results.append(e)
+
+    done = [0] * len(results)
+    groups: dict[tuple, list[int]] = {}
+    for index, result in enumerate(results):
+        if not isinstance(result, Exception) and result[0].mode in STACKABLE_MODES:
+            groups.setdefault((result[0].size, result[0].mode), []).append(index)
+    for indexes in groups.values():
+        if not shared or len(indexes) < 2:
+            continue
+        try:
+            parts = stack_pointwise(
+                [results[index][0] for index in indexes], [(transformer, params) for _, transformer, params in shared]
+            )
+        except (ValueError, TypeError, OSError):
+            continue
+        for index, part in zip(indexes, parts):
+            results[index] = (part, results[index][1])
+            done[index] = len(shared)
 
-    return img, original_format
+    for index, result in enumerate(results):
+        if isinstance(result, Exception):
+            continue
+        img, original_format = result
+        try:
+            remaining, _ = push_down_crop(steps[done[index]:], img.size, img.mode)
+            results[index] = (apply_steps(img, remaining, fuse, timings, fuse_color, proxy), original_format)
+        except Exception as e:
+            results[index] = e
+    return results
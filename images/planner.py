@@ -0,0 +1,236 @@
+from typing import Any
+
+from PIL import Image
+
+from .cost_model import CostModel, get_cost_model, image_bytes
+from .instrumentation import TRANSFORM_PREFIX
+from .pipeline import (
+    FUSE_COLOR_KEY, HISTOGRAM_PROXY_KEY, SEQUENTIAL_FORMATS, Step, color_run, compile_steps, fusion_requested,
+    geometric_run, lookup_run, push_down_crop,
+)
+from .transformations import TRANSFORM_MAP
+
+
+def describe(size: tuple[int, int], mode: str, image_format: str | None = None) -> dict[str, Any]:
+    """Return the JSON shape of an intermediate image."""
+    shape = {"width": size[0], "height": size[1], "mode": mode}
+    if image_format is not None:
+        shape["format"] = image_format
+    return shape
+
+
+def plan_step(
+        name: str,
+        params: Any,
+        size: tuple[int, int],
+        mode: str,
+        output_size: tuple[int, int],
+        output_mode: str,
+        units: float,
+        cost_step: str,
+        cost_model: CostModel,
+        cost_mode: str | None = None,
+) -> dict[str, Any]:
+    """
+    Describe one step with its estimated CPU time and the pixel buffers it holds at its peak.
+
+    The time is `cost_step`'s on `units` of `cost_mode`, which defaults to the input mode.
+    """
+    peak = image_bytes(size, mode) + image_bytes(output_size, output_mode)
+    estimate = cost_model.estimate_ms(cost_step, cost_mode or mode, units)
+    return {
+        "step": name,
+        "params": params,
+        "input": describe(size, mode),
+        "output": describe(output_size, output_mode),
+        "cost_units": units,
+        "estimated_ms": round(estimate, 3) if estimate is not None else None,
+        "estimated_peak_bytes": peak,
+    }
+
+
+def plan_run(
+        name: str,
+        run: list[Step],
+        size: tuple[int, int],
+        mode: str,
+        output_size: tuple[int, int],
+        output_mode: str,
+        cost_model: CostModel,
+) -> dict[str, Any]:
+    """
+    Describe a run of steps the pipeline applies as one pass over the pixels.
+
+    The pass is costed as the most expensive of the steps it replaces, each
+    planned on the image it would have received; it is uncalibrated if any of
+    them is. Its peak holds only the run's input and output buffers, since no
+    intermediate image is made.
+    """
+    costs = []
+    shape = (size, mode)
+    for _, transformer, params in run:
+        output_shape = transformer.output_shape(*shape, params)
+        units = transformer.cost_units(shape[0], output_shape[0], params)
+        cost_step = TRANSFORM_PREFIX + transformer.key()
+        costs.append((cost_model.estimate_ms(cost_step, shape[1], units), cost_step, shape[1], units))
+        shape = output_shape
+    uncalibrated = [cost for cost in costs if cost[0] is None]
+    _, cost_step, cost_mode, units = uncalibrated[0] if uncalibrated else max(costs, key=lambda cost: cost[0])
+    return plan_step(
+        name=TRANSFORM_PREFIX + name, params={key: params for key, _, params in run}, size=size, mode=mode,
+        output_size=output_size, output_mode=output_mode, units=units, cost_step=cost_step,
+        cost_model=cost_model, cost_mode=cost_mode,
+    )
+
+
+def explain_pipeline(
+        config: dict,
+        size: tuple[int, int],
+        mode: str,
+        image_format: str,
+        cost_model: CostModel | None = None,
+) -> dict[str, Any]:
+    """
+    Plan `process_image_pipeline` and `save_conversion` for an image without running them.
+
+    The plan mirrors the real execution: a decode step, the transform steps
+    `apply_steps` would run, in config order (unknown keys are listed under
+    "skipped", just as the pipeline ignores them), and an encode step to the
+    output format. A run of geometric steps that `apply_steps` fuses into one
+    resample, or of color steps it fuses into one matrix, is planned as that
+    one "transform.fused" step, and a run of lookup steps it merges into one
+    `Image.point` pass as that one "transform.lut" step (see `plan_run`).
+
+    A final crop is pushed in front of the filters before it (see
+    `push_down_crop`), so they are planned on the window they will actually
+    process, after a "transform.roi" step that crops it. When that window
+    starts the pipeline and the format decodes top to bottom, the decode is
+    planned down to the window's last row only, as `limit_decode` stops it
+    there (an interlaced PNG, which is decoded in full, is underestimated).
+    Sizes and modes come from each transform's `output_shape`; CPU time comes
+    from the calibrated cost model and peak memory from the input and output
+    pixel buffers each step holds.
+
+    Args:
+        config (dict): The conversion config, as accepted by the image endpoint.
+        size (tuple[int, int]): Input (width, height).
+        mode (str): Input PIL mode.
+        image_format (str): Input format, e.g. "JPEG".
+        cost_model (CostModel, optional): Defaults to the calibrated model on disk.
+
+    Returns:
+        dict: The input and predicted output shapes, the steps, and the
+            estimated total milliseconds and peak bytes. Steps the model has
+            no coefficients for report `estimated_ms: null` and are listed in
+            "uncalibrated".
+
+    Raises:
+        ValueError: If a transform rejects its params, as it would at runtime.
+        TypeError: If a transform's params have the wrong type.
+        OSError, NotImplementedError: If a transform does not support the mode it would receive.
+    """
+    cost_model = cost_model or get_cost_model()
+    image_format = image_format.upper()
+    quality = config.get("optimize", 100)
+    if not isinstance(quality, int) or isinstance(quality, bool):
+        raise TypeError(f"optimize must be an integer quality; got {quality!r}")
+    fuse = fusion_requested(config)
+    fuse_color = fusion_requested(config, FUSE_COLOR_KEY)
+    proxy = fusion_requested(config, HISTOGRAM_PROXY_KEY)
+    source = describe(size, mode, image_format)
+    transforms, window = push_down_crop(compile_steps(config), size, mode)
+    if window is not None and image_format in SEQUENTIAL_FORMATS:
+        size = (size[0], min(size[1], window[3]))
+    steps = [plan_step(
+        name="decode", params=None, size=size, mode=mode, output_size=size, output_mode=mode,
+        units=float(size[0] * size[1]), cost_step=f"decode.{image_format}", cost_model=cost_model,
+    )]
+    skipped = [key for key in config if TRANSFORM_MAP.get(key) is None]
+
+    index = 0
+    while index < len(transforms):
+        run, geometry = geometric_run(transforms[index:], size, mode) if fuse else ([], None)
+        if len(run) > 1:
+            steps.append(plan_run("fused", run, size, mode, geometry.size, mode, cost_model))
+            size = geometry.size
+            index += len(run)
+            continue
+        run, matrix = color_run(transforms[index:], mode) if fuse_color else ([], None)
+        if len(run) > 1:
+            steps.append(plan_run("fused", run, size, mode, size, matrix.mode, cost_model))
+            mode = matrix.mode
+            index += len(run)
+            continue
+        run, _ = lookup_run(transforms[index:], mode)
+        if len(run) > 1 or (proxy and run):
+            name = "lut" if len(run) > 1 else run[0][0]
+            steps.append(plan_run(name, run, size, mode, size, mode, cost_model))
+            index += len(run)
+            continue
+
+        key, transformer, params = transforms[index]
+        output_size, output_mode = transformer.output_shape(size, mode, params)
+        steps.append(plan_step(
+            name=TRANSFORM_PREFIX + key, params=params, size=size, mode=mode,
+            output_size=output_size, output_mode=output_mode,
+            units=transformer.cost_units(size, output_size, params),
+            cost_step=TRANSFORM_PREFIX + transformer.key(), cost_model=cost_model,
+        ))
+        size, mode = output_size, output_mode
+        index += 1
+
+    output_format = str(config.get("format", image_format)).upper()
+    steps.append(plan_step(
+        name="encode", params={"format": output_format, "quality": quality},
+        size=size, mode=mode, output_size=(0, 0), output_mode=mode,
+        units=float(size[0] * size[1]),
+        cost_step=cost_model.encode_step(output_format, quality), cost_model=cost_model,
+    ))
+    steps[-1]["output"] = {"format": output_format}
+
+    estimates = [step["estimated_ms"] for step in steps if step["estimated_ms"] is not None]
+    return {
+        "input": source,
+        "steps": steps,
+        "skipped": skipped,
+        "output": describe(size, mode, output_format),
+        "estimated_ms": round(sum(estimates), 3),
+        "estimated_peak_bytes": max(step["estimated_peak_bytes"] for step in steps),
+        "uncalibrated": [step["step"] for step in steps if step["estimated_ms"] is None],
+    }
+
+
+def plan_upload(request, image_file, config: dict) -> dict[str, Any]:
+    """
+    Plan the conversion of an upload from its header, once per request.
+
+    The cost throttle and admission control both charge from this plan: the
+    first of them reads the header and runs `explain_pipeline`, and the
+    result, or the error it raised, is kept on the request for the other.
+    The file is rewound afterwards.
+
+    Args:
+        request: The Django or DRF request converting `image_file`.
+        image_file: The uploaded file; only its header is read.
+        config (dict): The parsed conversion config.
+
+    Raises:
+        Image.DecompressionBombError: If the header claims too many pixels.
+        ValueError, TypeError, OSError, NotImplementedError: If the header is
+            unreadable or a transform rejects its params.
+    """
+    http_request = getattr(request, "_request", request)
+    cached = getattr(http_request, "image_plan", None)
+    if cached is None or cached[0] != config:
+        try:
+            with Image.open(image_file) as header:
+                size, mode, image_format = header.size, header.mode, header.format
+            outcome = explain_pipeline(config=config, size=size, mode=mode, image_format=image_format)
+        except Exception as e:
+            outcome = e
+        finally:
+            image_file.seek(0)
+        cached = http_request.image_plan = (config, outcome)
+    if isinstance(cached[1], Exception):
+        raise cached[1]
+    return cached[1]
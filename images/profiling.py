@@ -0,0 +1,161 @@
+import cProfile
+import io
+import marshal
+import pstats
+import tracemalloc
+import uuid
+from typing import Callable
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.response import Response
+
+from .benchmarks.measure import current_rss_kib
+
+PROFILE_MODES: tuple[str, ...] = ("cpu", "mem")
+TOP_ALLOCATIONS = 50
+MAX_STACK_DEPTH = 64
+MIN_PATH_SECONDS = 1e-6
+
+# Names profile_request saves artifacts under: "<uuid hex>-<mode>.<suffix>".
+PROFILE_NAME_PATTERN = r"[0-9a-f]{32}-(?:cpu|mem)\.[a-z]+(?:\.[a-z]+)?"
+
+
+def profile_storage() -> FileSystemStorage:
+    """
+    Return the local storage profiles are written to (never the cloud bucket).
+
+    It has no public URL: profiles are only served to staff by the
+    `image-profile` endpoint.
+    """
+    return FileSystemStorage(location=settings.IMAGE_PROFILE_ROOT)
+
+
+def collapsed_stacks(stats: pstats.Stats) -> str:
+    """
+    Derive flamegraph-compatible collapsed stacks from cProfile statistics.
+
+    cProfile only records caller→callee edges, so each function's own time is
+    split across its call paths in proportion to the cumulative time of each
+    edge (the same approximation flameprof and gprof2dot use). Recursive paths
+    are cut at the first repeat, and paths carrying less than a microsecond or
+    deeper than MAX_STACK_DEPTH are dropped so the walk stays bounded.
+
+    Args:
+        stats: Loaded profile statistics.
+
+    Returns:
+        str: One "frame;frame;frame microseconds" line per call path.
+    """
+    entries = stats.stats
+    callees: dict[tuple, dict[tuple, float]] = {}
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, (_, _, _, edge_cumulative) in callers.items():
+            callees.setdefault(caller, {})[function] = edge_cumulative
+
+    def label(function: tuple) -> str:
+        filename, line, name = function
+        return f"{name} ({filename}:{line})".replace(";", ":")
+
+    totals: dict[str, float] = {}
+
+    def walk(function: tuple, stack: tuple[str, ...], share: float) -> None:
+        own = entries[function][2]
+        stack = stack + (label(function),)
+        path = ";".join(stack)
+        totals[path] = totals.get(path, 0.0) + own * share
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_cumulative in callees.get(function, {}).items():
+            callee_cumulative = entries[callee][3]
+            if share * edge_cumulative < MIN_PATH_SECONDS or label(callee) in stack:
+                continue
+            walk(callee, stack, share * edge_cumulative / callee_cumulative)
+
+    for function, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            walk(function, (), 1.0)
+
+    return "".join(
+        f"{path} {round(seconds * 1_000_000)}\n"
+        for path, seconds in sorted(totals.items())
+        if round(seconds * 1_000_000) > 0
+    )
+
+
+def run_cpu_profile(fn: Callable[[], Response]) -> tuple[Response, dict[str, bytes]]:
+    """Run `fn` under cProfile and return its response plus pstats and collapsed stacks."""
+    profiler = cProfile.Profile()
+    response = profiler.runcall(fn)
+    stats = pstats.Stats(profiler)
+    return response, {
+        "prof": marshal.dumps(stats.stats),
+        "collapsed.txt": collapsed_stacks(stats).encode(),
+    }
+
+
+def run_memory_profile(fn: Callable[[], Response]) -> tuple[Response, dict[str, bytes]]:
+    """Run `fn` under tracemalloc and return its response plus a top allocation sites report."""
+    rss_before = current_rss_kib()
+    tracemalloc.start(25)
+    try:
+        response = fn()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    report = io.StringIO()
+    report.write(
+        f"# traced Python allocations: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n"
+        f"# process RSS: {rss_before} KiB before, {current_rss_kib()} KiB after "
+        f"(Pillow pixel buffers are allocated outside tracemalloc)\n\n"
+    )
+    for statistic in snapshot.statistics("traceback")[:TOP_ALLOCATIONS]:
+        report.write(f"{statistic.size / 1024:.1f} KiB in {statistic.count} blocks\n")
+        for line in statistic.traceback.format():
+            report.write(f"  {line}\n")
+    return response, {"allocations.txt": report.getvalue().encode()}
+
+
+def profile_request(request, mode: str, fn: Callable[[], Response]) -> Response:
+    """
+    Run one request handler under the profiler selected by `mode` and link the result.
+
+    The artifacts are saved to the local profile storage and the URLs of the
+    staff-only `image-profile` endpoint serving them are returned,
+    comma-separated, in the `X-Profile-URL` header.
+
+    Both profilers only see this process, and cProfile only this thread. When
+    the conversion runs on the worker pool or in a batch led by another
+    request, the profile shows the request waiting for it, not the decode,
+    transforms and encode themselves.
+
+    Args:
+        request: The incoming request, used to build absolute URLs.
+        mode (str): "cpu" (cProfile) or "mem" (tracemalloc).
+        fn: Zero-argument callable producing the response.
+
+    Returns:
+        Response: The handler's response with profile links, or HTTP 400 for an unknown mode.
+    """
+    mode = mode.strip().lower()
+    if mode not in PROFILE_MODES:
+        return Response(
+            {"detail": f"X-Profile must be one of {list(PROFILE_MODES)}; got {mode!r}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    response, artifacts = run_cpu_profile(fn) if mode == "cpu" else run_memory_profile(fn)
+
+    storage = profile_storage()
+    profile_id = uuid.uuid4().hex
+    links = []
+    for suffix, content in artifacts.items():
+        name = storage.save(f"{profile_id}-{mode}.{suffix}", ContentFile(content))
+        links.append(request.build_absolute_uri(reverse("image-profile", kwargs={"name": name})))
+    response["X-Profile-URL"] = ", ".join(links)
+    return response
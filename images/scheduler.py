@@ -0,0 +1,221 @@
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Any
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+from .admission import Admission
+from .metrics import QUEUE_WAIT
+
+
+class Job:
+    """One conversion waiting for a slot."""
+    __slots__ = ("user", "tier", "cost", "enqueued", "granted", "event")
+
+    def __init__(self, user: str, tier: str, cost: float):
+        self.user = user
+        self.tier = tier
+        self.cost = cost
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.event = threading.Event()
+
+
+class Slot:
+    """A granted execution slot; release it with `with` or `release()`."""
+
+    def __init__(self, scheduler: "FairShareScheduler | None"):
+        self.scheduler = scheduler
+
+    def release(self) -> None:
+        if self.scheduler is not None:
+            self.scheduler.release()
+            self.scheduler = None
+
+    def __enter__(self) -> "Slot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class FairShareScheduler:
+    """
+    Grants a fixed number of conversion slots, shortest job first, with fair shares.
+
+    When a slot frees up the next job is chosen in two levels:
+
+    1. Among tiers with waiting jobs ("authenticated", "anonymous"), the one
+       with the least cost served relative to its configured share.
+    2. Within that tier, the job with the lowest score
+       `user's served cost + job cost - AGING_RATE × ms waited`. Cheap jobs go
+       first (shortest job first), users who were served a lot wait behind
+       those who were not (per-user fairness), and every job's score falls the
+       longer it waits, so expensive jobs are never starved.
+
+    Users and tiers that go idle restart at the current minimum usage, so
+    idle time does not bank credit. Cost is the job's estimated milliseconds
+    from the EXPLAIN plan (pixels weighted by the calibrated per-transform cost).
+
+    Args:
+        slots (int): Conversions allowed to run at once in this process.
+        shares (dict[str, float]): Relative share of each tier.
+        aging_rate (float): Cost units forgiven per millisecond spent waiting.
+    """
+    MAX_IDLE_USERS = 1000
+
+    def __init__(self, slots: int, shares: dict[str, float], aging_rate: float):
+        self.slots = slots
+        self.shares = shares
+        self.aging_rate = aging_rate
+        self.running = 0
+        self.waiting: list[Job] = []
+        self.tier_usage: dict[str, float] = {}
+        self.user_usage: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, user: str, tier: str, cost: float, timeout: float) -> Slot | None:
+        """
+        Queue a job and block until it is granted a slot.
+
+        Args:
+            user (str): Identity used for per-user fairness.
+            tier (str): Share tier, e.g. "authenticated" or "anonymous".
+            cost (float): Estimated cost of the job.
+            timeout (float): Seconds to wait before giving up.
+
+        Returns:
+            Slot | None: The granted slot, or None if `timeout` expired first.
+        """
+        job = Job(user=user, tier=tier, cost=cost)
+        with self._lock:
+            self._activate(job)
+            self.waiting.append(job)
+            self._dispatch()
+
+        if not job.event.wait(timeout):
+            with self._lock:
+                if not job.granted:
+                    self.waiting.remove(job)
+                    return None
+        QUEUE_WAIT.observe(time.monotonic() - job.enqueued, tier=tier)
+        return Slot(self)
+
+    def release(self) -> None:
+        """Free a slot and hand it to the next job."""
+        with self._lock:
+            self.running -= 1
+            self._dispatch()
+
+    def share(self, tier: str) -> float:
+        return self.shares.get(tier, 1.0)
+
+    def _activate(self, job: Job) -> None:
+        """Bring an idle tier or user up to the current minimum usage so idleness earns no credit."""
+        tiers = {waiting.tier for waiting in self.waiting}
+        if job.tier not in tiers:
+            floor = min((self.tier_usage.get(t, 0.0) / self.share(t) for t in tiers), default=0.0)
+            usage = self.tier_usage.get(job.tier, 0.0)
+            self.tier_usage[job.tier] = max(usage, floor * self.share(job.tier))
+
+        key = (job.tier, job.user)
+        users = {(waiting.tier, waiting.user) for waiting in self.waiting}
+        if key not in users:
+            peers = [self.user_usage.get(user, 0.0) for user in users if user[0] == job.tier]
+            self.user_usage[key] = max(self.user_usage.get(key, 0.0), min(peers, default=0.0))
+
+    def _next_job(self) -> Job:
+        now = time.monotonic()
+        tiers = {job.tier for job in self.waiting}
+        tier = min(tiers, key=lambda t: (self.tier_usage.get(t, 0.0) / self.share(t), t))
+        return min(
+            (job for job in self.waiting if job.tier == tier),
+            key=lambda job: (
+                self.user_usage.get((job.tier, job.user), 0.0)
+                + job.cost
+                - self.aging_rate * (now - job.enqueued) * 1000
+            ),
+        )
+
+    def _dispatch(self) -> None:
+        while self.running < self.slots and self.waiting:
+            job = self._next_job()
+            self.waiting.remove(job)
+            self.running += 1
+            self.tier_usage[job.tier] = self.tier_usage.get(job.tier, 0.0) + job.cost
+            key = (job.tier, job.user)
+            self.user_usage[key] = self.user_usage.get(key, 0.0) + job.cost
+            job.granted = True
+            job.event.set()
+        if len(self.user_usage) > self.MAX_IDLE_USERS:
+            waiting = {(job.tier, job.user) for job in self.waiting}
+            self.user_usage = {key: usage for key, usage in self.user_usage.items() if key in waiting}
+
+
+class SchedulerGate:
+    """
+    Applies `settings.IMAGE_SCHEDULER` to admitted conversions; a no-op when disabled.
+    """
+
+    def __init__(self, options: dict[str, Any]):
+        self.enabled: bool = options.get("ENABLED", True)
+        self.queue_timeout: float = options.get("QUEUE_TIMEOUT", 30.0)
+        self.retry_after: int = options.get("RETRY_AFTER", 5)
+        self.scheduler = FairShareScheduler(
+            slots=options.get("SLOTS") or os.cpu_count() or 1,
+            shares=options.get("SHARES", {}),
+            aging_rate=options.get("AGING_RATE", 1.0),
+        )
+
+    @staticmethod
+    def identity(request) -> str:
+        """Return the fairness key of a request: the user's pk, or the client address for anonymous users."""
+        if request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return f"anon:{BaseThrottle().get_ident(request)}"
+
+    def schedule(self, request, admission: Admission) -> Slot | Response:
+        """
+        Wait for an execution slot for an admitted conversion.
+
+        Args:
+            request: The DRF request, used for the per-user fairness key.
+            admission (Admission): The admitted request; its tier and plan's
+                estimated milliseconds set the share and the job cost.
+
+        Returns:
+            Slot: Hold it while the image is decoded, transformed and encoded.
+            Response: 503 with `Retry-After` when no slot frees up within `QUEUE_TIMEOUT`.
+        """
+        if not self.enabled:
+            return Slot(None)
+        cost = admission.plan["estimated_ms"] if admission.plan is not None else 0.0
+        slot = self.scheduler.acquire(
+            user=self.identity(request), tier=admission.tier, cost=cost, timeout=self.queue_timeout
+        )
+        if slot is None:
+            return Response(
+                {"detail": "Server is busy converting other images; retry later."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        return slot
+
+
+@lru_cache(maxsize=None)
+def get_scheduler() -> SchedulerGate:
+    """Return the process-wide scheduler configured by `settings.IMAGE_SCHEDULER`."""
+    return SchedulerGate(getattr(settings, "IMAGE_SCHEDULER", {}))
+
+
+@receiver(setting_changed)
+def reset_scheduler(setting, **kwargs) -> None:
+    if setting == "IMAGE_SCHEDULER":
+        get_scheduler.cache_clear()
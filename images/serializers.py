@@ -1,10 +1,11 @@
+import json
 from io import BytesIO
 
-from PIL import Image
+from PIL import Image, ImageMode
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from rest_framework import serializers
 
-from .models import ImageConversion
+from .models import ImageConversion, FORMAT_CHOICES
 
 
 class ImageSerializer(serializers.ModelSerializer):
@@ -42,3 +43,51 @@ class UploadImageSerializer(serializers.Serializer):
 
         image.seek(0)
         return image
+
+
+class ExplainSerializer(serializers.Serializer):
+    """
+    Input of the EXPLAIN endpoint: a config plus either an image, of which only
+    the header is read, or its width, height and format (mode defaults to RGB).
+    """
+    config = serializers.JSONField()
+    image = serializers.FileField(required=False, allow_empty_file=False)
+    width = serializers.IntegerField(required=False, min_value=1)
+    height = serializers.IntegerField(required=False, min_value=1)
+    format = serializers.ChoiceField(required=False, choices=FORMAT_CHOICES)
+    mode = serializers.CharField(required=False, default="RGB")
+
+    def validate_config(self, config):
+        if isinstance(config, str):
+            try:
+                config = json.loads(config)
+            except json.JSONDecodeError:
+                raise serializers.ValidationError("Invalid JSON format in 'config'.")
+        if not isinstance(config, dict):
+            raise serializers.ValidationError("'config' must be a JSON object.")
+        return config
+
+    def validate_mode(self, mode: str) -> str:
+        try:
+            ImageMode.getmode(mode)
+        except KeyError:
+            raise serializers.ValidationError(f"Unknown image mode: {mode}.")
+        return mode
+
+    def validate(self, attrs):
+        image = attrs.get("image")
+        if image is not None:
+            try:
+                with Image.open(image) as header:
+                    attrs["width"], attrs["height"] = header.size
+                    attrs["mode"], attrs["format"] = header.mode, header.format
+            except Exception:
+                raise serializers.ValidationError({"image": "Uploaded file is not a valid image."})
+            return attrs
+
+        missing = [field for field in ("width", "height", "format") if field not in attrs]
+        if missing:
+            raise serializers.ValidationError(
+                {field: "Required when no image is uploaded." for field in missing}
+            )
+        return attrs
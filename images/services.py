@@ -1,9 +1,11 @@
+import hashlib
 import json
 import os
 from io import BytesIO
 from typing import Any, Dict, Tuple
 
 from PIL import Image
+from asgiref.sync import sync_to_async
 from django.core.files.base import ContentFile
 from django.http import FileResponse
 from rest_framework import status
@@ -55,6 +57,34 @@ def save_authenticated(user: CustomUser, buffer: BytesIO, filename: str, convers
     return conversion
 
 
+async def asave_authenticated(
+        user: CustomUser, buffer: BytesIO, filename: str, conversion_format: str
+) -> ImageConversion:
+    """
+    Async counterpart of `save_authenticated` that never blocks the event loop.
+
+    The file is written to storage (S3 in production) from a worker thread
+    first, then the ImageConversion row is inserted with the async ORM in a
+    single query.
+
+    Args:
+        user: The owner of the new ImageConversion.
+        buffer: In-memory image data.
+        filename: Filename under which to store the image.
+        conversion_format: Target format (e.g. 'png', 'jpeg').
+
+    Returns:
+        The saved ImageConversion instance with the image attached.
+    """
+    file_content = ContentFile(buffer.getvalue(), name=filename)
+    conversion = ImageConversion(user=user, conversion_format=conversion_format)
+    await sync_to_async(conversion.converted_image.save, thread_sensitive=False)(
+        filename, file_content, save=False
+    )
+    await conversion.asave()
+    return conversion
+
+
 def save_conversion(image: Image.Image,
                      original_name: str,
                      original_format: str,
@@ -91,10 +121,13 @@ def save_conversion(image: Image.Image,
     image.save(buffer, format=output_format_str, quality=quality, optimize=True)
     buffer.seek(0)
 
-    filename_base, _ = os.path.splitext(original_name)
-    new_filename = f"{filename_base}.{output_extension}"
+    return conversion_filename(original_name, output_extension), buffer, output_format_str
+
 
-    return new_filename, buffer, output_format_str
+def conversion_filename(original_name: str, new_format: str) -> str:
+    """Return `original_name` with its extension replaced by `new_format`, e.g. 'photo.jpeg'."""
+    filename_base, _ = os.path.splitext(original_name)
+    return f"{filename_base}.{new_format.lower()}"
 
 
 def parse_config(request: Request) -> Dict[str, Any] | Response:
@@ -125,3 +158,32 @@ def parse_config(request: Request) -> Dict[str, Any] | Response:
         return Response({"detail": "'config' must be a JSON object."}, status=status.HTTP_400_BAD_REQUEST)
 
     return config
+
+
+def canonical_config(config: Dict[str, Any]) -> str:
+    """
+    Serialize a parsed config to a compact, canonical JSON string.
+
+    Key order is preserved because transformations run in the order listed,
+    so two configs are equivalent only if their canonical strings match.
+
+    Args:
+        config: A configuration dictionary as returned by `parse_config`.
+
+    Returns:
+        str: Compact JSON with no insignificant whitespace.
+    """
+    return json.dumps(config, separators=(",", ":"), ensure_ascii=False)
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """
+    Return a short, stable fingerprint of a parsed config.
+
+    Args:
+        config: A configuration dictionary as returned by `parse_config`.
+
+    Returns:
+        str: The first 16 hex digits of the SHA-256 of `canonical_config(config)`.
+    """
+    return hashlib.sha256(canonical_config(config).encode()).hexdigest()[:16]
@@ -0,0 +1,111 @@
+import struct
+import threading
+import zlib
+from io import BytesIO
+
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+
+from images.admission import WeightedSemaphore, get_admission_controller
+from images.tests.test_setup import TestSetUp
+
+User = get_user_model()
+
+ADMISSION = {
+    "TIERS": {
+        "anonymous": {"MAX_PIXELS": 25_000_000, "MAX_PEAK_BYTES": None, "MAX_ESTIMATED_MS": 5_000},
+        "authenticated": {"MAX_PIXELS": None, "MAX_PEAK_BYTES": None, "MAX_ESTIMATED_MS": None},
+    },
+    "MAX_INFLIGHT_BYTES": 10 * 1024 ** 2,
+    "QUEUE_TIMEOUT": 0.05,
+    "RETRY_AFTER": 7,
+}
+
+
+def png_claiming_size(width: int, height: int) -> ContentFile:
+    """Return a tiny PNG whose IHDR claims `width`×`height`, like a decompression bomb's header."""
+    buffer = BytesIO()
+    Image.new("L", (1, 1)).save(buffer, format="PNG")
+    data = bytearray(buffer.getvalue())
+    ihdr = 8 + 8  # signature, then the IHDR length and type
+    data[ihdr:ihdr + 8] = struct.pack(">II", width, height)
+    data[ihdr + 13:ihdr + 17] = struct.pack(">I", zlib.crc32(bytes(data[ihdr - 4:ihdr + 13])))
+    return ContentFile(bytes(data), name="bomb.png")
+
+
+@override_settings(IMAGE_ADMISSION=ADMISSION)
+class TestAdmissionControl(TestSetUp):
+    def test_header_dimensions_over_budget_are_rejected_before_decoding(self):
+        response = self.post_transformation(
+            config_dict={"grayscale": None},
+            image=png_claiming_size(6000, 6000),
+            expected_status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+        self.assertIn("36,000,000 pixels", response.data["detail"])
+        self.assertIn("admission;", response["Server-Timing"])
+        self.assertNotIn("decode;", response["Server-Timing"])
+
+    def test_expensive_config_is_rejected(self):
+        response = self.post_transformation(
+            config_dict={
+                "resize": {"width": 2000, "height": 2000},
+                "rank_filter": {"size": 15, "filter_name": "MEDIAN"},
+            },
+            expected_status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+        self.assertIn("ms of estimated CPU time", response.data["detail"])
+
+    def test_budget_depends_on_tier(self):
+        config = {"resize": {"width": 6000, "height": 6000}}
+        self.post_transformation(config_dict=config, expected_status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        user = User.objects.create(email="tier@test.com", username="tier", password="password")
+        self.client.force_authenticate(user=user)
+        with override_settings(IMAGE_ADMISSION={**ADMISSION, "MAX_INFLIGHT_BYTES": 1024 ** 3}):
+            self.post_transformation(config_dict=config, expected_status=status.HTTP_201_CREATED)
+
+    def test_invalid_params_are_rejected_at_admission(self):
+        response = self.post_transformation(
+            config_dict={"rotate": {"angle": "x"}}, expected_status=status.HTTP_400_BAD_REQUEST
+        )
+        self.assertIn("admission;", response["Server-Timing"])
+
+    def test_saturated_process_returns_503_with_retry_after(self):
+        semaphore = get_admission_controller().semaphore
+        self.assertTrue(semaphore.acquire(semaphore.capacity, timeout=0))
+        try:
+            response = self.post_transformation(
+                config_dict={"invert": None}, expected_status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        finally:
+            semaphore.release(semaphore.capacity)
+
+        self.assertEqual(response["Retry-After"], "7")
+        self.post_transformation(config_dict={"invert": None})
+        self.assertEqual(semaphore.in_use, 0)
+
+
+class TestWeightedSemaphore(SimpleTestCase):
+    def test_waiter_is_admitted_once_weight_is_released(self):
+        semaphore = WeightedSemaphore(capacity=10)
+        self.assertTrue(semaphore.acquire(8, timeout=0))
+        self.assertFalse(semaphore.acquire(3, timeout=0))
+
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(semaphore.acquire(3, timeout=5)))
+        waiter.start()
+        semaphore.release(8)
+        waiter.join()
+
+        self.assertEqual(acquired, [True])
+        self.assertEqual(semaphore.in_use, 3)
+
+    def test_weight_over_capacity_runs_alone(self):
+        semaphore = WeightedSemaphore(capacity=10)
+        self.assertTrue(semaphore.acquire(50, timeout=0))
+        self.assertFalse(semaphore.acquire(1, timeout=0))
+        semaphore.release(50)
+        self.assertEqual(semaphore.in_use, 0)
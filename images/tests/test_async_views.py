@@ -0,0 +1,82 @@
+import json
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from images.models import ImageConversion
+from images.pipeline import process_image_pipeline
+from images.tests.test_setup import TestSetUp
+from images.throttling import AnonCostRateThrottle
+from images.views import AsyncImageView
+
+User = get_user_model()
+
+
+class TestAsyncImageView(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.async_url = reverse("image-async")
+        self.user = User.objects.create(email="async@test.com", username="async", password="password")
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+
+    async def post_async(self, config_dict: dict, **headers):
+        self.image.seek(0)
+        return await self.async_client.post(
+            self.async_url, {"config": json.dumps(config_dict), "image": self.image}, headers=headers
+        )
+
+    async def test_anonymous_conversion_streams_the_file(self):
+        response = await self.post_async({"grayscale": None, "format": "png"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('filename="test_image.png"', response["Content-Disposition"])
+        self.assertIn("queue;", response["Server-Timing"])
+
+    async def test_authenticated_conversion_is_stored(self):
+        response = await self.post_async({"invert": None}, authorization=f"Bearer {self.token}")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        conversion = await ImageConversion.objects.aget(pk=response.json()["id"])
+        self.assertEqual(conversion.user_id, self.user.pk)
+        self.assertTrue(conversion.converted_image.name.startswith("images/"))
+
+    async def test_invalid_config_is_rejected(self):
+        response = await self.post_async({"rotate": {"angle": "x"}})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("detail", response.json())
+
+    async def test_invalid_token_is_rejected(self):
+        response = await self.post_async({"invert": None}, authorization="Bearer nonsense")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(IMAGE_THROTTLE={"BACKEND": "cache"})
+    async def test_cost_throttles_apply(self):
+        await cache.aclear()
+        with mock.patch.object(AsyncImageView, "throttle_classes", [AnonCostRateThrottle]), \
+                mock.patch.object(AnonCostRateThrottle, "THROTTLE_RATES", {"anon_cost": "5/day"}), \
+                mock.patch("images.throttling.request_cost", return_value=4):
+            first = await self.post_async({"invert": None})
+            second = await self.post_async({"invert": None})
+
+        self.assertEqual(first["X-RateLimit-Remaining"], "1.000")
+        self.assertEqual(second.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", second)
+
+    async def test_pipeline_runs_on_the_bounded_executor(self):
+        threads = []
+
+        def record_thread(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return process_image_pipeline(*args, **kwargs)
+
+        with mock.patch("images.views.process_image_pipeline", side_effect=record_thread):
+            await self.post_async({"invert": None})
+
+        self.assertTrue(threads[0].startswith("image-pipeline"))
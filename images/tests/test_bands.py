@@ -0,0 +1,97 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from images.benchmarks.concurrency import run_band_latency
+from images.benchmarks.corpus import synthetic_image
+from images.executor import get_band_pool
+from images.transformations import TRANSFORM_MAP, bands
+from images.transformations.bands import BandPool, band_count, filter_in_bands, resize_in_bands, split_rows
+from images.transformations.filters_mapping import BASIC_FILTERS, MULTIBAND_FILTERS, RANK_FILTERS
+
+FILTER_CHAINS = (
+    [BASIC_FILTERS["BLUR"]],
+    [BASIC_FILTERS["SHARPEN"], BASIC_FILTERS["SMOOTH_MORE"], BASIC_FILTERS["FIND_EDGES"]],
+    [RANK_FILTERS["MEDIAN"](size=5)],
+    [RANK_FILTERS["MAX"](size=9)],
+    [MULTIBAND_FILTERS["GAUSSIANBLUR"](radius=3)],
+    [MULTIBAND_FILTERS["BOXBLUR"](radius=2.5)],
+    [MULTIBAND_FILTERS["UNSHARPMASK"](radius=2)],
+)
+
+
+@mock.patch.multiple(bands, MIN_PARALLEL_PIXELS=0, MIN_BAND_ROWS=4)
+class TestBands(SimpleTestCase):
+    def setUp(self):
+        self.pool = BandPool(3)
+        self.addCleanup(self.pool.shutdown)
+
+    def test_split_rows_covers_every_row_on_step_boundaries(self):
+        self.assertEqual(split_rows(10, 3), [(0, 3), (3, 6), (6, 10)])
+        self.assertEqual(split_rows(100, 4, step=30), [(0, 30), (30, 60), (60, 90), (90, 100)])
+        self.assertEqual(split_rows(5, 8), [(i, i + 1) for i in range(5)])
+
+    def test_filtered_bands_match_a_single_call(self):
+        for mode in ("RGB", "L", "RGBA", "CMYK"):
+            image = synthetic_image(size=(71, 93), mode="RGB").convert(mode)
+            for chain in FILTER_CHAINS:
+                expected = image
+                for image_filter in chain:
+                    expected = expected.filter(image_filter)
+                with self.subTest(mode=mode, chain=chain):
+                    result = filter_in_bands(image, chain, self.pool)
+                    self.assertEqual((result.mode, result.tobytes()), (expected.mode, expected.tobytes()))
+
+    def test_resized_bands_match_a_single_call(self):
+        image = synthetic_image(size=(90, 120), mode="RGB")
+        for size in ((45, 60), (90, 40), (64, 200), (33, 117), (120, 90)):
+            with self.subTest(size=size):
+                self.assertEqual(resize_in_bands(image, size, self.pool).tobytes(), image.resize(size).tobytes())
+
+    def test_32_bit_resizes_are_not_split(self):
+        for mode in ("F", "I"):
+            image = synthetic_image(size=(173, 211), mode="RGB").convert(mode)
+            with self.subTest(mode=mode), mock.patch.object(self.pool, "map", wraps=self.pool.map) as band_map:
+                result = resize_in_bands(image, (200, 633), self.pool)
+                band_map.assert_not_called()
+                self.assertEqual(result.tobytes(), image.resize((200, 633)).tobytes())
+
+    def test_resize_bands_start_on_whole_source_rows(self):
+        image = synthetic_image(size=(40, 120), mode="RGB")
+        with mock.patch.object(self.pool, "map", wraps=self.pool.map) as band_map:
+            resize_in_bands(image, (40, 80), self.pool)
+        starts = [start for start, _ in band_map.call_args.args[1]]
+        self.assertGreater(len(starts), 1)
+        self.assertTrue(all(start * 120 % 80 == 0 for start in starts))
+
+    def test_palette_images_are_not_split(self):
+        image = synthetic_image(size=(64, 64), mode="RGB").convert("P")
+        self.assertEqual(band_count(self.pool, image, image.height), 1)
+
+    def test_transforms_split_through_the_configured_pool(self):
+        image = synthetic_image(size=(80, 96), mode="RGB")
+        cases = {"basic_filter": ["SMOOTH", "EMBOSS"], "resize": {"width": 40, "height": 48}}
+        expected = {key: TRANSFORM_MAP[key].apply(image, params).tobytes() for key, params in cases.items()}
+
+        with override_settings(IMAGE_EXECUTOR={"BAND_WORKERS": 3}):
+            pool = get_band_pool()
+            with mock.patch.object(pool, "map", wraps=pool.map) as band_map:
+                for key, params in cases.items():
+                    self.assertEqual(TRANSFORM_MAP[key].apply(image, params).tobytes(), expected[key])
+        self.assertEqual(band_map.call_count, 2)
+
+    def test_latency_benchmark_reports_identical_output(self):
+        with mock.patch("images.transformations.bands.default_pool", side_effect=AssertionError):
+            rows = run_band_latency(workers=[1, 2], size=(64, 48), repeat=1)
+        self.assertEqual(len(rows), 8)
+        self.assertTrue(all(row["identical"] for row in rows))
+
+
+class TestBandPoolSettings(SimpleTestCase):
+    @override_settings(IMAGE_EXECUTOR={"BAND_WORKERS": 1})
+    def test_one_band_worker_turns_banding_off(self):
+        self.assertIsNone(get_band_pool())
+
+    def test_small_images_are_not_split(self):
+        with BandPool(4) as pool:
+            self.assertEqual(band_count(pool, synthetic_image(size=(256, 256), mode="RGB"), 256), 1)
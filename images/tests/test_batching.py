@@ -0,0 +1,124 @@
+import threading
+from io import BytesIO
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from images import pipeline
+from images.batching import MicroBatcher, get_batching
+from images.benchmarks.corpus import synthetic_image
+from images.tests.test_setup import TestSetUp
+from images.workers import convert, convert_batch
+
+
+def encode(size: tuple[int, int], mode: str = "RGB", image_format: str = "PNG", seed: int = 0) -> bytes:
+    buffer = BytesIO()
+    image = synthetic_image(size=size, mode="RGB").rotate(seed * 90).convert(mode)
+    image.info["dpi"] = (72 + seed, 72 + seed)
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+class TestProcessBatch(SimpleTestCase):
+    def setUp(self):
+        self.uploads = [
+            encode((48, 48), seed=0),
+            encode((48, 48), seed=1),
+            encode((48, 48), "L", seed=2),
+            encode((48, 48), "L", seed=3),
+            encode((30, 20), seed=1),
+            encode((48, 48), "RGBA", seed=2),
+            encode((48, 48), image_format="JPEG", seed=3),
+        ]
+
+    def test_batched_conversions_match_single_ones(self):
+        configs = (
+            {"invert": None, "posterize": 3, "solarize": 100, "format": "png"},
+            {"grayscale": None, "brightness": 1.4, "rotate": {"angle": 30}, "format": "webp"},
+            {"color": 0.5, "autocontrast": {"cutoff": 2.0}, "format": "jpeg", "optimize": 80},
+            {"resize": {"width": 20, "height": 10}, "invert": None},
+        )
+        for config in configs:
+            with self.subTest(config=config):
+                expected = []
+                for data in self.uploads:
+                    try:
+                        expected.append(convert(data, config))
+                    except Exception as e:
+                        expected.append(type(e))
+                results = [
+                    result if not isinstance(result, Exception) else type(result)
+                    for result in convert_batch(self.uploads, config)
+                ]
+                self.assertEqual(results, expected)
+
+    def test_pointwise_steps_run_once_per_shape(self):
+        with mock.patch.object(pipeline, "stack_pointwise", wraps=pipeline.stack_pointwise) as stacked:
+            convert_batch(self.uploads, {"invert": None, "rotate": {"angle": 90}})
+        self.assertEqual(sorted(len(call.args[0]) for call in stacked.call_args_list), [2, 3])
+
+    def test_failures_stay_with_their_image(self):
+        results = convert_batch([self.uploads[0], b"not an image"], {"grayscale": None})
+        self.assertIsInstance(results[0], tuple)
+        self.assertIsInstance(results[1], OSError)
+
+
+class TestMicroBatcher(SimpleTestCase):
+    def submit_concurrently(self, batcher: MicroBatcher, requests: list[tuple[str, bytes]]) -> list:
+        results = [None] * len(requests)
+        barrier = threading.Barrier(len(requests))
+
+        def submit(index: int, key: str, data: bytes) -> None:
+            barrier.wait()
+            try:
+                results[index] = batcher.submit(key, data, {"key": key})
+            except Exception as e:
+                results[index] = e
+
+        threads = [threading.Thread(target=submit, args=(i, *request)) for i, request in enumerate(requests)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_same_plan_requests_run_as_one_batch(self):
+        calls = []
+
+        def run(items, config):
+            calls.append((config["key"], sorted(items)))
+            return [item.upper() if item != b"bad" else ValueError(item) for item in items]
+
+        batcher = MicroBatcher(run=run, window_ms=50, max_batch=3)
+        results = self.submit_concurrently(batcher, [("a", b"x"), ("a", b"y"), ("a", b"bad"), ("b", b"z")])
+
+        self.assertEqual(results[:2] + results[3:], [b"X", b"Y", b"Z"])
+        self.assertIsInstance(results[2], ValueError)
+        self.assertEqual(sorted(calls), [("a", [b"bad", b"x", b"y"]), ("b", [b"z"])])
+
+    def test_window_is_bounded(self):
+        with self.assertRaises(ValueError):
+            MicroBatcher(run=lambda items, config: items, window_ms=500, max_batch=4)
+
+    @override_settings(IMAGE_BATCHING={"ENABLED": True, "MAX_PIXELS": 100})
+    def test_large_inputs_are_not_batched(self):
+        shape = {"input": {"width": 20, "height": 10}}
+        self.assertFalse(get_batching().accepts(shape))
+        self.assertTrue(get_batching().accepts({"input": {"width": 10, "height": 10}}))
+        self.assertFalse(get_batching().accepts(None))
+
+
+@override_settings(
+    IMAGE_BATCHING={"ENABLED": True, "WINDOW_MS": 1, "MAX_BATCH": 4},
+    IMAGE_SCHEDULER={"ENABLED": True, "SLOTS": 4},
+)
+class TestBatchedConversions(TestSetUp):
+    def test_conversion_runs_in_a_batch(self):
+        config = {"invert": None, "format": "png"}
+        response = self.post_transformation(config)
+
+        self.assertIn("batch", response["Server-Timing"])
+        self.assertEqual(b"".join(response.streaming_content), convert(self.image.open().read(), config)[0])
+
+    def test_invalid_parameters_still_return_400(self):
+        self.post_transformation({"posterize": "many"}, expected_status=400)
@@ -0,0 +1,86 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from images.benchmarks import transforms
+from images.benchmarks.codecs import run_case
+from images.benchmarks.load import WSGITransport, build_workload, drive
+from images.benchmarks.corpus import synthetic_image
+from images.benchmarks.report import write_report, load_baseline, compare_to_baseline
+from images.transformations import TRANSFORM_MAP
+
+
+class TestCodecBenchmark(SimpleTestCase):
+    def test_synthetic_image_is_deterministic(self):
+        first = synthetic_image(size=(32, 24), mode="RGB", seed=7)
+        second = synthetic_image(size=(32, 24), mode="RGB", seed=7)
+        self.assertEqual(first.tobytes(), second.tobytes())
+        self.assertEqual(synthetic_image(size=(32, 24), mode="P").mode, "P")
+
+    def test_run_case_reports_metrics(self):
+        row = run_case("PNG", 85, (32, 32), "RGBA", repeat=1, memory=False)
+        self.assertTrue(row["supported"])
+        self.assertEqual(row["case"], "PNG/q85/32x32/RGBA")
+        self.assertGreater(row["output_bytes"], 0)
+        self.assertGreater(row["encode_mps"], 0)
+
+    def test_run_case_marks_unsupported_modes(self):
+        row = run_case("JPEG", 85, (32, 32), "RGBA", repeat=1, memory=False)
+        self.assertFalse(row["supported"])
+
+    def test_compare_to_baseline_flags_regressions(self):
+        rows = [{"case": "a", "encode_ms": 13.0}, {"case": "b", "encode_ms": 10.0}, {"case": "new", "encode_ms": 1.0}]
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "baseline.json"
+            write_report([{"case": "a", "encode_ms": 10.0}, {"case": "b", "encode_ms": 10.0}], path)
+            self.assertIn("environment", json.loads(path.read_text()))
+            regressions = compare_to_baseline(rows, load_baseline(path), metrics=["encode_ms"], threshold=0.25)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("a encode_ms"))
+
+
+class TestTransformBenchmark(SimpleTestCase):
+    def test_every_registered_transform_runs_with_its_benchmark_params(self):
+        cases = list(transforms.iter_cases())
+        self.assertEqual({key for key, _ in cases}, set(TRANSFORM_MAP))
+
+        for key, params in cases:
+            with self.subTest(key=key, params=params):
+                row = transforms.run_case(key, params, (128, 96), "RGB", repeat=1, memory=False)
+                self.assertTrue(row["supported"])
+                self.assertGreater(row["p95_ms"], 0)
+
+    def test_command_fails_on_regression(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = Path(directory) / "transforms.json"
+            rows = transforms.run_suite(keys=["invert"], sizes=[(64, 64)], modes=["L"], repeat=1, memory=False)
+            for row in rows:
+                row["mean_ms"] = 1e-6
+            write_report(rows, baseline)
+
+            with self.assertRaisesMessage(CommandError, "invert"):
+                call_command(
+                    "bench_transforms", keys=["invert"], sizes=["64x64"], modes=["L"],
+                    repeat=1, no_memory=True, baseline=str(baseline), stdout=StringIO()
+                )
+
+
+class TestHTTPLoadBenchmark(SimpleTestCase):
+    def test_wsgi_transport_drives_anonymous_conversions(self):
+        workload = build_workload(
+            configs=[{"grayscale": None, "format": "png"}, {"thumbnail": {"size": [16.0, 16.0]}}],
+            inputs=[((64, 48), "JPEG")],
+        )
+        transport = WSGITransport(get_wsgi_application(), reverse("image-list"))
+
+        result = drive(transport, workload, headers={}, concurrency=2, duration=0.2)
+
+        self.assertGreater(len(result["latencies"]), 0)
+        self.assertEqual(set(result["statuses"]), {200})
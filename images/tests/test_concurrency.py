@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+from django.test import SimpleTestCase, override_settings
+
+from images.benchmarks.concurrency import SCALING_CONFIG, convert_bytes, run_scaling, scaling_input
+from images.benchmarks.corpus import synthetic_image
+from images.executor import build_executor, get_worker_pool
+from images.tests.test_setup import TestSetUp
+from images.transformations import TRANSFORM_MAP
+
+CONFIGS = (
+    SCALING_CONFIG,
+    {"thumbnail": {"size": [64.0, 48.0]}, "grayscale": None, "format": "png"},
+    {
+        "rotate": {"angle": 33, "expand": True},
+        "autocontrast": {"cutoff": 2.0},
+        "rank_filter": {"size": 3, "filter_name": "MEDIAN"},
+    },
+)
+
+
+class TestThreadSafety(SimpleTestCase):
+    def test_registered_transforms_are_frozen(self):
+        for key in TRANSFORM_MAP:
+            with self.subTest(key=key), self.assertRaises(AttributeError):
+                TRANSFORM_MAP[key].last_params = {}
+
+    def test_thumbnail_leaves_its_input_untouched(self):
+        image = synthetic_image(size=(97, 61), mode="RGB")
+        original = image.tobytes()
+        expected = image.copy()
+        expected.thumbnail((40, 40), resample=Image.Resampling.BICUBIC, reducing_gap=2.0)
+
+        result = TRANSFORM_MAP["thumbnail"].apply(image, {"size": [40.0, 40.0]})
+
+        self.assertEqual((image.size, image.tobytes()), ((97, 61), original))
+        self.assertEqual((result.size, result.tobytes()), (expected.size, expected.tobytes()))
+
+    def test_concurrent_pipelines_match_sequential_ones(self):
+        data = scaling_input((320, 240))
+        expected = [convert_bytes(data, config) for config in CONFIGS]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda i: convert_bytes(data, CONFIGS[i % 3]), range(24)))
+        self.assertEqual(results, [expected[i % 3] for i in range(24)])
+
+
+class TestScalingBenchmark(SimpleTestCase):
+    def test_rows_report_speedup_against_the_first_worker_count(self):
+        rows = run_scaling(workers=[1, 2], jobs=2, size=(64, 48))
+
+        self.assertEqual([row["case"] for row in rows], ["thread/1", "thread/2"])
+        self.assertEqual((rows[0]["speedup"], rows[0]["efficiency"]), (1.0, 1.0))
+        self.assertAlmostEqual(rows[1]["efficiency"], rows[1]["speedup"] / 2, places=2)
+        self.assertGreater(rows[0]["rss_mb"], 0)
+
+    def test_process_pool_memory_includes_its_workers(self):
+        thread_rss = run_scaling(workers=[2], jobs=2, size=(64, 48))[0]["rss_mb"]
+        process_rss = run_scaling(workers=[2], jobs=2, size=(64, 48), backend="process")[0]["rss_mb"]
+        self.assertGreater(process_rss, thread_rss)
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            build_executor("fibers", 2)
+
+
+class TestIsolatedBackends(SimpleTestCase):
+    def test_process_workers_match_in_process_conversions(self):
+        data = scaling_input((160, 120))
+        with build_executor("process", 2) as executor:
+            results = list(executor.map(convert_bytes, [data] * 3, CONFIGS))
+        self.assertEqual(results, [convert_bytes(data, config) for config in CONFIGS])
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaisesMessage(ValueError, "Unknown executor backend 'interpreter'"):
+            build_executor("interpreter", 2)
+
+    def test_thread_backend_has_no_worker_pool(self):
+        self.assertIsNone(get_worker_pool())
+
+
+@override_settings(IMAGE_EXECUTOR={"BACKEND": "process", "POOL_WORKERS": 1})
+class TestPoolConversions(TestSetUp):
+    def test_conversion_runs_on_the_worker_pool(self):
+        config = {"grayscale": None, "format": "png"}
+        response = self.post_transformation(config)
+
+        self.assertIsNotNone(get_worker_pool())
+        self.assertIn("pool", response["Server-Timing"])
+        self.assertNotIn("decode", response["Server-Timing"])
+        self.assertEqual(b"".join(response.streaming_content), convert_bytes(self.image.open().read(), config))
+
+    def test_invalid_parameters_still_return_400(self):
+        self.post_transformation({"rotate": {"angle": "sideways"}}, expected_status=400)
@@ -0,0 +1,223 @@
+import json
+import tempfile
+from io import BytesIO, StringIO
+from pathlib import Path
+
+from PIL import Image
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+
+from images.benchmarks.calibration import calibrate
+from images.benchmarks.corpus import MODES, synthetic_image
+from images.cost_model import CostModel, fit_linear
+from images.instrumentation import StageTimings
+from images.pipeline import process_image_pipeline
+from images.planner import explain_pipeline
+from images.tests.test_setup import TestSetUp
+from images.transformations import TRANSFORM_MAP
+
+
+class TestExplainEndpoint(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.explain_url = reverse("image-explain")
+
+    def test_explain_from_dimensions_lists_every_step(self):
+        config = {"resize": {"width": 400, "height": 300}, "grayscale": None, "format": "png"}
+        response = self.client.post(
+            self.explain_url,
+            {"config": config, "width": 1600, "height": 1200, "format": "JPEG"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        plan = response.data
+        self.assertEqual(
+            [step["step"] for step in plan["steps"]],
+            ["decode", "transform.resize", "transform.grayscale", "transform.format", "encode"],
+        )
+        resize, grayscale = plan["steps"][1], plan["steps"][2]
+        self.assertEqual(resize["output"], {"width": 400, "height": 300, "mode": "RGB"})
+        self.assertEqual(grayscale["output"]["mode"], "L")
+        self.assertEqual(plan["output"], {"width": 400, "height": 300, "mode": "L", "format": "PNG"})
+        self.assertEqual(resize["estimated_peak_bytes"], 1600 * 1200 * 4 + 400 * 300 * 4)
+        self.assertGreater(plan["estimated_ms"], 0)
+        self.assertEqual(plan["uncalibrated"], [])
+
+    def test_explain_reads_only_the_image_header(self):
+        self.image.seek(0)
+        response = self.client.post(
+            self.explain_url,
+            {"config": json.dumps({"rotate": {"angle": 30, "expand": True}}), "image": self.image},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["input"], {"width": 100, "height": 100, "mode": "RGB", "format": "JPEG"})
+        self.assertEqual(response.data["steps"][1]["output"]["width"], 138)
+
+    def test_prediction_matches_the_real_conversion(self):
+        config = {"thumbnail": {"size": [70.0, 33.0]}, "expand": {"border": 3}, "format": "png"}
+        self.image.seek(0)
+        plan = self.client.post(
+            self.explain_url, {"config": json.dumps(config), "image": self.image}, format="multipart"
+        ).data
+
+        response = self.post_transformation(config_dict=config)
+        converted = Image.open(BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(
+            (plan["output"]["width"], plan["output"]["height"], plan["output"]["mode"]),
+            (*converted.size, converted.mode),
+        )
+
+    def test_unknown_keys_are_skipped(self):
+        response = self.client.post(
+            self.explain_url,
+            {"config": {"sparkle": True}, "width": 10, "height": 10, "format": "PNG"},
+            format="json",
+        )
+        self.assertEqual(response.data["skipped"], ["sparkle"])
+
+    def test_invalid_params_are_rejected(self):
+        response = self.client.post(
+            self.explain_url,
+            {"config": {"region_crop": {"left": 5, "right": 50}}, "width": 20, "height": 20, "format": "PNG"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_dimensions_are_required_without_an_image(self):
+        response = self.client.post(self.explain_url, {"config": {}, "width": 10}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("height", response.data)
+        self.assertIn("format", response.data)
+
+
+class TestOutputShape(SimpleTestCase):
+    def test_output_shape_matches_apply_for_every_registered_transform(self):
+        for size in ((97, 61), (61, 97)):
+            for mode in MODES:
+                image = synthetic_image(size=size, mode=mode)
+                for key, transformer in TRANSFORM_MAP.items():
+                    for params in transformer.benchmark_params():
+                        try:
+                            result = transformer.apply(image.copy(), params)
+                        except (ValueError, TypeError, OSError, NotImplementedError):
+                            continue
+                        with self.subTest(key=key, params=params, size=size, mode=mode):
+                            self.assertEqual(
+                                transformer.output_shape(size, mode, params), (result.size, result.mode)
+                            )
+
+    def test_thumbnail_shape_validates_like_apply(self):
+        thumbnail = TRANSFORM_MAP["thumbnail"]
+        image = synthetic_image(size=(97, 61), mode="RGB")
+        invalid = ({}, {"size": "128"}, {"size": [128.0]}, {"size": [-1.0, 64.0]}, {"size": [64.0, 64.0], "resample": "X"})
+        for config in invalid:
+            with self.subTest(config=config):
+                with self.assertRaises((TypeError, ValueError)) as expected:
+                    thumbnail.apply(image, config)
+                with self.assertRaises(type(expected.exception)):
+                    thumbnail.output_shape(image.size, image.mode, config)
+        for bounds in ([40.0, 40.0], [200.0, 10.5], [97.0, 61.0]):
+            with self.subTest(bounds=bounds):
+                result = thumbnail.apply(image, {"size": bounds})
+                self.assertEqual(
+                    thumbnail.output_shape(image.size, image.mode, {"size": bounds}), (result.size, result.mode)
+                )
+
+
+class TestPlanMatchesExecution(SimpleTestCase):
+    def assert_plan_matches(self, config: dict, size=(160, 120), mode="RGB") -> dict:
+        buffer = BytesIO()
+        synthetic_image(size=size, mode=mode).save(buffer, format="PNG")
+        buffer.seek(0)
+        timings = StageTimings()
+        result, _ = process_image_pipeline(buffer, config, timings)
+        plan = explain_pipeline(config, size=size, mode=mode, image_format="PNG")
+
+        self.assertEqual(
+            [step["step"] for step in plan["steps"][1:-1]], [name for name, _, _ in timings.stages[1:]]
+        )
+        self.assertEqual(
+            (plan["output"]["width"], plan["output"]["height"], plan["output"]["mode"]), (*result.size, result.mode)
+        )
+        return plan
+
+    def test_lookup_run_is_planned_as_one_pass(self):
+        config = {"autocontrast": {"cutoff": 2.0}, "posterize": 4, "solarize": 128}
+        plan = self.assert_plan_matches(config)
+
+        lut = plan["steps"][1]
+        self.assertEqual(lut["step"], "transform.lut")
+        self.assertEqual(lut["params"], config)
+        self.assertEqual(lut["estimated_peak_bytes"], 160 * 120 * 4 * 2)
+        alone = [
+            explain_pipeline({key: params}, size=(160, 120), mode="RGB", image_format="PNG")["steps"][1]["estimated_ms"]
+            for key, params in config.items()
+        ]
+        self.assertEqual(lut["estimated_ms"], max(alone))
+
+    def test_fused_geometry_is_planned_as_one_resample(self):
+        config = {
+            "fuse_geometry": True,
+            "region_crop": {"left": 10, "upper": 5, "right": 130, "lower": 95},
+            "resize": {"width": 60, "height": 45},
+            "flip": None,
+        }
+        plan = self.assert_plan_matches(config)
+
+        fused = plan["steps"][1]
+        self.assertEqual(fused["step"], "transform.fused")
+        self.assertEqual(list(fused["params"]), ["region_crop", "resize", "flip"])
+        self.assertEqual(fused["output"], {"width": 60, "height": 45, "mode": "RGB"})
+        self.assertEqual(fused["estimated_peak_bytes"], 160 * 120 * 4 + 60 * 45 * 4)
+
+    def test_fused_color_is_planned_as_one_matrix(self):
+        plan = self.assert_plan_matches({"fuse_color": True, "color": 0.5, "grayscale": None, "brightness": 0.8})
+
+        fused = plan["steps"][1]
+        self.assertEqual(fused["step"], "transform.fused")
+        self.assertEqual(list(fused["params"]), ["color", "grayscale", "brightness"])
+        self.assertEqual(fused["output"]["mode"], "L")
+        self.assertEqual(fused["estimated_peak_bytes"], 160 * 120 * 4 + 160 * 120)
+
+    def test_proxy_sends_lone_lookups_through_the_table_pass(self):
+        plan = self.assert_plan_matches({"equalize": None, "histogram_proxy": True})
+        self.assertEqual(plan["steps"][1]["params"], {"equalize": None})
+
+
+class TestCostModel(SimpleTestCase):
+    def test_fit_recovers_linear_coefficients(self):
+        fit = fit_linear([(units, 2 + 5 * units / 1e6) for units in (1e5, 1e6, 4e6)])
+        self.assertAlmostEqual(fit["fixed_ms"], 2, places=4)
+        self.assertAlmostEqual(fit["ms_per_munit"], 5, places=4)
+
+    def test_calibration_fits_per_mode_and_across_modes(self):
+        rows = [
+            {"key": "invert", "params": "null", "width": side, "height": side, "mode": mode,
+             "supported": True, "mean_ms": side * side * per_pixel}
+            for side in (100, 200) for mode, per_pixel in (("RGB", 3e-6), ("L", 1e-6))
+        ]
+        model = CostModel(calibrate(transform_rows=rows, codec_rows=[]))
+
+        self.assertAlmostEqual(model.estimate_ms("transform.invert", "RGB", 1_000_000), 3, places=3)
+        self.assertAlmostEqual(model.estimate_ms("transform.invert", "L", 1_000_000), 1, places=3)
+        self.assertIsNotNone(model.estimate_ms("transform.invert", "CMYK", 1_000_000))
+        self.assertIsNone(model.estimate_ms("transform.rotate", "RGB", 1_000_000))
+
+    def test_uncalibrated_steps_are_reported(self):
+        plan = explain_pipeline({"invert": None}, size=(10, 10), mode="RGB", image_format="PNG",
+                                cost_model=CostModel({}))
+        self.assertEqual(plan["uncalibrated"], ["decode", "transform.invert", "encode"])
+
+    def test_calibrate_command_writes_coefficients(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "cost_model.json"
+            call_command("calibrate_cost_model", output=str(output), stdout=StringIO())
+            coefficients = json.loads(output.read_text())["coefficients"]
+        self.assertIn("transform.resize", coefficients)
+        self.assertIn("decode.JPEG", coefficients)
+        self.assertIn("*", coefficients["transform.resize"])
@@ -0,0 +1,176 @@
+from dataclasses import replace
+from itertools import permutations
+
+from django.test import SimpleTestCase
+from PIL import Image
+
+from images.benchmarks.corpus import synthetic_image
+from images.benchmarks.fusion import max_difference, run_color_fusion, run_fusion
+from images.instrumentation import StageTimings
+from images.pipeline import apply_steps, color_run, compile_steps, geometric_run, process_image_pipeline
+from images.tests.test_setup import TestSetUp
+from images.transformations import TRANSFORM_MAP
+from images.transformations.color import ColorMatrix
+from images.transformations.geometry import apply_geometry, rotation, scaling, transposition
+
+# Steps that resample with NEAREST, so fusing them must reproduce the step-by-step output exactly.
+EXACT_STEPS = {
+    "flip": None,
+    "mirror": None,
+    "transpose": "ROTATE_90",
+    "region_crop": {"left": 3, "upper": 5, "right": 40, "lower": 30},
+    "border_crop": 2,
+    "expand": {"border": 3, "fill": "blue"},
+    "rotate": {"angle": 90},
+}
+
+
+def run(image: Image.Image, config: dict, fuse: bool) -> Image.Image:
+    return apply_steps(image, compile_steps(config), fuse, StageTimings())
+
+
+class TestGeometry(SimpleTestCase):
+    def setUp(self):
+        self.image = synthetic_image(size=(61, 47), mode="RGB")
+
+    def test_single_steps_match_their_transform(self):
+        cases = dict(EXACT_STEPS, rotate={"angle": 33, "expand": True}, resize={"width": 30, "height": 80})
+        for key, params in cases.items():
+            with self.subTest(key=key):
+                transformer = TRANSFORM_MAP[key]
+                geometry = transformer.geometry(self.image.size, self.image.mode, params)
+                expected = transformer.apply(self.image, params)
+                self.assertEqual(apply_geometry(self.image, geometry).tobytes(), expected.tobytes())
+
+    def test_fused_nearest_chains_match_step_by_step(self):
+        for keys in permutations(EXACT_STEPS, 3):
+            config = {key: EXACT_STEPS[key] for key in keys}
+            try:
+                expected = run(self.image, config, fuse=False)
+            except ValueError:
+                continue
+            with self.subTest(keys=keys):
+                self.assertEqual(run(self.image, config, fuse=True).tobytes(), expected.tobytes())
+
+    def test_fused_filter_is_capped_only_for_affine_maps(self):
+        lanczos = scaling(self.image.size, (30, 20), Image.Resampling.LANCZOS)
+        flipped = lanczos.then(transposition(Image.Transpose.FLIP_LEFT_RIGHT, (30, 20)))
+        self.assertEqual(flipped.resample, Image.Resampling.LANCZOS)
+        expected = self.image.resize((30, 20), Image.Resampling.LANCZOS).transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+        self.assertEqual(apply_geometry(self.image, flipped).tobytes(), expected.tobytes())
+
+        turned = lanczos.then(rotation(33, True, (30, 20)))
+        bicubic = replace(turned, resample=Image.Resampling.BICUBIC)
+        self.assertEqual(apply_geometry(self.image, turned).tobytes(), apply_geometry(self.image, bicubic).tobytes())
+
+    def test_fills_are_not_fused_past_a_crop(self):
+        steps = compile_steps({"region_crop": EXACT_STEPS["region_crop"], "rotate": {"angle": 20}})
+        run_steps, _ = geometric_run(steps, self.image.size, self.image.mode)
+        self.assertEqual([key for key, _, _ in run_steps], ["region_crop"])
+
+    def test_alpha_and_palette_images_are_not_fused(self):
+        steps = compile_steps({"flip": None, "mirror": None})
+        for mode in ("RGBA", "P", "1"):
+            with self.subTest(mode=mode):
+                self.assertEqual(geometric_run(steps, self.image.size, mode), ([], None))
+
+
+class TestFusedPipeline(SimpleTestCase):
+    def test_interpolating_chain_resamples_once(self):
+        image = synthetic_image(size=(200, 150), mode="RGB")
+        config = {"rotate": {"angle": 17}, "resize": {"width": 120, "height": 90}, "flip": None}
+        timings = StageTimings()
+        fused = apply_steps(image, compile_steps(config), True, timings)
+
+        self.assertEqual([name for name, _, _ in timings.stages], ["transform.fused"])
+        self.assertEqual(fused.size, run(image, config, fuse=False).size)
+
+    def test_fuse_flag_must_be_boolean(self):
+        image = synthetic_image(size=(40, 30), mode="RGB")
+        with self.assertRaises(TypeError):
+            process_image_pipeline(image, {"flip": None, "fuse_geometry": "yes"})
+
+    def test_benchmark_reports_sharper_fused_output(self):
+        rows = run_fusion(repeat=1, cases=["crop+rotate+resize", "rotate+flip+crop"])
+        self.assertTrue(all(row["same_size"] for row in rows))
+        self.assertGreater(rows[0]["fused_sharpness"], rows[0]["stepwise_sharpness"])
+
+
+class TestFusedConversions(TestSetUp):
+    def test_fused_conversion_reports_one_stage(self):
+        response = self.post_transformation(
+            {"mirror": None, "rotate": {"angle": 12}, "resize": {"width": 50, "height": 40}, "fuse_geometry": True}
+        )
+        self.assertIn("transform.fused;", response["Server-Timing"])
+        self.assertNotIn("transform.rotate;", response["Server-Timing"])
+
+    def test_invalid_fuse_flag_returns_400(self):
+        self.post_transformation({"flip": None, "fuse_geometry": 1}, expected_status=400)
+
+
+# Linear color steps; factors up to 1 keep every intermediate result in the 8-bit range.
+COLOR_STEPS = {"grayscale": None, "brightness": 0.7, "color": 0.4, "invert": None}
+
+
+class TestColorFusion(SimpleTestCase):
+    def setUp(self):
+        self.image = synthetic_image(size=(61, 47), mode="RGB")
+
+    def test_fused_color_chains_differ_by_rounding_only(self):
+        for keys in permutations(COLOR_STEPS, 3):
+            config = {key: COLOR_STEPS[key] for key in keys}
+            with self.subTest(keys=keys):
+                timings = StageTimings()
+                expected = run(self.image, config, fuse=False)
+                result = apply_steps(self.image, compile_steps(config), False, timings, fuse_color=True)
+                self.assertEqual([name for name, _, _ in timings.stages], ["transform.fused"])
+                self.assertEqual(result.mode, expected.mode)
+                self.assertLessEqual(max_difference(result, expected), len(keys))
+
+    def test_single_step_matrices_match_their_transform(self):
+        for key, params in COLOR_STEPS.items():
+            with self.subTest(key=key):
+                transformer = TRANSFORM_MAP[key]
+                matrix = transformer.color_matrix("RGB", params)
+                expected = transformer.apply(self.image, params)
+                result = self.image.convert(expected.mode, matrix.matrix[:4] if expected.mode == "L" else matrix.matrix)
+                self.assertLessEqual(max_difference(result, expected), 1)
+
+    def test_composed_matrices_follow_the_steps(self):
+        invert = TRANSFORM_MAP["invert"].color_matrix("RGB", None)
+        self.assertEqual(invert.then(invert), ColorMatrix())
+        gray = TRANSFORM_MAP["grayscale"].color_matrix("RGB", None)
+        saturated = gray.then(TRANSFORM_MAP["color"].color_matrix("L", 3.0))
+        self.assertEqual(saturated.mode, "L")
+        for value, expected in zip(saturated.matrix, gray.matrix):
+            self.assertAlmostEqual(value, expected)
+
+    def test_runs_stop_after_a_step_that_can_clip(self):
+        steps = compile_steps({"color": 1.5, "brightness": 0.5, "invert": None})
+        self.assertEqual([key for key, _, _ in color_run(steps, "RGB")[0]], ["color"])
+        steps = compile_steps({"brightness": 0.5, "color": 1.5, "invert": None, "contrast": 1.2})
+        self.assertEqual([key for key, _, _ in color_run(steps, "RGB")[0]], ["brightness", "color"])
+
+    def test_only_rgb_images_are_fused(self):
+        steps = compile_steps({"brightness": 0.5, "invert": None})
+        for mode in ("L", "RGBA", "P", "CMYK"):
+            with self.subTest(mode=mode):
+                self.assertEqual(color_run(steps, mode), ([], None))
+
+    def test_invalid_factor_is_rejected_as_unfused(self):
+        with self.assertRaises(ValueError):
+            apply_steps(self.image, compile_steps({"color": -1, "invert": None}), False, StageTimings(), fuse_color=True)
+
+    def test_benchmark_reports_small_differences(self):
+        rows = run_color_fusion(size=(96, 64), repeat=1)
+        self.assertTrue(all(row["max_difference"] <= 2 for row in rows))
+
+
+class TestColorFusedConversions(TestSetUp):
+    def test_fused_conversion_reports_one_stage(self):
+        response = self.post_transformation({"color": 0.5, "brightness": 0.8, "invert": None, "fuse_color": True})
+        self.assertIn("transform.fused;", response["Server-Timing"])
+        self.assertNotIn("transform.brightness;", response["Server-Timing"])
+
+    def test_invalid_fuse_flag_returns_400(self):
+        self.post_transformation({"invert": None, "fuse_color": "yes"}, expected_status=400)
@@ -0,0 +1,111 @@
+from itertools import permutations
+from unittest import mock
+
+from django.test import SimpleTestCase
+from PIL import ImageOps
+
+from images.benchmarks.corpus import synthetic_image
+from images.benchmarks.fusion import max_difference, run_histogram_sharing
+from images.instrumentation import StageTimings
+from images.pipeline import apply_steps, compile_steps, lookup_run
+from images.tests.test_setup import TestSetUp
+from images.transformations import histogram
+from images.transformations.histogram import autocontrast_table, compose, equalize_table, remap
+
+LOOKUP_STEPS = {
+    "autocontrast": {"cutoff": 2.0, "ignore": [0, 3]},
+    "equalize": None,
+    "invert": None,
+    "posterize": 3,
+    "solarize": 100,
+    "brightness": 0.7,
+}
+
+
+def separate(image, config: dict):
+    for _, transformer, params in compile_steps(config):
+        image = transformer.apply(image, params)
+    return image
+
+
+class TestHistogramTables(SimpleTestCase):
+    def setUp(self):
+        self.image = synthetic_image(size=(97, 83), mode="RGB")
+
+    def test_tables_match_imageops(self):
+        for mode in ("RGB", "L"):
+            image = self.image.convert(mode)
+            with self.subTest(mode=mode):
+                self.assertEqual(
+                    image.point(equalize_table(image.histogram())).tobytes(), ImageOps.equalize(image).tobytes()
+                )
+                for cutoff in (0, 1.5, (0.0, 10.0)):
+                    expected = ImageOps.autocontrast(image, cutoff=cutoff, ignore=7)
+                    table = autocontrast_table(image.histogram(), cutoff=cutoff, ignore=7)
+                    self.assertEqual(image.point(table).tobytes(), expected.tobytes())
+
+    def test_remapped_histogram_is_the_mapped_image_histogram(self):
+        table = equalize_table(self.image.histogram())
+        self.assertEqual(remap(self.image.histogram(), table), self.image.point(table).histogram())
+
+    def test_composed_tables_map_like_two_passes(self):
+        first = autocontrast_table(self.image.histogram(), cutoff=5.0)
+        second = [255 - value for value in range(256)] * 3
+        self.assertEqual(
+            self.image.point(compose(first, second)).tobytes(), self.image.point(first).point(second).tobytes()
+        )
+
+
+class TestSharedHistograms(SimpleTestCase):
+    def setUp(self):
+        self.image = synthetic_image(size=(131, 97), mode="RGB")
+
+    def test_lookup_runs_are_identical_to_separate_steps(self):
+        for mode in ("RGB", "L"):
+            image = self.image.convert(mode)
+            for keys in permutations(LOOKUP_STEPS, 3):
+                config = {key: LOOKUP_STEPS[key] for key in keys}
+                with self.subTest(mode=mode, keys=keys):
+                    timings = StageTimings()
+                    result = apply_steps(image, compile_steps(config), False, timings)
+                    self.assertEqual([name for name, _, _ in timings.stages], ["transform.lut"])
+                    self.assertEqual(result.tobytes(), separate(image, config).tobytes())
+
+    def test_histogram_is_counted_once_per_run(self):
+        config = {"autocontrast": {"cutoff": 1.0}, "invert": None, "equalize": None}
+        with mock.patch.object(histogram, "remap", wraps=remap) as remapped:
+            image = apply_steps(self.image, compile_steps(config), False, StageTimings())
+        self.assertEqual(remapped.call_count, 2)
+        self.assertEqual(image.tobytes(), separate(self.image, config).tobytes())
+
+    def test_runs_stop_at_other_steps_and_modes(self):
+        config = {"equalize": None, "autocontrast": {"cutoff": 1.0, "preserve_tone": True}, "invert": None}
+        self.assertEqual([key for key, _, _ in lookup_run(compile_steps(config), "RGB")[0]], ["equalize"])
+        for mode in ("RGBA", "P", "CMYK", "I"):
+            with self.subTest(mode=mode):
+                self.assertEqual(lookup_run(compile_steps(config), mode), ([], []))
+
+    def test_proxy_histogram_approximates_large_images(self):
+        image = synthetic_image(size=(400, 300), mode="RGB")
+        config = {"autocontrast": {"cutoff": 2.0}, "equalize": None}
+        with mock.patch.object(histogram, "PROXY_PIXELS", 30000):
+            timings = StageTimings()
+            result = apply_steps(image, compile_steps({"equalize": None}), False, timings, proxy=True)
+            self.assertEqual([name for name, _, _ in timings.stages], ["transform.equalize"])
+            self.assertLessEqual(max_difference(result, ImageOps.equalize(image)), 8)
+            result = apply_steps(image, compile_steps(config), False, StageTimings(), proxy=True)
+        self.assertLessEqual(max_difference(result, separate(image, config)), 8)
+
+    def test_benchmark_reports_identical_shared_output(self):
+        rows = run_histogram_sharing(size=(96, 64), repeat=1)
+        self.assertTrue(all(row["identical"] for row in rows))
+
+
+class TestHistogramConversions(TestSetUp):
+    def test_shared_histogram_conversion_reports_one_stage(self):
+        response = self.post_transformation({"autocontrast": {"cutoff": 1.0}, "equalize": None})
+        self.assertIn("transform.lut;", response["Server-Timing"])
+        self.assertNotIn("transform.equalize;", response["Server-Timing"])
+
+    def test_invalid_proxy_flag_returns_400(self):
+        self.post_transformation({"equalize": None, "histogram_proxy": "yes"}, expected_status=400)
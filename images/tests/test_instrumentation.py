@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from images import metrics
+from images.metrics import REGISTRY, STAGE_DURATION, Histogram, archive_snapshot, render_metrics, reset_directory
+from images.tests.test_setup import TestSetUp
+
+
+class TestStageTimings(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        for metric in REGISTRY:
+            metric.clear()
+
+    def test_server_timing_header_lists_stages_and_transforms(self):
+        response = self.post_transformation(config_dict={"grayscale": None, "resize": {"width": 50, "height": 40}})
+
+        header = response["Server-Timing"]
+        for stage in ("parse;", "verify;", "decode;", "transform.grayscale;", "transform.resize;", "encode;", "total;"):
+            self.assertIn(stage, header)
+        self.assertIn('transform.resize;dur=', header)
+        self.assertIn('desc="10000 px"', header)
+
+    @override_settings(IMAGE_ADMISSION={"ENABLED": False})
+    def test_failed_conversion_still_reports_timing(self):
+        response = self.post_transformation(
+            config_dict={"rotate": {"angle": "x"}}, expected_status=status.HTTP_400_BAD_REQUEST
+        )
+        self.assertIn("transform.rotate;", response["Server-Timing"])
+
+    def test_metrics_endpoint_exposes_histograms(self):
+        self.post_transformation(config_dict={"invert": None, "format": "png"})
+
+        response = self.client.get(reverse("metrics"))
+        body = response.content.decode()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("# TYPE image_stage_duration_seconds histogram", body)
+        self.assertIn('image_stage_duration_seconds_count{stage="decode",format="PNG"} 1', body)
+        self.assertIn('image_transform_duration_seconds_count{transform="invert",format="PNG"} 1', body)
+        self.assertIn('image_transform_pixels_bucket{transform="invert",format="PNG",le="10000.0"} 1', body)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("h", "doc", labelnames=("k",), buckets=(1, 2))
+        for value in (0.5, 1.5, 3):
+            histogram.observe(value, k="v")
+
+        lines = histogram.render()
+        self.assertIn('h_bucket{k="v",le="1.0"} 1', lines)
+        self.assertIn('h_bucket{k="v",le="2.0"} 2', lines)
+        self.assertIn('h_bucket{k="v",le="+Inf"} 3', lines)
+        self.assertIn('h_count{k="v"} 3', lines)
+
+
+class TestSharedMetrics(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        for metric in REGISTRY:
+            metric.clear()
+        self.directory = tempfile.mkdtemp()
+        reset_directory(self.directory)
+        override = override_settings(IMAGE_METRICS_DIR=self.directory)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def other_worker(self, pid: int, decodes: int) -> None:
+        """Write the snapshot of a worker `pid` that observed `decodes` decode stages."""
+        histogram = STAGE_DURATION.empty_copy()
+        for _ in range(decodes):
+            histogram.observe(0.002, stage="decode", format="PNG")
+        with open(os.path.join(self.directory, f"{pid}.json"), "w") as snapshot:
+            json.dump({STAGE_DURATION.name: histogram.snapshot()}, snapshot)
+
+    def test_scrapes_sum_every_worker(self):
+        self.post_transformation(config_dict={"invert": None, "format": "png"})
+        self.other_worker(pid=1, decodes=2)
+
+        body = self.client.get(reverse("metrics")).content.decode()
+        self.assertIn('image_stage_duration_seconds_count{stage="decode",format="PNG"} 3', body)
+        self.assertIn('image_transform_duration_seconds_count{transform="invert",format="PNG"} 1', body)
+
+    def test_requests_publish_this_worker(self):
+        response = self.post_transformation(config_dict={"invert": None, "format": "png"})
+        b"".join(response.streaming_content)  # the request finishes once its file is sent
+
+        with open(os.path.join(self.directory, f"{os.getpid()}.json")) as snapshot:
+            published = json.load(snapshot)
+        self.assertEqual(published[STAGE_DURATION.name][0][0], ["parse", "PNG"])
+
+    def test_exited_workers_stay_counted_once(self):
+        self.other_worker(pid=1, decodes=2)
+        self.other_worker(pid=2, decodes=1)
+        archive_snapshot(self.directory, 1)
+        archive_snapshot(self.directory, 2)
+        self.other_worker(pid=1, decodes=4)
+
+        self.assertEqual(sorted(os.listdir(self.directory)), [".lock", "1.json", metrics.ARCHIVE_NAME])
+        with open(os.path.join(self.directory, metrics.ARCHIVE_NAME)) as archive:
+            self.assertEqual(len(json.load(archive)[STAGE_DURATION.name]), 1)
+        self.assertIn('image_stage_duration_seconds_count{stage="decode",format="PNG"} 7', render_metrics())
@@ -0,0 +1,73 @@
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from PIL import Image
+
+from images.benchmarks.corpus import synthetic_image, synthetic_upload
+from images.benchmarks.palette import PALETTE_STEPS, run_palette
+from images.tests.test_setup import TestSetUp
+from images.transformations import TRANSFORM_MAP
+from images.transformations.palette import map_palette, palettized
+
+
+class TestPalettePointOperations(SimpleTestCase):
+    def setUp(self):
+        self.image = synthetic_image(size=(64, 48), mode="P")
+
+    def test_palette_results_show_the_rgb_results(self):
+        rgb = self.image.convert("RGB")
+        for key, params in PALETTE_STEPS.items():
+            with self.subTest(key=key):
+                transformer = TRANSFORM_MAP[key]
+                result = transformer.apply(self.image, params)
+                self.assertEqual(result.mode, "P")
+                self.assertEqual(result.tobytes(), self.image.tobytes())
+                self.assertEqual(result.convert("RGB").tobytes(), transformer.apply(rgb, params).tobytes())
+
+    def test_input_palette_is_not_modified(self):
+        palette = self.image.getpalette()
+        TRANSFORM_MAP["invert"].apply(self.image, None)
+        self.assertEqual(self.image.getpalette(), palette)
+
+    def test_transparency_and_palette_alpha_are_kept(self):
+        buffer = BytesIO()
+        rgba = Image.new("RGBA", (8, 8), (200, 10, 10, 255))
+        rgba.paste((0, 0, 0, 0), (0, 0, 4, 8))
+        rgba.convert("P").save(buffer, format="PNG")
+        buffer.seek(0)
+        png = Image.open(buffer)
+        png.load()
+
+        inverted = TRANSFORM_MAP["invert"].apply(png, None)
+        self.assertEqual(inverted.info["transparency"], png.info["transparency"])
+        self.assertEqual(inverted.convert("RGBA").getpixel((6, 0)), (55, 245, 245, 255))
+        self.assertEqual(inverted.convert("RGBA").getpixel((0, 0))[3], 0)
+
+        rgba_palette = Image.new("RGBA", (4, 4), (100, 50, 0, 128)).convert("P")
+        self.assertEqual(rgba_palette.palette.mode, "RGBA")
+        self.assertEqual(map_palette(rgba_palette, list(range(255, -1, -1)) * 3).convert("RGBA").getpixel((0, 0)),
+                         (155, 205, 255, 128))
+
+    def test_only_rgb_palettes_take_the_fast_path(self):
+        self.assertTrue(palettized(self.image))
+        self.assertFalse(palettized(self.image.convert("RGB")))
+        self.assertFalse(palettized(Image.new("PA", (4, 4))))
+
+    def test_invalid_params_are_still_rejected(self):
+        with self.assertRaises(ValueError):
+            TRANSFORM_MAP["brightness"].apply(self.image, -1)
+        with self.assertRaises(TypeError):
+            TRANSFORM_MAP["solarize"].apply(self.image, "high")
+
+    def test_benchmark_reports_identical_colors(self):
+        rows = run_palette(size=(96, 64), repeat=1)
+        self.assertTrue(all(row["identical"] for row in rows))
+
+
+class TestPaletteConversions(TestSetUp):
+    def test_palette_png_stays_palettized(self):
+        upload = BytesIO(synthetic_upload((60, 40), "P", "PNG"))
+        upload.name = "palette.png"
+        response = self.post_transformation({"invert": None, "brightness": 0.8, "format": "PNG"}, image=upload)
+        result = Image.open(BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(result.mode, "P")
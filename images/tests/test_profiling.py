@@ -0,0 +1,98 @@
+import marshal
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework import status
+
+from images.tests.test_setup import TestSetUp
+
+User = get_user_model()
+
+
+class TestRequestProfiling(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.profile_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_root, ignore_errors=True)
+        settings_override = override_settings(IMAGE_PROFILE_ROOT=self.profile_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def authenticate(self, is_staff: bool, username: str | None = None):
+        user = User.objects.create(
+            email=f"{username}@test.com" if username else self.user_data['email'],
+            username=username or self.user_data['username'],
+            password=self.user_data['password'],
+            is_staff=is_staff,
+        )
+        self.client.force_authenticate(user=user)
+
+    def post_profiled(self, mode: str, expected_status=status.HTTP_201_CREATED):
+        self.image.seek(0)
+        response = self.client.post(
+            self.transform_url,
+            {"config": '{"grayscale": null, "format": "png"}', "image": self.image},
+            format="multipart",
+            HTTP_X_PROFILE=mode,
+        )
+        self.assertEqual(response.status_code, expected_status)
+        return response
+
+    def stored_file(self, url: str) -> Path:
+        return Path(self.profile_root) / url.rstrip("/").rsplit("/", 1)[-1]
+
+    def test_cpu_profile_stores_pstats_and_collapsed_stacks(self):
+        self.authenticate(is_staff=True)
+        response = self.post_profiled("cpu")
+
+        pstats_url, collapsed_url = response["X-Profile-URL"].split(", ")
+        self.assertTrue(pstats_url.startswith("http://testserver/api/image/profiles/"))
+        stats = marshal.loads(self.stored_file(pstats_url).read_bytes())
+        self.assertTrue(any(name == "process_image_pipeline" for _, _, name in stats))
+
+        collapsed = self.stored_file(collapsed_url).read_text().splitlines()
+        self.assertTrue(collapsed)
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed))
+        self.assertTrue(any("process_image_pipeline" in line and ";" in line for line in collapsed))
+
+    def test_memory_profile_stores_top_allocations(self):
+        self.authenticate(is_staff=True)
+        response = self.post_profiled("mem")
+
+        report = self.stored_file(response["X-Profile-URL"]).read_text()
+        self.assertIn("# traced Python allocations", report)
+        self.assertIn("KiB in", report)
+
+    def test_profiles_are_served_to_staff_only(self):
+        self.authenticate(is_staff=True)
+        url = self.post_profiled("mem")["X-Profile-URL"]
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), self.stored_file(url).read_bytes())
+
+        self.authenticate(is_staff=False, username="viewer")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_missing_profiles_are_not_found(self):
+        self.authenticate(is_staff=True)
+        response = self.client.get(f"/api/image/profiles/{'0' * 32}-cpu.prof/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unknown_mode_is_rejected(self):
+        self.authenticate(is_staff=True)
+        self.post_profiled("gpu", expected_status=status.HTTP_400_BAD_REQUEST)
+
+    def test_header_is_ignored_for_non_staff(self):
+        self.authenticate(is_staff=False)
+        response = self.post_profiled("cpu")
+        self.assertNotIn("X-Profile-URL", response)
+
+    def test_header_is_ignored_for_anonymous_users(self):
+        response = self.post_profiled("cpu", expected_status=status.HTTP_200_OK)
+        self.assertNotIn("X-Profile-URL", response)
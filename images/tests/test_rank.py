@@ -0,0 +1,101 @@
+from django.test import SimpleTestCase
+from PIL import Image, ImageFilter
+
+from images.benchmarks.corpus import synthetic_image
+from images.benchmarks.rank import run_rank_engine
+from images.tests.test_setup import TestSetUp
+from images.transformations import TRANSFORM_MAP
+from images.transformations.rank import rank_filter, separable
+
+
+class TestRankEngine(SimpleTestCase):
+    def setUp(self):
+        self.image = synthetic_image(size=(37, 29), mode="RGB")
+
+    def test_separable_min_and_max_match_pillow(self):
+        for mode in ("RGB", "L", "RGBA", "CMYK", "1"):
+            image = self.image.convert(mode)
+            for size in (1, 3, 5, 9, 31, 63):
+                for filter_class in (ImageFilter.MinFilter, ImageFilter.MaxFilter):
+                    with self.subTest(mode=mode, size=size, filter=filter_class.__name__):
+                        expected = image.filter(filter_class(size))
+                        self.assertEqual(rank_filter(image, [filter_class(size)]).tobytes(), expected.tobytes())
+
+    def test_translucent_edges_match_pillow(self):
+        for mode in ("RGBA", "LA"):
+            image = Image.new("RGBA", (60, 50), (200, 100, 50, 3))
+            image.paste((20, 240, 90, 255), (10, 10, 50, 40))
+            image = image.convert(mode)
+            for size in (3, 5, 9, 31):
+                for filter_class in (ImageFilter.MinFilter, ImageFilter.MaxFilter):
+                    with self.subTest(mode=mode, size=size, filter=filter_class.__name__):
+                        expected = image.filter(filter_class(size))
+                        self.assertEqual(rank_filter(image, [filter_class(size)]).tobytes(), expected.tobytes())
+
+    def test_medians_and_unsupported_modes_use_pillow(self):
+        self.assertFalse(separable(self.image, ImageFilter.MedianFilter(9)))
+        self.assertFalse(separable(self.image.convert("I"), ImageFilter.MaxFilter(9)))
+        image = self.image.convert("I")
+        self.assertEqual(
+            rank_filter(image, [ImageFilter.MaxFilter(5)]).tobytes(), image.filter(ImageFilter.MaxFilter(5)).tobytes()
+        )
+
+    def test_image_info_is_kept(self):
+        self.image.info["dpi"] = (72, 72)
+        self.assertEqual(rank_filter(self.image, [ImageFilter.MinFilter(5)]).info["dpi"], (72, 72))
+
+    def test_benchmark_reports_identical_outputs(self):
+        rows = run_rank_engine(size=(64, 48), repeat=1, sizes=(3, 15))
+        self.assertEqual(len(rows), 4)
+        self.assertTrue(all(row["identical"] for row in rows))
+
+
+class TestMorphology(SimpleTestCase):
+    def setUp(self):
+        self.transformer = TRANSFORM_MAP["rank_filter"]
+        self.image = synthetic_image(size=(48, 40), mode="L")
+
+    def test_open_and_close_chain_min_and_max(self):
+        for name, first, second in (("OPEN", ImageFilter.MinFilter, ImageFilter.MaxFilter),
+                                    ("close", ImageFilter.MaxFilter, ImageFilter.MinFilter)):
+            with self.subTest(name=name):
+                expected = self.image.filter(first(7)).filter(second(7))
+                result = self.transformer.apply(self.image, {"size": 7, "filter_name": name})
+                self.assertEqual(result.tobytes(), expected.tobytes())
+
+    def test_opening_removes_specks_smaller_than_the_window(self):
+        image = Image.new("L", (30, 30))
+        image.paste(255, (10, 10, 12, 12))
+        image.paste(255, (15, 15, 25, 25))
+        opened = self.transformer.apply(image, {"size": 5, "filter_name": "OPEN"})
+
+        self.assertEqual(opened.getpixel((11, 11)), 0)
+        self.assertEqual(opened.getbbox(), (15, 15, 25, 25))
+
+    def test_window_must_be_a_positive_odd_int(self):
+        for size, error in ((4, ValueError), (0, ValueError), (-3, ValueError), (5.0, TypeError)):
+            with self.subTest(size=size):
+                with self.assertRaises(error):
+                    self.transformer.apply(self.image, {"size": size, "filter_name": "MIN"})
+
+    def test_median_window_is_capped(self):
+        self.assertEqual(len(self.transformer.filters({"size": 15, "filter_name": "MEDIAN"})), 1)
+        with self.assertRaisesMessage(ValueError, "at most 15"):
+            self.transformer.apply(self.image, {"size": 17, "filter_name": "median"})
+        self.assertEqual(self.transformer.filters({"size": 31, "filter_name": "MAX"})[0].size, 31)
+
+    def test_cost_grows_with_the_window_for_medians_only(self):
+        def cost(size: int, name: str) -> float:
+            return self.transformer.cost_units((100, 100), (100, 100), {"size": size, "filter_name": name})
+
+        self.assertEqual(cost(15, "MEDIAN") * 9, cost(3, "MEDIAN") * 15 ** 2)
+        self.assertLess(cost(31, "MAX") / cost(3, "MAX"), 3)
+        self.assertEqual(cost(9, "OPEN"), 2 * cost(9, "MIN"))
+
+
+class TestRankConversions(TestSetUp):
+    def test_large_window_morphology_converts(self):
+        self.post_transformation({"rank_filter": {"size": 51, "filter_name": "CLOSE"}})
+
+    def test_even_window_returns_400(self):
+        self.post_transformation({"rank_filter": {"size": 8, "filter_name": "MAX"}}, expected_status=400)
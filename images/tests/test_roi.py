@@ -0,0 +1,129 @@
+import struct
+from io import BytesIO
+from unittest import mock
+
+from django.test import SimpleTestCase
+from PIL import Image, ImageFilter
+
+from images import pipeline
+from images.benchmarks.corpus import synthetic_image
+from images.instrumentation import StageTimings
+from images.pipeline import apply_steps, compile_steps, limit_decode, process_image_pipeline, push_down_crop
+from images.planner import explain_pipeline
+
+LOCAL_STEPS = (
+    {"basic_filter": ["SMOOTH", "EDGE_ENHANCE_MORE", "FIND_EDGES"]},
+    {"basic_filter": "EMBOSS", "invert": None},
+    {"rank_filter": {"size": 5, "filter_name": "MEDIAN"}, "grayscale": None},
+    {"multiband_filter": {"radius": 3, "filter_name": "GAUSSIANBLUR"}, "sharpness": 2.0},
+    {"posterize": 3, "multiband_filter": {"radius": 2, "filter_name": "UNSHARPMASK"}},
+)
+
+CROPS = (
+    {"region_crop": {"left": 30, "upper": 20, "right": 60, "lower": 50}},
+    {"region_crop": {"left": 0, "upper": 0, "right": 12, "lower": 83}},
+    {"border_crop": 9},
+)
+
+
+class TestCropPushdown(SimpleTestCase):
+    def setUp(self):
+        self.image = synthetic_image(size=(97, 83), mode="RGB")
+
+    def test_pushed_down_crop_gives_identical_pixels(self):
+        pushed = 0
+        for mode in ("RGB", "L", "RGBA"):
+            image = self.image.convert(mode)
+            for chain in LOCAL_STEPS:
+                for crop in CROPS:
+                    steps = compile_steps({**chain, **crop})
+                    try:
+                        expected = apply_steps(image, steps, False, StageTimings())
+                    except OSError:
+                        continue
+                    rewritten, _ = push_down_crop(steps, image.size, image.mode)
+                    pushed += rewritten[0][0] == "roi"
+                    with self.subTest(mode=mode, chain=chain, crop=crop):
+                        result = apply_steps(image, rewritten, False, StageTimings())
+                        self.assertEqual((result.size, result.tobytes()), (expected.size, expected.tobytes()))
+        self.assertGreater(pushed, 25)
+
+    def test_pushdown_stops_at_steps_that_need_the_whole_image(self):
+        config = {"contrast": 1.5, "basic_filter": "BLUR", **CROPS[0]}
+        rewritten, window = push_down_crop(compile_steps(config), self.image.size, self.image.mode)
+
+        self.assertEqual([key for key, _, _ in rewritten], ["contrast", "roi", "basic_filter", "region_crop"])
+        self.assertEqual(rewritten[1][2], {"left": 28, "upper": 18, "right": 62, "lower": 52})
+        self.assertEqual(rewritten[3][2], {"left": 2, "upper": 2, "right": 32, "lower": 32})
+        self.assertIsNone(window)
+
+    def test_configs_without_a_useful_window_are_unchanged(self):
+        for config in (
+            {"rotate": {"angle": 10}, **CROPS[0]},
+            {"basic_filter": "BLUR"},
+            {"multiband_filter": {"radius": 20, "filter_name": "BOXBLUR"}, "border_crop": 1},
+            {"basic_filter": "BLUR", "region_crop": {"left": 90, "right": 10}},
+        ):
+            with self.subTest(config=config):
+                steps = compile_steps(config)
+                self.assertEqual(push_down_crop(steps, self.image.size, self.image.mode), (steps, None))
+
+
+class TestLimitedDecode(SimpleTestCase):
+    def encode(self, image_format: str) -> BytesIO:
+        buffer = BytesIO()
+        synthetic_image(size=(400, 300), mode="RGB").save(buffer, format=image_format)
+        buffer.seek(0)
+        return buffer
+
+    def test_png_decodes_only_the_rows_the_window_needs(self):
+        config = {"multiband_filter": {"radius": 4, "filter_name": "GAUSSIANBLUR"}, **CROPS[0]}
+        with mock.patch.object(pipeline, "limit_decode", wraps=limit_decode) as limited:
+            result, _ = process_image_pipeline(self.encode("PNG"), config)
+
+        self.assertEqual(limited.call_args.args[1], 50 + 15)
+        expected = Image.open(self.encode("PNG")).filter(ImageFilter.GaussianBlur(4)).crop((30, 20, 60, 50))
+        self.assertEqual(result.tobytes(), expected.tobytes())
+
+    def test_limited_png_stops_at_the_given_row(self):
+        image = Image.open(self.encode("PNG"))
+        self.assertTrue(limit_decode(image, 65))
+        image.load()
+        self.assertEqual(image.size, (400, 65))
+
+    def test_limited_png_never_reads_past_the_window(self):
+        data = self.encode("PNG").getvalue()
+        start = data.index(b"IDAT") - 4
+        truncated = data[:start + 12 + struct.unpack(">I", data[start:start + 4])[0]]
+        with self.assertRaises(OSError):
+            Image.open(BytesIO(truncated)).load()
+
+        image = Image.open(BytesIO(truncated))
+        self.assertTrue(limit_decode(image, 40))
+        image.load()
+        expected = Image.open(BytesIO(data)).crop((0, 0, 400, 40))
+        self.assertEqual(image.tobytes(), expected.tobytes())
+
+    def test_jpeg_is_decoded_in_full(self):
+        image = Image.open(self.encode("JPEG"))
+        self.assertFalse(limit_decode(image, 50))
+        image.load()
+        self.assertEqual(image.size, (400, 300))
+
+    def test_explain_plans_filters_on_the_window(self):
+        config = {"basic_filter": ["SMOOTH", "SHARPEN"], **CROPS[0]}
+        plan = explain_pipeline(config, size=(400, 300), mode="RGB", image_format="PNG")
+        steps = {step["step"]: step for step in plan["steps"]}
+
+        self.assertEqual(list(steps), ["decode", "transform.roi", "transform.basic_filter", "transform.region_crop", "encode"])
+        self.assertEqual(steps["transform.basic_filter"]["input"], {"width": 34, "height": 34, "mode": "RGB"})
+        self.assertEqual(plan["output"]["width"], 30)
+
+    def test_explain_plans_the_decode_down_to_the_window(self):
+        config = {"basic_filter": ["SMOOTH", "SHARPEN"], **CROPS[0]}
+        png = explain_pipeline(config, size=(400, 300), mode="RGB", image_format="PNG")["steps"][0]
+        jpeg = explain_pipeline(config, size=(400, 300), mode="RGB", image_format="JPEG")["steps"][0]
+
+        self.assertEqual(png["output"], {"width": 400, "height": 52, "mode": "RGB"})
+        self.assertEqual(png["cost_units"], 400 * 52)
+        self.assertEqual(jpeg["cost_units"], 400 * 300)
@@ -0,0 +1,99 @@
+import threading
+import time
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+
+from images.metrics import QUEUE_WAIT, render_metrics
+from images.scheduler import FairShareScheduler, get_scheduler
+from images.tests.test_setup import TestSetUp
+
+
+class TestFairShareScheduler(SimpleTestCase):
+    def setUp(self):
+        self.granted = []
+        self.threads = []
+
+    def make_scheduler(self, shares=None, aging_rate=0.0) -> FairShareScheduler:
+        scheduler = FairShareScheduler(slots=1, shares=shares or {}, aging_rate=aging_rate)
+        self.blocker = scheduler.acquire(user="blocker", tier="anonymous", cost=0, timeout=0)
+        return scheduler
+
+    def enqueue(self, scheduler, name, user="u", tier="anonymous", cost=1.0):
+        """Queue a job from a thread that records its name when granted and releases at once."""
+        def run():
+            slot = scheduler.acquire(user=user, tier=tier, cost=cost, timeout=5)
+            self.granted.append(name)
+            slot.release()
+
+        waiting = len(scheduler.waiting)
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.threads.append(thread)
+        while len(scheduler.waiting) == waiting:
+            time.sleep(0.001)
+
+    def drain(self):
+        self.blocker.release()
+        for thread in self.threads:
+            thread.join()
+        return self.granted
+
+    def test_shortest_job_runs_first(self):
+        scheduler = self.make_scheduler()
+        for name, cost in (("big", 100), ("small", 1), ("medium", 10)):
+            self.enqueue(scheduler, name, cost=cost)
+        self.assertEqual(self.drain(), ["small", "medium", "big"])
+
+    def test_users_take_turns(self):
+        scheduler = self.make_scheduler()
+        for name in ("a1", "a2", "a3"):
+            self.enqueue(scheduler, name, user="a", cost=10)
+        self.enqueue(scheduler, "b1", user="b", cost=10)
+        order = self.drain()
+        self.assertLess(order.index("b1"), order.index("a2"))
+
+    def test_tiers_get_their_share(self):
+        scheduler = self.make_scheduler(shares={"authenticated": 3, "anonymous": 1})
+        for index in range(4):
+            self.enqueue(scheduler, f"anon{index}", user="anon", tier="anonymous", cost=10)
+            self.enqueue(scheduler, f"user{index}", user="user", tier="authenticated", cost=10)
+        first_four = self.drain()[:4]
+        self.assertEqual(sum(name.startswith("user") for name in first_four), 3)
+
+    def test_waiting_ages_a_large_job_ahead(self):
+        scheduler = self.make_scheduler(aging_rate=1_000)
+        self.enqueue(scheduler, "big", cost=10_000)
+        time.sleep(0.05)
+        self.enqueue(scheduler, "small", cost=1)
+        self.assertEqual(self.drain(), ["big", "small"])
+
+    def test_timeout_leaves_the_queue(self):
+        scheduler = self.make_scheduler()
+        self.assertIsNone(scheduler.acquire(user="u", tier="anonymous", cost=1, timeout=0.01))
+        self.assertEqual(scheduler.waiting, [])
+        self.blocker.release()
+        self.assertEqual(scheduler.running, 0)
+
+
+class TestSchedulerEndpoint(TestSetUp):
+    def test_conversion_reports_queue_stage_and_wait_metric(self):
+        QUEUE_WAIT.clear()
+        response = self.post_transformation(config_dict={"invert": None})
+
+        self.assertIn("queue;", response["Server-Timing"])
+        self.assertIn('image_queue_wait_seconds_count{tier="anonymous"} 1', render_metrics())
+
+    @override_settings(IMAGE_SCHEDULER={"SLOTS": 1, "QUEUE_TIMEOUT": 0.01, "RETRY_AFTER": 9})
+    def test_busy_slots_return_503_with_retry_after(self):
+        scheduler = get_scheduler().scheduler
+        slot = scheduler.acquire(user="other", tier="authenticated", cost=0, timeout=0)
+        try:
+            response = self.post_transformation(
+                config_dict={"invert": None}, expected_status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        finally:
+            slot.release()
+
+        self.assertEqual(response["Retry-After"], "9")
+        self.post_transformation(config_dict={"invert": None})
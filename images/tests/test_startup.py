@@ -0,0 +1,73 @@
+import json
+import os
+import subprocess
+import sys
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from images.management.commands.import_time_report import by_package, parse_import_times
+from images.transformations import TRANSFORM_MAP
+from images.transformations.registry import LazyTransformMap, load_manifest
+
+# Wall-clock startup budget, checked only when set: timings vary too much across machines for CI.
+STARTUP_BUDGET_MS = os.environ.get("IMAGE_STARTUP_BUDGET_MS")
+
+STARTUP_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import django; django.setup(); import config.urls
+elapsed_ms = (time.perf_counter() - start) * 1000
+loaded = lambda: sorted(name for name in sys.modules if name.startswith("images.transformations."))
+before = loaded()
+from images.transformations import TRANSFORM_MAP
+TRANSFORM_MAP["resize"]
+print(json.dumps({"elapsed_ms": elapsed_ms, "before": before, "after": loaded()}))
+"""
+
+
+class TestStartup(SimpleTestCase):
+    def probe_startup(self) -> dict:
+        """Start Django in a fresh interpreter and return `STARTUP_PROBE`'s report."""
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE],
+            capture_output=True, text=True, cwd=settings.BASE_DIR, env=os.environ.copy(), check=True,
+        )
+        return json.loads(result.stdout.splitlines()[-1])
+
+    def test_cold_start_imports_no_transform(self):
+        probe = self.probe_startup()
+
+        transform_modules = set(load_manifest().values())
+        self.assertEqual(transform_modules & set(probe["before"]), set())
+        self.assertEqual(transform_modules & set(probe["after"]), {"images.transformations.resize"})
+
+    @skipUnless(STARTUP_BUDGET_MS, "set IMAGE_STARTUP_BUDGET_MS to check cold-start time")
+    def test_cold_start_is_within_budget(self):
+        self.assertLess(self.probe_startup()["elapsed_ms"], float(STARTUP_BUDGET_MS))
+
+    def test_manifest_is_up_to_date(self):
+        call_command("generate_transform_manifest", check=True, stdout=StringIO())
+
+    def test_registry_is_lazy_by_default(self):
+        self.assertIsInstance(TRANSFORM_MAP, LazyTransformMap)
+        self.assertEqual(set(TRANSFORM_MAP), set(load_manifest()))
+
+    def test_stale_manifest_entry_names_the_fix(self):
+        stale = LazyTransformMap({"sparkle": "images.transformations.validators"})
+        self.assertIn("sparkle", stale)
+        with self.assertRaisesMessage(KeyError, "generate_transform_manifest"):
+            stale["sparkle"]
+
+    def test_import_time_parsing(self):
+        rows = parse_import_times(
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     PIL._util\n"
+            "import time:       300 |        420 |   PIL.Image\n"
+            "import time:        80 |         80 | json\n"
+        )
+        self.assertEqual(rows[1], ("PIL.Image", 300, 420))
+        self.assertEqual(by_package(rows), {"PIL": 420, "json": 80})
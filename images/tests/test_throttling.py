@@ -0,0 +1,97 @@
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+
+from images import planner
+from images.tests.test_setup import TestSetUp
+from images.throttling import (
+    MIN_CHARGE, AnonCostRateThrottle, CacheBudgetStore, SQLiteBudgetStore, take,
+)
+from images.views import ImageViewSet
+
+
+def jpeg(size: tuple[int, int]) -> ContentFile:
+    buffer = BytesIO()
+    Image.new("RGB", size).save(buffer, format="JPEG")
+    return ContentFile(buffer.getvalue(), name="upload.jpg")
+
+
+class TestTokenBucket(SimpleTestCase):
+    def test_take_refills_and_charges(self):
+        budget = take(tokens=2, elapsed=3, cost=4, capacity=10, refill_rate=1)
+        self.assertTrue(budget.allowed)
+        self.assertEqual(budget.remaining, 1)
+
+    def test_refused_charge_reports_the_wait(self):
+        budget = take(tokens=1, elapsed=0, cost=3, capacity=10, refill_rate=0.5)
+        self.assertFalse(budget.allowed)
+        self.assertEqual(budget.remaining, 1)
+        self.assertEqual(budget.wait, 4)
+
+    def test_cost_over_capacity_needs_a_full_bucket(self):
+        self.assertTrue(take(tokens=10, elapsed=0, cost=50, capacity=10, refill_rate=1).allowed)
+        self.assertFalse(take(tokens=9, elapsed=0, cost=50, capacity=10, refill_rate=1).allowed)
+
+    def test_sqlite_store_is_shared_between_instances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "budgets.sqlite3"
+            first, second = SQLiteBudgetStore(path=str(path)), SQLiteBudgetStore(path=str(path))
+            self.assertTrue(first.charge("key", cost=6, capacity=10, refill_rate=1e-9).allowed)
+            budget = second.charge("key", cost=6, capacity=10, refill_rate=1e-9)
+        self.assertFalse(budget.allowed)
+        self.assertAlmostEqual(budget.remaining, 4)
+
+    def test_cache_store(self):
+        store = CacheBudgetStore()
+        self.assertAlmostEqual(store.charge("cache-key", cost=3, capacity=10, refill_rate=1e-9).remaining, 7)
+        self.assertAlmostEqual(store.charge("cache-key", cost=3, capacity=10, refill_rate=1e-9).remaining, 4)
+
+
+class TestCostRateThrottle(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(IMAGE_THROTTLE={
+            "BACKEND": "sqlite", "OPTIONS": {"path": str(Path(directory.name) / "budgets.sqlite3")},
+        })
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        for patcher in (
+                mock.patch.object(ImageViewSet, "throttle_classes", [AnonCostRateThrottle]),
+                mock.patch.object(AnonCostRateThrottle, "THROTTLE_RATES", {"anon_cost": "5/day"}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_throttle_and_admission_share_one_plan(self):
+        with mock.patch.object(planner, "explain_pipeline", wraps=planner.explain_pipeline) as explain:
+            response = self.post_transformation(config_dict={"grayscale": None}, image=jpeg((64, 64)))
+        self.assertIn("admission;", response["Server-Timing"])
+        self.assertEqual(explain.call_count, 1)
+
+    def test_budget_headers_charge_by_estimated_cost(self):
+        small = self.post_transformation(config_dict={"thumbnail": {"size": [32.0, 32.0]}}, image=jpeg((64, 64)))
+        self.assertEqual(small["X-RateLimit-Limit"], "5")
+        self.assertEqual(float(small["X-RateLimit-Cost"]), MIN_CHARGE)
+        self.assertAlmostEqual(float(small["X-RateLimit-Remaining"]), 5 - MIN_CHARGE, places=2)
+
+        large = self.post_transformation(
+            config_dict={"rank_filter": {"size": 9, "filter_name": "MEDIAN"}}, image=jpeg((1000, 1000)),
+        )
+        self.assertGreater(float(large["X-RateLimit-Cost"]), MIN_CHARGE)
+
+    def test_exhausted_budget_is_throttled(self):
+        with mock.patch("images.throttling.request_cost", return_value=4):
+            self.post_transformation(config_dict={"invert": None})
+            response = self.post_transformation(
+                config_dict={"invert": None}, expected_status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
+        self.assertGreater(int(response["Retry-After"]), 0)
+        self.assertAlmostEqual(float(response["X-RateLimit-Remaining"]), 1, places=2)
@@ -0,0 +1,90 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from images.services import config_hash
+from images.tests.test_setup import TestSetUp
+from images.tracing import NON_RECORDING_SPAN, FileSpanExporter, Tracer, get_tracer, parse_traceparent
+
+
+@override_settings(IMAGE_TRACING={"EXPORTER": "memory"})
+class TestRequestTracing(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.exporter = get_tracer().exporter
+        self.exporter.clear()
+
+    def spans_by_name(self) -> dict:
+        return {span.name: span for span in self.exporter.spans}
+
+    def test_request_produces_one_trace_with_a_span_per_stage(self):
+        self.post_transformation(config_dict={"grayscale": None, "resize": {"width": 50, "height": 40}})
+
+        spans = self.spans_by_name()
+        root = spans["HTTP POST api/image/"]
+        view = spans["ImageViewSet.create"]
+        for name in ("auth", "parse", "verify", "decode", "transform.grayscale", "transform.resize", "encode"):
+            self.assertEqual(spans[name].parent_id, view.span_id, name)
+        self.assertEqual(view.parent_id, root.span_id)
+        self.assertIsNone(root.parent_id)
+        self.assertEqual({span.trace_id for span in spans.values()}, {root.trace_id})
+        self.assertEqual(root.attributes["http.status_code"], 200)
+
+    def test_spans_carry_image_attributes_and_config_hash(self):
+        config = {"grayscale": None, "resize": {"width": 50, "height": 40}}
+        self.post_transformation(config_dict=config)
+
+        spans = self.spans_by_name()
+        self.assertEqual(spans["ImageViewSet.create"].attributes["image.config_hash"], config_hash(config))
+        self.assertEqual(spans["decode"].attributes["image.format"], "JPEG")
+        resize = spans["transform.resize"].attributes
+        self.assertEqual((resize["image.width"], resize["image.height"], resize["image.mode"]), (100, 100, "L"))
+        self.assertEqual(resize["image.pixels"], 10000)
+
+    def test_incoming_traceparent_is_continued(self):
+        trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+        self.image.seek(0)
+        self.client.post(
+            self.transform_url,
+            {"config": '{"invert": null}', "image": self.image},
+            format="multipart",
+            HTTP_TRACEPARENT=f"00-{trace_id}-{parent_id}-01",
+        )
+
+        root = next(span for span in self.exporter.spans if span.name.startswith("HTTP POST"))
+        self.assertEqual((root.trace_id, root.parent_id), (trace_id, parent_id))
+
+    @override_settings(IMAGE_ADMISSION={"ENABLED": False})
+    def test_failed_transform_span_is_marked_as_error(self):
+        self.post_transformation(config_dict={"rotate": {"angle": "x"}}, expected_status=400)
+        rotate = self.spans_by_name()["transform.rotate"]
+        self.assertEqual(rotate.status, "ERROR")
+        self.assertEqual(rotate.attributes["exception.type"], "TypeError")
+
+
+class TestTracer(SimpleTestCase):
+    def test_disabled_tracer_yields_non_recording_span(self):
+        with Tracer().start_span("noop") as span:
+            span.set_attribute("ignored", 1)
+        self.assertIs(span, NON_RECORDING_SPAN)
+        self.assertEqual(span.attributes, {})
+
+    def test_file_exporter_writes_json_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "spans.jsonl"
+            tracer = Tracer(FileSpanExporter(path=str(path)))
+            with tracer.start_span("outer"):
+                with tracer.start_span("inner", attributes={"image.mode": "RGB"}):
+                    pass
+
+            inner, outer = [json.loads(line) for line in path.read_text().splitlines()]
+        self.assertEqual(inner["parent_span_id"], outer["span_id"])
+        self.assertEqual(inner["attributes"], {"image.mode": "RGB"})
+        self.assertGreaterEqual(outer["duration_ms"], inner["duration_ms"])
+
+    def test_parse_traceparent_rejects_malformed_headers(self):
+        self.assertIsNone(parse_traceparent("00-xyz-00f067aa0ba902b7-01"))
+        self.assertIsNone(parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01"))
+        self.assertIsNone(parse_traceparent(None))
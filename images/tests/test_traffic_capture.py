@@ -0,0 +1,74 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+
+from images.benchmarks.replay import load_capture, replay_workload
+from images.tests.test_setup import TestSetUp
+
+
+class TestTrafficCapture(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.directory.name) / "capture.jsonl"
+
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+
+    def capture(self, store_images: bool = False) -> list[dict]:
+        options = {"ENABLED": True, "SAMPLE_RATE": 1.0, "LOG_PATH": str(self.log_path), "STORE_IMAGES": store_images}
+        with override_settings(IMAGE_TRAFFIC_CAPTURE=options):
+            self.post_transformation(config_dict={"grayscale": None, "format": "png"})
+        return load_capture(self.log_path)
+
+    def test_capture_records_request_shape(self):
+        records = self.capture()
+
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual(json.loads(record["config"]), {"grayscale": None, "format": "png"})
+        self.assertEqual((record["width"], record["height"], record["format"]), (100, 100, "JPEG"))
+        self.assertEqual(record["status"], 200)
+        self.assertFalse(record["authenticated"])
+        self.assertEqual(len(record["sha256"]), 64)
+        self.assertFalse((self.log_path.parent / "images").exists())
+
+    async def test_capture_records_async_endpoint(self):
+        options = {"ENABLED": True, "SAMPLE_RATE": 1.0, "LOG_PATH": str(self.log_path), "STORE_IMAGES": False}
+        self.image.seek(0)
+        with override_settings(IMAGE_TRAFFIC_CAPTURE=options):
+            response = await self.async_client.post(
+                reverse("image-async"), {"config": json.dumps({"invert": None}), "image": self.image}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        records = load_capture(self.log_path)
+        self.assertEqual([json.loads(record["config"]) for record in records], [{"invert": None}])
+
+    def test_other_posts_are_not_captured(self):
+        options = {"ENABLED": True, "SAMPLE_RATE": 1.0, "LOG_PATH": str(self.log_path), "STORE_IMAGES": False}
+        with override_settings(IMAGE_TRAFFIC_CAPTURE=options):
+            self.client.post(reverse("metrics"), {"config": json.dumps({"invert": None}), "image": self.image})
+        self.assertFalse(self.log_path.exists())
+
+    def test_capture_is_off_by_default(self):
+        options = {**settings.IMAGE_TRAFFIC_CAPTURE, "LOG_PATH": str(self.log_path)}
+        with override_settings(IMAGE_TRAFFIC_CAPTURE=options):
+            self.post_transformation(config_dict={"grayscale": None})
+        self.assertFalse(self.log_path.exists())
+
+    def test_replay_uses_stored_original_or_synthetic_stand_in(self):
+        records = self.capture(store_images=True)
+        images_dir = self.log_path.parent / "images"
+        self.assertTrue((images_dir / f"{records[0]['sha256']}.jpeg").exists())
+
+        workload, originals = replay_workload(records, images_dir=images_dir)
+        self.assertEqual((len(workload), originals), (1, 1))
+
+        workload, originals = replay_workload(records, images_dir=Path(self.directory.name) / "missing")
+        self.assertEqual((len(workload), originals), (1, 0))
@@ -0,0 +1,74 @@
+import runpy
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+
+from images.warmup import reset_warmup, warmup_status
+
+GUNICORN_CONFIG = Path(settings.BASE_DIR) / "config" / "gunicorn.py"
+
+
+class TestProbes(SimpleTestCase):
+    def setUp(self):
+        reset_warmup()
+        self.addCleanup(reset_warmup)
+
+    def test_liveness(self):
+        response = self.client.get(reverse("healthz"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["status"], "alive")
+
+    def test_readiness_reports_each_primed_codec(self):
+        response = self.client.get(reverse("readyz"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        warmup = response.json()["warmup"]
+        self.assertEqual(warmup["state"], "ready")
+        self.assertEqual(set(warmup["codecs"]), {"JPEG", "PNG", "WEBP"})
+
+    def test_failed_codec_is_not_ready(self):
+        def prime(image_format):
+            if image_format == "WEBP":
+                raise OSError("encoder webp not available")
+            return 1.0
+
+        with mock.patch("images.warmup.prime_codec", side_effect=prime):
+            response = self.client.get(reverse("readyz"))
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json()["warmup"]["errors"], {"WEBP": "encoder webp not available"})
+
+
+class TestGunicornConfig(SimpleTestCase):
+    def setUp(self):
+        reset_warmup()
+        self.addCleanup(reset_warmup)
+        self.config = runpy.run_path(str(GUNICORN_CONFIG))
+
+    def test_preloads_and_recycles(self):
+        self.assertTrue(self.config["preload_app"])
+        self.assertGreater(self.config["max_requests"], 0)
+
+    def test_master_warms_up_before_forking(self):
+        server = SimpleNamespace(log=mock.Mock())
+        with mock.patch("gc.freeze") as freeze:
+            self.config["on_starting"](server)
+
+        self.assertEqual(warmup_status()["state"], "ready")
+        freeze.assert_called_once()
+
+    def test_worker_over_rss_limit_is_recycled(self):
+        worker = SimpleNamespace(alive=True, pid=1, log=mock.Mock())
+        post_request = self.config["post_request"]
+
+        post_request(worker, None, {}, None)
+        self.assertTrue(worker.alive)
+
+        post_request.__globals__["max_rss_mb"] = 1
+        post_request(worker, None, {}, None)
+        self.assertFalse(worker.alive)
@@ -125,3 +125,14 @@ class TestAutocontrast(TestSetUp):
         )
         detail_message: str = response.data.get("detail", "")
         self.assertIn("out of range", detail_message)
+
+    def test_autocontrast_ignore_is_optional(self) -> None:
+        """
+        Omitting the optional `ignore` parameter should return HTTP 200.
+        """
+        configuration: dict = {
+            "autocontrast": {
+                "cutoff": 2.0
+            }
+        }
+        self.post_transformation(config_dict=configuration)
@@ -0,0 +1,237 @@
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.throttling import SimpleRateThrottle
+
+from .planner import plan_upload
+from .services import parse_config
+
+MIN_CHARGE = 0.25
+"""Seconds charged for a request with no plannable conversion (listing, auth, invalid uploads)."""
+
+
+class Budget:
+    """
+    The outcome of charging a token bucket.
+
+    Attributes:
+        allowed (bool): Whether the charge fit in the bucket.
+        remaining (float): Tokens left after the charge.
+        wait (float): Seconds until the charge would fit, 0 when allowed.
+    """
+    __slots__ = ("allowed", "remaining", "wait")
+
+    def __init__(self, allowed: bool, remaining: float, wait: float):
+        self.allowed = allowed
+        self.remaining = remaining
+        self.wait = wait
+
+
+def take(tokens: float, elapsed: float, cost: float, capacity: float, refill_rate: float) -> Budget:
+    """
+    Refill a bucket for `elapsed` seconds and try to take `cost` from it.
+
+    A cost above the capacity is clamped to it, so it can still pass, but only with a full bucket.
+
+    Args:
+        tokens (float): Tokens in the bucket when it was last charged.
+        elapsed (float): Seconds since then.
+        cost (float): Tokens this request needs.
+        capacity (float): Bucket size.
+        refill_rate (float): Tokens added per second.
+
+    Returns:
+        Budget: Whether it was allowed, the tokens left and how long to wait otherwise.
+    """
+    tokens = min(capacity, tokens + max(elapsed, 0.0) * refill_rate)
+    cost = min(cost, capacity)
+    if tokens >= cost:
+        return Budget(allowed=True, remaining=tokens - cost, wait=0.0)
+    return Budget(allowed=False, remaining=tokens, wait=(cost - tokens) / refill_rate)
+
+
+class BudgetStore:
+    """Keeps token buckets where every worker process can see them."""
+
+    def charge(self, key: str, cost: float, capacity: float, refill_rate: float) -> Budget:
+        """Charge `cost` to the bucket `key`, which starts full; see `take`."""
+        raise NotImplementedError
+
+
+class SQLiteBudgetStore(BudgetStore):
+    """
+    Token buckets in a local SQLite file (default: BASE_DIR/throttle/budgets.sqlite3).
+
+    Each charge is one `BEGIN IMMEDIATE` transaction, so workers on the same
+    host never lose an update.
+    """
+
+    def __init__(self, path: str | None = None, timeout: float = 5.0):
+        self.path = Path(path or Path(settings.BASE_DIR) / "throttle" / "budgets.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the table on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS budgets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def charge(self, key: str, cost: float, capacity: float, refill_rate: float) -> Budget:
+        connection = self.connection()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT tokens, updated FROM budgets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row is not None else (capacity, now)
+            budget = take(tokens, now - updated, cost, capacity, refill_rate)
+            connection.execute(
+                "INSERT OR REPLACE INTO budgets (key, tokens, updated) VALUES (?, ?, ?)",
+                (key, budget.remaining, now),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return budget
+
+
+class CacheBudgetStore(BudgetStore):
+    """
+    Token buckets in a Django cache, e.g. a Redis or Memcached alias shared by every host.
+
+    Like DRF's own throttles, a read-then-write race between workers can
+    occasionally lose a charge; use `SQLiteBudgetStore` when exact accounting
+    on one host matters more than sharing across hosts.
+    """
+
+    def __init__(self, alias: str = "default", timeout: int = 86400):
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def charge(self, key: str, cost: float, capacity: float, refill_rate: float) -> Budget:
+        now = time.time()
+        tokens, updated = self.cache.get(key, (capacity, now))
+        budget = take(tokens, now - updated, cost, capacity, refill_rate)
+        self.cache.set(key, (budget.remaining, now), self.timeout)
+        return budget
+
+
+STORE_ALIASES: dict[str, type[BudgetStore]] = {
+    "sqlite": SQLiteBudgetStore,
+    "cache": CacheBudgetStore,
+}
+
+
+@lru_cache(maxsize=None)
+def get_budget_store() -> BudgetStore:
+    """
+    Return the process-wide store configured by `settings.IMAGE_THROTTLE`.
+
+    `BACKEND` is "sqlite", "cache" or a dotted path to a `BudgetStore`
+    subclass; `OPTIONS` are passed to its constructor.
+    """
+    options = getattr(settings, "IMAGE_THROTTLE", {})
+    path = options.get("BACKEND", "sqlite")
+    store_class = STORE_ALIASES.get(path) or import_string(path)
+    return store_class(**options.get("OPTIONS", {}))
+
+
+@receiver(setting_changed)
+def reset_budget_store(setting, **kwargs) -> None:
+    if setting == "IMAGE_THROTTLE":
+        get_budget_store.cache_clear()
+
+
+def request_cost(request, view) -> float:
+    """
+    Estimate the CPU seconds a request will cost, before it runs.
+
+    Conversions are planned from their config and image header with
+    `plan_upload`, whose plan admission control reuses; anything else,
+    including uploads that will be rejected, costs `MIN_CHARGE`.
+    """
+    image_file = request.FILES.get("image") if getattr(view, "action", None) == "create" else None
+    if image_file is None:
+        return MIN_CHARGE
+    config = parse_config(request)
+    if not isinstance(config, dict):
+        return MIN_CHARGE
+    try:
+        plan = plan_upload(request, image_file, config)
+    except Exception:
+        return MIN_CHARGE
+    return max(MIN_CHARGE, plan["estimated_ms"] / 1000)
+
+
+class CostRateThrottle(SimpleRateThrottle):
+    """
+    Throttle by estimated CPU seconds instead of by request count.
+
+    The rate reads as seconds of estimated conversion time per period, e.g.
+    "60/day", and refills continuously as a token bucket kept in the
+    configured `BudgetStore`. Each request is charged `request_cost`, so a
+    thumbnail costs a fraction of a large filter job. The limit, the remaining
+    budget and the charge are attached to the response as `X-RateLimit-*`
+    headers by `RateLimitHeadersMiddleware`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.budget: Budget | None = None
+
+    def allow_request(self, request, view) -> bool:
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        cost = request_cost(request, view)
+        self.budget = get_budget_store().charge(
+            key=self.key, cost=cost, capacity=self.num_requests, refill_rate=self.num_requests / self.duration
+        )
+        request._request.rate_limit = {
+            "limit": self.num_requests,
+            "remaining": self.budget.remaining,
+            "cost": cost,
+        }
+        return self.budget.allowed
+
+    def wait(self) -> float | None:
+        return self.budget.wait if self.budget is not None else None
+
+
+class AnonCostRateThrottle(CostRateThrottle):
+    """Charge anonymous requests against their client address; the rate is `anon_cost`."""
+    scope = "anon_cost"
+
+    def get_cache_key(self, request, view) -> str | None:
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class UserCostRateThrottle(CostRateThrottle):
+    """Charge authenticated requests against the user; the rate is `user_cost`."""
+    scope = "user_cost"
+
+    def get_cache_key(self, request, view) -> str | None:
+        if not (request.user and request.user.is_authenticated):
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": request.user.pk}
@@ -0,0 +1,256 @@
+import json
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+class Span:
+    """
+    One timed operation within a trace, modelled on the OpenTelemetry span.
+
+    Args:
+        name (str): Operation name, e.g. "transform.resize".
+        trace_id (str): 32 hex digit id shared by every span of the request.
+        parent_id (str, optional): span_id of the enclosing span.
+        attributes (dict, optional): Initial attributes.
+    """
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None = None, attributes: dict | None = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.status = "UNSET"
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def update_name(self, name: str) -> None:
+        self.name = name
+
+    def set_status(self, status: str) -> None:
+        self.status = status
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3) if self.end_ns else None,
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+class NonRecordingSpan(Span):
+    """Span handed out while tracing is disabled; every call is a no-op."""
+
+    def __init__(self):
+        super().__init__(name="", trace_id="0" * 32)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def update_name(self, name: str) -> None:
+        pass
+
+    def set_status(self, status: str) -> None:
+        pass
+
+
+NON_RECORDING_SPAN = NonRecordingSpan()
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class SpanExporter:
+    """Receives every finished span. Subclasses must implement `export`."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Write each finished span as one JSON line to `stream` (stdout by default)."""
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+class FileSpanExporter(SpanExporter):
+    """Append each finished span as one JSON line to `path` (default: BASE_DIR/traces/spans.jsonl)."""
+
+    def __init__(self, path: str | None = None):
+        self.path = Path(path or Path(settings.BASE_DIR) / "traces" / "spans.jsonl")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock, self.path.open("a", encoding="utf-8") as log:
+            log.write(line + "\n")
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keep finished spans in a list; meant for tests."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+EXPORTER_ALIASES: dict[str, type[SpanExporter]] = {
+    "console": ConsoleSpanExporter,
+    "file": FileSpanExporter,
+    "memory": InMemorySpanExporter,
+}
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to `exporter`.
+
+    With no exporter the tracer is disabled and `start_span` yields the shared
+    non-recording span without touching the context, so instrumented code
+    costs next to nothing.
+    """
+
+    def __init__(self, exporter: SpanExporter | None = None):
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def start_span(
+            self,
+            name: str,
+            attributes: dict | None = None,
+            trace_id: str | None = None,
+            parent_id: str | None = None,
+    ) -> Iterator[Span]:
+        """
+        Open a child of the current span (or a new root) for the body of the `with` block.
+
+        Args:
+            name (str): Operation name.
+            attributes (dict, optional): Initial span attributes.
+            trace_id (str, optional): Continue this trace instead of the current one.
+            parent_id (str, optional): Remote parent span id, used with `trace_id`.
+
+        Yields:
+            Span: The open span. An exception escaping the block marks it "ERROR".
+        """
+        if self.exporter is None:
+            yield NON_RECORDING_SPAN
+            return
+
+        parent = _current_span.get()
+        if trace_id is None:
+            trace_id = parent.trace_id if parent else secrets.token_hex(16)
+            parent_id = parent.span_id if parent else None
+        span = Span(name, trace_id=trace_id, parent_id=parent_id, attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.set_status("ERROR")
+            span.set_attribute("exception.type", type(exc).__name__)
+            span.set_attribute("exception.message", str(exc))
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            self.exporter.export(span)
+
+
+def current_span() -> Span:
+    """Return the innermost open span, or the non-recording span outside any trace."""
+    return _current_span.get() or NON_RECORDING_SPAN
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str] | None:
+    """
+    Parse a W3C `traceparent` header.
+
+    Returns:
+        tuple[str, str] | None: (trace_id, parent span_id), or None if absent or malformed.
+    """
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    trace_id, parent_id = parts[1].lower(), parts[2].lower()
+    try:
+        int(trace_id, 16), int(parent_id, 16)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id
+
+
+def build_exporter(path: str, options: dict) -> SpanExporter:
+    """Instantiate the exporter named by an alias ("console", "file", "memory") or a dotted path."""
+    exporter_class = EXPORTER_ALIASES.get(path) or import_string(path)
+    return exporter_class(**options)
+
+
+@lru_cache(maxsize=None)
+def get_tracer() -> Tracer:
+    """
+    Return the process-wide tracer configured by `settings.IMAGE_TRACING`.
+
+    `EXPORTER` is an alias or dotted path (empty disables tracing) and
+    `OPTIONS` are passed to its constructor.
+    """
+    options = getattr(settings, "IMAGE_TRACING", {})
+    exporter_path = options.get("EXPORTER")
+    if not exporter_path:
+        return Tracer()
+    return Tracer(build_exporter(exporter_path, options.get("OPTIONS", {})))
+
+
+@receiver(setting_changed)
+def reset_tracer(setting, **kwargs) -> None:
+    if setting == "IMAGE_TRACING":
+        get_tracer.cache_clear()
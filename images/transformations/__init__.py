@@ -1,14 +1,14 @@
-import importlib
-import pkgutil
 from pathlib import Path
 
 __path__.append(str(Path(__file__).parent / "transform_classes"))
 
-# Dynamically import every module in this package
-for finder, name, ispkg in pkgutil.iter_modules(__path__, __name__ + "."):
-    importlib.import_module(name)
+from .registry import LazyTransformMap, import_all, get_transform_map, load_manifest
 
-
-from .registry import get_transform_map
-
-TRANSFORM_MAP = get_transform_map()
+# Transform modules are imported on first use, as listed in the generated manifest;
+# without one, every module in this package is imported now.
+_manifest = load_manifest()
+if _manifest is not None:
+    TRANSFORM_MAP = LazyTransformMap(_manifest)
+else:
+    import_all(__path__, __name__)
+    TRANSFORM_MAP = get_transform_map()
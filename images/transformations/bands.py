@@ -0,0 +1,183 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, TypeVar
+
+from PIL import Image, ImageFilter
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Below this many pixels a single call is faster than splitting and stitching.
+MIN_PARALLEL_PIXELS = 1 << 20
+
+# Bands shorter than this cost more in halo rows and task overhead than they save.
+MIN_BAND_ROWS = 64
+
+# Modes whose bands can be stitched with a plain paste (no palette or bit packing).
+BAND_MODES = frozenset({"L", "LA", "La", "RGB", "RGBA", "RGBa", "RGBX", "CMYK", "YCbCr", "LAB", "HSV", "I", "F"})
+
+# Modes a banded resize reproduces exactly. Pillow resamples 32-bit modes with
+# floating-point weights that shift with the box offset, so those differ in the
+# last bits and are resized in one call.
+RESIZE_BAND_MODES = BAND_MODES - {"I", "F"}
+
+
+class BandPool:
+    """
+    A thread pool that runs one Pillow call per horizontal band of an image.
+
+    Pillow releases the GIL inside filters and resampling, so bands of one
+    image are processed on as many cores as the pool has workers.
+    """
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-band")
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> list[R]:
+        return list(self.executor.map(fn, items))
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "BandPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+
+def split_rows(height: int, bands: int, step: int = 1) -> list[tuple[int, int]]:
+    """
+    Split `height` rows into at most `bands` contiguous [start, stop) ranges.
+
+    Every boundary is a multiple of `step`; the ranges are as even as that allows.
+    """
+    units = math.ceil(height / step)
+    bands = max(1, min(bands, units))
+    edges = [min(height, (units * i // bands) * step) for i in range(bands + 1)]
+    return [(start, stop) for start, stop in zip(edges, edges[1:]) if stop > start]
+
+
+def band_count(
+        pool: BandPool | None,
+        image: Image.Image,
+        rows: int,
+        modes: frozenset[str] = BAND_MODES,
+) -> int:
+    """Return how many bands `rows` output rows of `image` should be split into; 1 means don't split."""
+    if pool is None or pool.workers < 2 or image.mode not in modes:
+        return 1
+    if image.width * image.height < MIN_PARALLEL_PIXELS:
+        return 1
+    return max(1, min(pool.workers, rows // MIN_BAND_ROWS))
+
+
+def stitch(parts: list[Image.Image], starts: list[int], size: tuple[int, int]) -> Image.Image:
+    """Paste `parts` at their starting rows into one image carrying the first part's info."""
+    out = Image.new(parts[0].mode, size)
+    for part, top in zip(parts, starts):
+        out.paste(part, (0, top))
+    out.info = parts[0].info.copy()
+    return out
+
+
+def filter_halo(image_filter: ImageFilter.Filter) -> int:
+    """
+    Return how many rows beyond a band `image_filter` reads to compute it.
+
+    Kernels read half their height; rank filters half their window; the
+    Gaussian, box and unsharp-mask blurs run up to three box passes that each
+    reach one row past their integer radius. Filter classes, which
+    `Image.filter` instantiates with their defaults, are accepted too.
+    """
+    if isinstance(image_filter, type):
+        image_filter = image_filter()
+    if isinstance(image_filter, ImageFilter.BuiltinFilter | ImageFilter.Kernel):
+        return image_filter.filterargs[0][1] // 2
+    if isinstance(image_filter, ImageFilter.RankFilter):
+        return image_filter.size // 2
+    if isinstance(image_filter, ImageFilter.GaussianBlur | ImageFilter.BoxBlur | ImageFilter.UnsharpMask):
+        radius = image_filter.radius
+        radius = max(radius) if isinstance(radius, (tuple, list)) else radius
+        return 3 * (math.ceil(radius) + 1)
+    raise TypeError(f"No halo is known for {type(image_filter).__name__}")
+
+
+def filter_in_bands(
+        image: Image.Image,
+        filters: list[ImageFilter.Filter],
+        pool: BandPool | None = None,
+) -> Image.Image:
+    """
+    Apply `filters` in sequence, one horizontal band per pool worker.
+
+    Each band is cropped with a halo of the rows the filter chain reads above
+    and below it, filtered, and trimmed back before stitching, so the result is
+    byte-identical to filtering the whole image. Small images, palette and
+    bilevel images, and a missing pool fall back to one call per filter.
+
+    Args:
+        image (Image.Image): The source image.
+        filters (list[ImageFilter.Filter]): Filters to apply in order.
+        pool (BandPool, optional): Defaults to the process-wide band pool.
+    """
+    pool = pool or default_pool()
+    bands = band_count(pool, image, image.height)
+    if bands < 2:
+        for image_filter in filters:
+            image = image.filter(image_filter)
+        return image
+
+    halo = sum(filter_halo(image_filter) for image_filter in filters)
+    ranges = split_rows(image.height, bands)
+
+    def run(rows: tuple[int, int]) -> Image.Image:
+        top, bottom = max(0, rows[0] - halo), min(image.height, rows[1] + halo)
+        band = image.crop((0, top, image.width, bottom))
+        for image_filter in filters:
+            band = band.filter(image_filter)
+        return band.crop((0, rows[0] - top, image.width, rows[1] - top))
+
+    return stitch(pool.map(run, ranges), [start for start, _ in ranges], image.size)
+
+
+def resize_in_bands(
+        image: Image.Image,
+        size: tuple[int, int],
+        pool: BandPool | None = None,
+) -> Image.Image:
+    """
+    Resize `image` to `size`, one band of output rows per pool worker.
+
+    Each band is resampled from the source rows under it through Pillow's
+    `box` argument, which reads the resampling filter's support beyond the box
+    from the full image. Band boundaries fall on output rows that map to whole
+    source rows, so every band sees the same scale as a single call and the
+    result is byte-identical to it; sizes without such rows, and 32-bit
+    integer or float images, are not split.
+
+    Args:
+        image (Image.Image): The source image.
+        size (tuple[int, int]): Target (width, height).
+        pool (BandPool, optional): Defaults to the process-wide band pool.
+    """
+    pool = pool or default_pool()
+    width, height = size
+    step = height // math.gcd(height, image.height) if height else 1
+    bands = band_count(pool, image, height, RESIZE_BAND_MODES)
+    ranges = split_rows(height, bands, step) if bands > 1 and size != image.size else []
+    if len(ranges) < 2:
+        return image.resize(size)
+
+    def run(rows: tuple[int, int]) -> Image.Image:
+        box = (0, rows[0] * image.height // height, image.width, rows[1] * image.height // height)
+        return image.resize((width, rows[1] - rows[0]), box=box)
+
+    return stitch(pool.map(run, ranges), [start for start, _ in ranges], size)
+
+
+def default_pool() -> BandPool | None:
+    """Return the pool configured by `settings.IMAGE_EXECUTOR["BAND_WORKERS"]`, if any."""
+    from images.executor import get_band_pool
+
+    return get_band_pool()
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+
+from PIL import Image
+
+# A 3×4 row-major matrix: output channel i = m[4i]·R + m[4i+1]·G + m[4i+2]·B + m[4i+3].
+ColorMatrixArgs = tuple[float, ...]
+
+# ITU-R 601-2 luma weights, as used by Pillow's RGB → L conversion.
+LUMA: tuple[float, float, float] = (0.299, 0.587, 0.114)
+
+IDENTITY: ColorMatrixArgs = (1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+
+# Modes a fused run may start from: `Image.convert(matrix=...)` reads RGB triples only.
+COLOR_MATRIX_MODES = frozenset({"RGB"})
+
+
+@dataclass(frozen=True)
+class ColorMatrix:
+    """
+    A per-pixel linear color step as a 3×4 matrix over RGB.
+
+    Grayscale images are treated as RGB with three equal channels, so steps
+    after a grayscale conversion compose like any other; the fused run then
+    keeps only the first row and converts straight to L.
+
+    Attributes:
+        matrix: The step's coefficients, see `ColorMatrixArgs`.
+        mode: The mode the step outputs, "RGB" or "L".
+    """
+    matrix: ColorMatrixArgs = IDENTITY
+    mode: str = "RGB"
+
+    def then(self, other: "ColorMatrix") -> "ColorMatrix":
+        """Return this step followed by `other` as one matrix."""
+        a, b = self.matrix, other.matrix
+        matrix = []
+        for row in range(3):
+            weights = b[4 * row:4 * row + 3]
+            for column in range(4):
+                matrix.append(sum(weights[k] * a[4 * k + column] for k in range(3)))
+            matrix[-1] += b[4 * row + 3]
+        return ColorMatrix(tuple(matrix), "L" if "L" in (self.mode, other.mode) else "RGB")
+
+    def in_range(self) -> bool:
+        """
+        Return whether every output channel stays within 0–255 for any 8-bit input.
+
+        Separate steps clip each result to 8 bits, so a composed matrix only
+        matches them when nothing before its last step can leave that range.
+        """
+        for row in range(3):
+            *weights, offset = self.matrix[4 * row:4 * row + 4]
+            low = offset + 255 * sum(min(weight, 0.0) for weight in weights)
+            high = offset + 255 * sum(max(weight, 0.0) for weight in weights)
+            if low < -1e-9 or high > 255 + 1e-9:
+                return False
+        return True
+
+
+def scale(factor: float) -> ColorMatrix:
+    """Return the matrix multiplying every channel by `factor`, as brightness does."""
+    return ColorMatrix((factor, 0.0, 0.0, 0.0, 0.0, factor, 0.0, 0.0, 0.0, 0.0, factor, 0.0))
+
+
+def saturate(factor: float) -> ColorMatrix:
+    """Return the matrix blending each pixel with its luma by `factor`, as `ImageEnhance.Color` does."""
+    matrix = []
+    for row in range(3):
+        matrix.extend((1 - factor) * LUMA[column] + (factor if column == row else 0.0) for column in range(3))
+        matrix.append(0.0)
+    return ColorMatrix(tuple(matrix))
+
+
+def grayscale() -> ColorMatrix:
+    """Return the matrix replacing each pixel by its luma, with an L output."""
+    return ColorMatrix((*LUMA, 0.0) * 3, "L")
+
+
+def invert() -> ColorMatrix:
+    """Return the matrix mapping every channel value v to 255 − v."""
+    return ColorMatrix((-1.0, 0.0, 0.0, 255.0, 0.0, -1.0, 0.0, 255.0, 0.0, 0.0, -1.0, 255.0))
+
+
+def apply_color_matrix(image: Image.Image, color: ColorMatrix) -> Image.Image:
+    """Apply `color` to an RGB image in one `Image.convert` pass."""
+    if color.mode == "L":
+        return image.convert("L", color.matrix[:4])
+    return image.convert("RGB", color.matrix)
@@ -29,6 +29,12 @@ RANK_FILTERS: dict = {
     'MAX': ImageFilter.MaxFilter,
 }
 
+# Morphological operations, as the rank filters they chain.
+MORPHOLOGY_FILTERS: dict = {
+    'OPEN': (ImageFilter.MinFilter, ImageFilter.MaxFilter),
+    'CLOSE': (ImageFilter.MaxFilter, ImageFilter.MinFilter),
+}
+
 MULTIBAND_FILTERS: dict = {
     'UNSHARPMASK': ImageFilter.UnsharpMask,
     'GAUSSIANBLUR': ImageFilter.GaussianBlur,
@@ -0,0 +1,225 @@
+import math
+from dataclasses import dataclass
+from typing import Any
+
+from PIL import Image, ImageColor
+
+Matrix = tuple[float, float, float, float, float, float]
+
+IDENTITY: Matrix = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+
+# A (left, upper, right, lower) pixel box, as taken by `Image.crop`.
+Box = tuple[int, int, int, int]
+
+# Resampling filters, weakest (narrowest support) first.
+FILTER_STRENGTH: tuple[Image.Resampling, ...] = (
+    Image.Resampling.NEAREST, Image.Resampling.BOX, Image.Resampling.BILINEAR,
+    Image.Resampling.HAMMING, Image.Resampling.BICUBIC, Image.Resampling.LANCZOS,
+)
+
+# Filters Image.transform supports; stronger ones are capped at BICUBIC there.
+TRANSFORM_FILTERS = frozenset({Image.Resampling.NEAREST, Image.Resampling.BILINEAR, Image.Resampling.BICUBIC})
+
+# Modes a fused transform resamples like the separate steps would; resize premultiplies
+# alpha and palette/bilevel images are never interpolated, so those are left unfused.
+FUSABLE_MODES = frozenset({"L", "RGB", "RGBX", "CMYK", "YCbCr", "LAB", "HSV", "I", "F"})
+
+# Like Image.resize's reducing_gap: shrink by whole factors first while the
+# affine step would still sample more than this many input pixels per output pixel.
+REDUCING_GAP = 2.0
+
+# How far (in pixels) float error may push a resize box past the image edge.
+BOX_TOLERANCE = 1e-6
+
+
+@dataclass(frozen=True)
+class Geometry:
+    """
+    A geometric step as an affine map from its output canvas back to its input.
+
+    Coordinates are continuous, with pixel (i, j) covering [i, i + 1) × [j, j + 1),
+    as in Pillow's resampling. `matrix` (a, b, c, d, e, f) maps an output point
+    (x, y) to the input point (a·x + b·y + c, d·x + e·y + f).
+
+    Attributes:
+        matrix: The output → input map, as passed to `Image.transform(AFFINE)`.
+        size: The output (width, height).
+        resample: The filter the step samples its input with.
+        fill: The color of output areas that map outside the input, or None
+            if the step exposes none.
+        covers: Whether the output canvas shows the whole input and nothing
+            else. A later step that exposes a fill only fuses after steps
+            that cover, since past a crop the fill must replace pixels the
+            composed map would otherwise read from the original image.
+    """
+    matrix: Matrix
+    size: tuple[int, int]
+    resample: Image.Resampling = Image.Resampling.NEAREST
+    fill: Any = None
+    covers: bool = True
+
+    def then(self, other: "Geometry") -> "Geometry | None":
+        """
+        Return this step followed by `other` as one geometry, or None if they can't be fused.
+        """
+        if other.fill is not None and not self.covers:
+            return None
+        if self.fill is not None and other.fill is not None and self.fill != other.fill:
+            return None
+        a1, b1, c1, d1, e1, f1 = self.matrix
+        a2, b2, c2, d2, e2, f2 = other.matrix
+        matrix = (
+            a1 * a2 + b1 * d2, a1 * b2 + b1 * e2, a1 * c2 + b1 * f2 + c1,
+            d1 * a2 + e1 * d2, d1 * b2 + e1 * e2, d1 * c2 + e1 * f2 + f1,
+        )
+        strength = max(FILTER_STRENGTH.index(step.resample) for step in (self, other))
+        return Geometry(
+            matrix=matrix,
+            size=other.size,
+            resample=FILTER_STRENGTH[strength],
+            fill=self.fill if self.fill is not None else other.fill,
+            covers=self.covers and other.covers,
+        )
+
+
+def cap_filter(resample: Image.Resampling) -> Image.Resampling:
+    """Return `resample`, or BICUBIC for filters `Image.transform` does not support."""
+    return resample if resample in TRANSFORM_FILTERS else Image.Resampling.BICUBIC
+
+
+def translation(dx: float, dy: float, size: tuple[int, int], fill: Any = None) -> Geometry:
+    """A canvas of `size` whose origin sits at (dx, dy) of the input: crops and borders."""
+    return Geometry(matrix=(1.0, 0.0, dx, 0.0, 1.0, dy), size=size, fill=fill, covers=False)
+
+
+def scaling(input_size: tuple[int, int], size: tuple[int, int], resample: Image.Resampling) -> Geometry:
+    """Stretch the whole input onto a canvas of `size`."""
+    return Geometry(
+        matrix=(input_size[0] / size[0], 0.0, 0.0, 0.0, input_size[1] / size[1], 0.0),
+        size=size,
+        resample=resample,
+    )
+
+
+def transposition(method: Image.Transpose, input_size: tuple[int, int]) -> Geometry:
+    """The exact flip or quarter turn `Image.transpose(method)` performs."""
+    w, h = input_size
+    matrices: dict[Image.Transpose, Matrix] = {
+        Image.Transpose.FLIP_LEFT_RIGHT: (-1.0, 0.0, w, 0.0, 1.0, 0.0),
+        Image.Transpose.FLIP_TOP_BOTTOM: (1.0, 0.0, 0.0, 0.0, -1.0, h),
+        Image.Transpose.ROTATE_180: (-1.0, 0.0, w, 0.0, -1.0, h),
+        Image.Transpose.ROTATE_90: (0.0, -1.0, w, 1.0, 0.0, 0.0),
+        Image.Transpose.ROTATE_270: (0.0, 1.0, 0.0, -1.0, 0.0, h),
+        Image.Transpose.TRANSPOSE: (0.0, 1.0, 0.0, 1.0, 0.0, 0.0),
+        Image.Transpose.TRANSVERSE: (0.0, -1.0, w, -1.0, 0.0, h),
+    }
+    sideways = method in (
+        Image.Transpose.ROTATE_90, Image.Transpose.ROTATE_270, Image.Transpose.TRANSPOSE, Image.Transpose.TRANSVERSE,
+    )
+    return Geometry(matrix=matrices[method], size=(h, w) if sideways else (w, h))
+
+
+def rotation(angle: float, expand: bool, input_size: tuple[int, int], fill: Any = None) -> Geometry:
+    """
+    The map `Image.rotate(angle, expand=expand)` uses, including its exact quarter-turn shortcuts.
+    """
+    angle = angle % 360.0
+    w, h = input_size
+    if angle == 0:
+        return Geometry(matrix=IDENTITY, size=input_size)
+    if angle == 180:
+        return transposition(Image.Transpose.ROTATE_180, input_size)
+    if angle in (90, 270) and (expand or w == h):
+        return transposition(Image.Transpose.ROTATE_90 if angle == 90 else Image.Transpose.ROTATE_270, input_size)
+
+    radians = -math.radians(angle)
+    a, b = round(math.cos(radians), 15), round(math.sin(radians), 15)
+    d, e = round(-math.sin(radians), 15), round(math.cos(radians), 15)
+    cx, cy = w / 2.0, h / 2.0
+    c = a * -cx + b * -cy + cx
+    f = d * -cx + e * -cy + cy
+    if expand:
+        corners = [(a * x + b * y + c, d * x + e * y + f) for x, y in ((0, 0), (w, 0), (w, h), (0, h))]
+        nw = math.ceil(max(x for x, _ in corners)) - math.floor(min(x for x, _ in corners))
+        nh = math.ceil(max(y for _, y in corners)) - math.floor(min(y for _, y in corners))
+        dx, dy = -(nw - w) / 2.0, -(nh - h) / 2.0
+        c, f = a * dx + b * dy + c, d * dx + e * dy + f
+        w, h = nw, nh
+    return Geometry(matrix=(a, b, c, d, e, f), size=(w, h), fill=0 if fill is None else fill, covers=False)
+
+
+def grow(box: Box, margin: int, size: tuple[int, int]) -> Box:
+    """Return `box` widened by `margin` pixels on every side, clipped to an image of `size`."""
+    left, upper, right, lower = box
+    return max(0, left - margin), max(0, upper - margin), min(size[0], right + margin), min(size[1], lower + margin)
+
+
+def normalize_fill(fill: Any, mode: str) -> Any:
+    """Resolve a color name to the value Pillow would fill `mode` with, so equal fills compare equal."""
+    return ImageColor.getcolor(fill, mode) if isinstance(fill, str) else fill
+
+
+def resize_box(image: Image.Image, matrix: Matrix, size: tuple[int, int], resample) -> Image.Image | None:
+    """
+    Resample an axis-aligned map with `Image.resize(box=...)`, or return None if it isn't one.
+
+    Flipped axes are resized the right way round and flipped afterwards; maps
+    that read outside `image` (and so need a fill) are left to the affine path.
+    """
+    a, b, c, d, e, f = matrix
+    if b or d or not a or not e:
+        return None
+    left, right = sorted((c, c + a * size[0]))
+    upper, lower = sorted((f, f + e * size[1]))
+    if left < -BOX_TOLERANCE or upper < -BOX_TOLERANCE:
+        return None
+    if right > image.width + BOX_TOLERANCE or lower > image.height + BOX_TOLERANCE:
+        return None
+    box = (max(0.0, left), max(0.0, upper), min(float(image.width), right), min(float(image.height), lower))
+    result = image.resize(size, resample, box=box)
+    if a < 0:
+        result = result.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+    if e < 0:
+        result = result.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+    return result
+
+
+def apply_geometry(image: Image.Image, geometry: Geometry) -> Image.Image:
+    """
+    Resample `image` once through `geometry`.
+
+    Maps made only of crops, scalings, flips and quarter turns go through
+    `Image.resize` with a source box (transposed afterwards for quarter
+    turns), which is separable, antialiased and takes any filter. Anything
+    else is one `Image.transform(AFFINE)`, with the filter capped at BICUBIC; when that shrinks the image by more than
+    `REDUCING_GAP`, the region it reads is first reduced by whole factors (a
+    box average, as `Image.resize` does with `reducing_gap`) so it does not alias.
+    """
+    a, b, c, d, e, f = geometry.matrix
+    width, height = geometry.size
+    result = resize_box(image, geometry.matrix, geometry.size, geometry.resample)
+    if result is not None:
+        return result
+    result = resize_box(image, (b, a, c, e, d, f), (height, width), geometry.resample)
+    if result is not None:
+        return result.transpose(Image.Transpose.TRANSPOSE)
+
+    rx = max(1, int(math.hypot(a, b) / REDUCING_GAP))
+    ry = max(1, int(math.hypot(d, e) / REDUCING_GAP))
+    if rx > 1 or ry > 1:
+        xs, ys = zip(*((a * x + b * y + c, d * x + e * y + f) for x, y in ((0, 0), (width, 0), (width, height), (0, height))))
+        left = max(0, (math.floor(min(xs)) // rx - 2) * rx)
+        upper = max(0, (math.floor(min(ys)) // ry - 2) * ry)
+        right = min(image.width, (math.ceil(max(xs)) // rx + 3) * rx)
+        lower = min(image.height, (math.ceil(max(ys)) // ry + 3) * ry)
+        if right > left and lower > upper:
+            image = image.reduce((rx, ry), box=(left, upper, right, lower))
+            a, b, c = a / rx, b / rx, (c - left) / rx
+            d, e, f = d / ry, e / ry, (f - upper) / ry
+    return image.transform(
+        geometry.size,
+        Image.Transform.AFFINE,
+        data=(a, b, c, d, e, f),
+        resample=cap_filter(geometry.resample),
+        fillcolor=geometry.fill,
+    )
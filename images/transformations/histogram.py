@@ -0,0 +1,144 @@
+import math
+from collections.abc import Sequence
+from typing import Callable
+
+from PIL import Image
+
+# Modes `Image.point` maps band by band through a 256-entry table per band.
+LOOKUP_MODES = frozenset({"L", "RGB"})
+
+# Largest number of pixels a proxy histogram is counted over.
+PROXY_PIXELS = 1 << 20
+
+# A step's table, given a function returning the band histogram of its input.
+TableFn = Callable[[Callable[[], list[int]]], list[int]]
+
+
+def sampled_table(image_mode: str, apply: Callable[[Image.Image], Image.Image]) -> list[int]:
+    """
+    Return the table of a per-band point operation by applying it to every possible value.
+
+    `apply` runs on a 256 × 1 image whose pixel x holds x in every band, so
+    band b of the result is that band's table, exactly as the operation
+    would map a full image.
+    """
+    bands = len(image_mode)
+    ramp = Image.frombytes(image_mode, (256, 1), bytes(value for value in range(256) for _ in range(bands)))
+    data = apply(ramp).tobytes()
+    return [data[value * bands + band] for band in range(bands) for value in range(256)]
+
+
+def autocontrast_table(
+        histogram: list[int],
+        cutoff: float | tuple[float, float] = 0,
+        ignore: int | Sequence[int] | None = None,
+) -> list[int]:
+    """Return the table `ImageOps.autocontrast` builds from `histogram`, band by band."""
+    table = []
+    for layer in range(0, len(histogram), 256):
+        h = histogram[layer:layer + 256]
+        if ignore is not None:
+            for ix in [ignore] if isinstance(ignore, int) else ignore:
+                h[ix] = 0
+        if cutoff:
+            low_cut, high_cut = cutoff if isinstance(cutoff, tuple) else (cutoff, cutoff)
+            n = sum(h)
+            cut = int(n * low_cut // 100)
+            for lo in range(256):
+                if cut > h[lo]:
+                    cut, h[lo] = cut - h[lo], 0
+                else:
+                    h[lo], cut = h[lo] - cut, 0
+                if cut <= 0:
+                    break
+            cut = int(n * high_cut // 100)
+            for hi in range(255, -1, -1):
+                if cut > h[hi]:
+                    cut, h[hi] = cut - h[hi], 0
+                else:
+                    h[hi], cut = h[hi] - cut, 0
+                if cut <= 0:
+                    break
+        lo = next((ix for ix in range(256) if h[ix]), 255)
+        hi = next((ix for ix in range(255, -1, -1) if h[ix]), 0)
+        if hi <= lo:
+            table.extend(range(256))
+            continue
+        scale = 255.0 / (hi - lo)
+        offset = -lo * scale
+        table.extend(min(max(int(ix * scale + offset), 0), 255) for ix in range(256))
+    return table
+
+
+def equalize_table(histogram: list[int]) -> list[int]:
+    """
+    Return the table `ImageOps.equalize` builds from `histogram`, band by band.
+
+    Its last entries can round up to 256; `Image.point` clips them to 255,
+    and so does this table.
+    """
+    table = []
+    for layer in range(0, len(histogram), 256):
+        h = histogram[layer:layer + 256]
+        used = [count for count in h if count]
+        step = (sum(used) - used[-1]) // 255 if len(used) > 1 else 0
+        if not step:
+            table.extend(range(256))
+            continue
+        n = step // 2
+        for count in h:
+            table.append(min(n // step, 255))
+            n += count
+    return table
+
+
+def remap(histogram: list[int], table: list[int]) -> list[int]:
+    """Return the histogram of an image with `histogram` after mapping it through `table`."""
+    out = [0] * len(histogram)
+    for index, count in enumerate(histogram):
+        if count:
+            layer = index - index % 256
+            out[layer + table[index]] += count
+    return out
+
+
+def compose(first: list[int], second: list[int]) -> list[int]:
+    """Return the table equal to mapping through `first` and then `second`."""
+    return [second[index - index % 256 + value] for index, value in enumerate(first)]
+
+
+def proxy_histogram(image: Image.Image) -> list[int]:
+    """
+    Return the histogram of a nearest-neighbour decimation of `image` to at most `PROXY_PIXELS`.
+
+    Only the sampled pixels are read, so this costs a small fraction of a
+    full histogram; the tables built from it approximate the exact ones.
+    """
+    pixels = image.width * image.height
+    if pixels <= PROXY_PIXELS:
+        return image.histogram()
+    factor = math.sqrt(pixels / PROXY_PIXELS)
+    size = (max(1, int(image.width / factor)), max(1, int(image.height / factor)))
+    return image.resize(size, Image.Resampling.NEAREST).histogram()
+
+
+def apply_tables(image: Image.Image, tables: list[TableFn], proxy: bool = False) -> Image.Image:
+    """
+    Apply per-band lookup steps in one `Image.point` pass.
+
+    The histogram of the input is counted at most once (over a decimated
+    view with `proxy`); each later step that needs one gets it remapped
+    through the tables before it, which is exactly the histogram of the
+    image it would have received.
+    """
+    base: list[int] = []
+    composed = list(range(256)) * len(image.getbands())
+
+    def histogram() -> list[int]:
+        if not base:
+            base.extend(proxy_histogram(image) if proxy else image.histogram())
+        return remap(base, composed)
+
+    for table_fn in tables:
+        composed = compose(composed, table_fn(histogram))
+    return image.point(composed)
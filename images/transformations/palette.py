@@ -0,0 +1,31 @@
+from PIL import Image
+
+# Palette color modes whose RGB entries a per-band table can map.
+PALETTE_MODES = frozenset({"RGB", "RGBA"})
+
+
+def palettized(image: Image.Image) -> bool:
+    """Return whether `image` is a palette image with an RGB or RGBA palette."""
+    return image.mode == "P" and image.palette is not None and image.palette.mode in PALETTE_MODES
+
+
+def map_palette(image: Image.Image, table: list[int]) -> Image.Image:
+    """
+    Return a copy of a palette image with every palette color mapped through `table`.
+
+    `table` holds 256 entries per R, G and B band, as `Image.point` takes for
+    RGB images; palette alpha is kept. The pixel indices are copied as they
+    are, so the work is one pass over at most 256 colors, and transparency
+    given by index stays valid.
+    """
+    rawmode = image.palette.mode
+    bands = len(rawmode)
+    entries = image.getpalette(rawmode) or []
+    mapped = [
+        table[(index % bands) * 256 + value] if index % bands < 3 else value
+        for index, value in enumerate(entries)
+    ]
+    out = image.copy()
+    if mapped:
+        out.putpalette(mapped, rawmode)
+    return out
@@ -0,0 +1,119 @@
+from typing import Callable
+
+from PIL import Image, ImageChops, ImageFilter
+
+from images.transformations.bands import BandPool, filter_in_bands
+
+# Window size from which separable passes beat Pillow's rank filter, which
+# ranks all size² pixels of every window (7x faster at 3, 380x at 31 on a
+# 1024x1024 RGB image).
+MIN_SEPARABLE_SIZE = 3
+
+# Largest MEDIAN window accepted. A median still ranks all size² pixels of every
+# window, so its cost per pixel grows with the area (225 at this size).
+MAX_MEDIAN_SIZE = 15
+
+# Modes `ImageChops.darker`/`lighter` compare channel by channel.
+SEPARABLE_MODES = frozenset({"1", "L", "LA", "RGB", "RGBA", "RGBX", "CMYK", "YCbCr", "LAB", "HSV"})
+
+Extreme = Callable[[Image.Image, Image.Image], Image.Image]
+
+
+def extreme_of(image_filter: ImageFilter.Filter) -> Extreme | None:
+    """Return the pixelwise operation a min or max filter reduces its window with, else None."""
+    if isinstance(image_filter, ImageFilter.MinFilter):
+        return ImageChops.darker
+    if isinstance(image_filter, ImageFilter.MaxFilter):
+        return ImageChops.lighter
+    return None
+
+
+def pad_edges(image: Image.Image, margin: int, horizontal: bool) -> Image.Image:
+    """
+    Return `image` extended by `margin` copies of its first and last column (or row).
+
+    The strips are stretched with NEAREST, which copies pixels as they are;
+    interpolating filters premultiply alpha and would change translucent colors.
+    """
+    width, height = image.size
+    if not margin:
+        return image
+
+    def strip(box: tuple[int, int, int, int], size: tuple[int, int]) -> Image.Image:
+        return image.crop(box).resize(size, Image.Resampling.NEAREST)
+
+    if horizontal:
+        out = Image.new(image.mode, (width + 2 * margin, height))
+        out.paste(strip((0, 0, 1, height), (margin, height)), (0, 0))
+        out.paste(strip((width - 1, 0, width, height), (margin, height)), (width + margin, 0))
+        out.paste(image, (margin, 0))
+    else:
+        out = Image.new(image.mode, (width, height + 2 * margin))
+        out.paste(strip((0, 0, width, 1), (width, margin)), (0, 0))
+        out.paste(strip((0, height - 1, width, height), (width, margin)), (0, height + margin))
+        out.paste(image, (0, margin))
+    return out
+
+
+def sliding_extreme(image: Image.Image, size: int, extreme: Extreme, horizontal: bool) -> Image.Image:
+    """
+    Reduce every `size`-pixel run along one axis with `extreme`, edges replicated as Pillow does.
+
+    Runs of 2, 4, 8, … pixels are built by combining two half-length runs
+    (log-doubling), and the final run is the overlap of two power-of-two runs,
+    which `extreme` (being idempotent) allows. That is about 2·log2(size)
+    whole-image operations instead of `size` comparisons per pixel.
+    """
+    margin = size // 2
+    padded = pad_edges(image, margin, horizontal)
+
+    def shifted(run: Image.Image, offset: int, length: int) -> Image.Image:
+        if horizontal:
+            return run.crop((offset, 0, offset + length, run.height))
+        return run.crop((0, offset, run.width, offset + length))
+
+    run, span = padded, 1
+    extent = padded.width if horizontal else padded.height
+    while span * 2 <= size:
+        extent -= span
+        run = extreme(shifted(run, 0, extent), shifted(run, span, extent))
+        span *= 2
+    length = image.width if horizontal else image.height
+    return extreme(shifted(run, 0, length), shifted(run, size - span, length))
+
+
+def separable(image: Image.Image, image_filter: ImageFilter.Filter) -> bool:
+    """Return whether `image_filter` runs faster (and identically) as two `sliding_extreme` passes."""
+    return (
+        extreme_of(image_filter) is not None
+        and image_filter.size >= MIN_SEPARABLE_SIZE
+        and image.mode in SEPARABLE_MODES
+    )
+
+
+def rank_cost(image_filter: ImageFilter.RankFilter) -> float:
+    """Return the work per pixel of `image_filter`: its window area for a median, else its `sliding_extreme` passes."""
+    if extreme_of(image_filter) is None or image_filter.size < MIN_SEPARABLE_SIZE:
+        return float(image_filter.size ** 2)
+    return float(2 * (image_filter.size.bit_length() + 1))
+
+
+def rank_filter(image: Image.Image, filters: list[ImageFilter.RankFilter], pool: BandPool | None = None) -> Image.Image:
+    """
+    Apply rank `filters` in sequence.
+
+    A min or max over a square window is a min or max over rows followed by
+    one over columns, so large ones run as two `sliding_extreme` passes whose
+    cost barely grows with the window. Medians, small windows and modes the
+    pixelwise operations don't support use Pillow's filter, in bands.
+    """
+    for image_filter in filters:
+        if separable(image, image_filter):
+            extreme = extreme_of(image_filter)
+            rows = sliding_extreme(image, image_filter.size, extreme, horizontal=True)
+            result = sliding_extreme(rows, image_filter.size, extreme, horizontal=False)
+            result.info = image.info.copy()
+            image = result
+        else:
+            image = filter_in_bands(image, [image_filter], pool)
+    return image
@@ -1,19 +1,27 @@
+import importlib
+import json
+import pkgutil
+from collections.abc import Iterator, Mapping
+from pathlib import Path
 from typing import Dict
 
 from images.transformations.transform_classes.transformation_abstract import Transformation
 
+MANIFEST_PATH = Path(__file__).with_name("manifest.json")
+
 _registry: Dict[str, Transformation] = {}
 
 
 def register_transform(cls):
     """
-    Class decorator: Instantiates cls, grabs its .key(),
-    and stores the instance in registry dict under that key.
+    Class decorator: Instantiates cls, grabs its .key(), freezes the
+    instance and stores it in registry dict under that key.
     """
     inst = cls()
     key = inst.key()
     if key in _registry:
         raise RuntimeError(f"Duplicate transform key: {key!r}")
+    inst.freeze()
     _registry[key] = inst
     return cls
 
@@ -21,3 +29,63 @@ def register_transform(cls):
 def get_transform_map() -> Dict[str, Transformation]:
     """Return a fresh dict of key → instance."""
     return dict(_registry)
+
+
+def import_all(package_path: list[str], package_name: str) -> None:
+    """Import every module of the transformations package, registering all of its transforms."""
+    for finder, name, ispkg in pkgutil.iter_modules(package_path, package_name + "."):
+        importlib.import_module(name)
+
+
+def build_manifest(package_path: list[str], package_name: str) -> Dict[str, str]:
+    """Import every transform and return the sorted mapping of key → defining module."""
+    import_all(package_path, package_name)
+    return {key: type(_registry[key]).__module__ for key in sorted(_registry)}
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Dict[str, str] | None:
+    """Return the generated manifest, or None if it has not been generated."""
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+
+
+class LazyTransformMap(Mapping):
+    """
+    A read-only key → transform mapping that imports each transform module on first use.
+
+    Keys come from the generated manifest (`manage.py generate_transform_manifest`),
+    so listing or checking keys imports nothing; looking one up imports only
+    the module that defines it. Concurrent first lookups are safe, as Python's
+    import lock lets only one thread execute a module.
+
+    Args:
+        manifest (dict[str, str]): Transform key → defining module.
+    """
+
+    def __init__(self, manifest: Dict[str, str]):
+        self.manifest = manifest
+
+    def __getitem__(self, key: str) -> Transformation:
+        transform = _registry.get(key)
+        if transform is not None:
+            return transform
+        module = self.manifest[key]
+        importlib.import_module(module)
+        try:
+            return _registry[key]
+        except KeyError:
+            raise KeyError(
+                f"{module} did not register {key!r}; run `manage.py generate_transform_manifest`"
+            ) from None
+
+    def __contains__(self, key) -> bool:
+        return key in self.manifest or key in _registry
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.manifest
+        yield from (key for key in list(_registry) if key not in self.manifest)
+
+    def __len__(self) -> int:
+        return len(self.manifest.keys() | _registry.keys())
@@ -2,6 +2,7 @@ from collections.abc import Sequence
 
 from PIL import Image, ImageOps
 
+from images.transformations.histogram import TableFn, autocontrast_table
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 from images.transformations.validators import ConfigValidator
@@ -28,6 +29,10 @@ class AutocontrastImage(Transformation):
         """
         return "autocontrast"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [{"cutoff": 2.0}, {"cutoff": [1.0, 1.0], "preserve_tone": True}]
+
     def apply(self, image: Image.Image, config: dict) -> Image.Image:
         """
         Applies the autocontrast transformation using the provided configuration.
@@ -45,6 +50,23 @@ class AutocontrastImage(Transformation):
         Raises:
             ValueError: If the configuration contains invalid types or values.
         """
+        cutoff, ignore, preserve_tone = self.validate_params(config)
+        return ImageOps.autocontrast(image=image, cutoff=cutoff, ignore=ignore, preserve_tone=preserve_tone)
+
+    def lookup_table(self, mode: str, config: dict) -> TableFn | None:
+        """
+        Return a function building the autocontrast table from the input's histogram.
+
+        With `preserve_tone` the table comes from the luminance histogram,
+        which the band histogram does not determine, so that case is left out.
+        """
+        cutoff, ignore, preserve_tone = self.validate_params(config)
+        if preserve_tone:
+            return None
+        return lambda histogram: autocontrast_table(histogram(), cutoff=cutoff, ignore=ignore)
+
+    def validate_params(self, config: dict) -> tuple[float | tuple[float, float], int | Sequence[int] | None, bool]:
+        """Validate `config` and return its cutoff, ignore and preserve_tone values."""
         validator = ConfigValidator(key=self.key())
         config = validator.validate_dictionary(config_dict=config)
         validator.validate_required_keys(config_dict=config, required=["cutoff"])
@@ -65,8 +87,7 @@ class AutocontrastImage(Transformation):
             value=config.get("preserve_tone"),
             value_name="preserve_tone"
         )
-
-        return ImageOps.autocontrast(image=image, cutoff=cutoff, ignore=ignore, preserve_tone=preserve_tone)
+        return cutoff, ignore, preserve_tone
 
     @staticmethod
     def validate_cutoff(
@@ -108,24 +129,26 @@ class AutocontrastImage(Transformation):
 
     @staticmethod
     def validate_ignore(
-            value: int | Sequence[int],
+            value: int | Sequence[int] | None,
             validator: ConfigValidator,
             value_name: str = "Value"
-    ) -> int | Sequence[int]:
+    ) -> int | Sequence[int] | None:
         """
-        Validates the `ignore` parameter.
+        Validates the optional `ignore` parameter.
 
         Args:
-            value (int or list/tuple of int): The pixel value(s) to ignore.
+            value (int or list/tuple of int, optional): The pixel value(s) to ignore.
             validator (ConfigValidator): Validator instance for checking.
             value_name (str): Descriptive name for the value in error messages.
 
         Returns:
-            int or list/tuple of int: The validated ignore value(s).
+            int or list/tuple of int or None: The validated ignore value(s), or None if omitted.
 
         Raises:
             ValueError: If any value is not an int in the range [0, 255].
         """
+        if value is None:
+            return None
         validator.ensure_type(value=value, types=(int, list, tuple), value_name=value_name)
         if isinstance(value, (tuple, list)):
             for element in value:
@@ -1,5 +1,6 @@
 from PIL import ImageOps, Image
 
+from images.transformations.geometry import Geometry, translation
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 from images.transformations.validators import ConfigValidator
@@ -22,6 +23,10 @@ class CropImageBorder(Transformation):
         """
         return "border_crop"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [16]
+
     def apply(self, image: Image.Image, border: int) -> Image.Image:
         """
         Crop a fixed-width border from all sides of the image.
@@ -37,7 +42,35 @@ class CropImageBorder(Transformation):
             TypeError: If `border` is not an integer.
             ValueError: If `border` is less than 1.
         """
-        validator = ConfigValidator(key=self.key())
-        border: int = validator.validate_number(value=border, value_name="border", allowed_types=(int,))
+        return ImageOps.crop(image=image, border=self.validate_border(border))
 
-        return ImageOps.crop(image=image, border=border)
+    def output_shape(self, size: tuple[int, int], mode: str, border: int) -> tuple[tuple[int, int], str]:
+        """
+        Predict the output size (the border removed from every side); the mode is unchanged.
+
+        Raises:
+            ValueError: If the border leaves no pixels, as `Image.crop` would.
+        """
+        border = self.validate_border(border)
+        width, height = size[0] - 2 * border, size[1] - 2 * border
+        if width < 0 or height < 0:
+            raise ValueError(f"{self.key()} border {border} is larger than half the image size {size}")
+        return (width, height), mode
+
+    def geometry(self, size: tuple[int, int], mode: str, border: int) -> Geometry:
+        """
+        Return the crop as a translation past the border.
+        """
+        output_size, _ = self.output_shape(size, mode, border)
+        return translation(border, border, output_size)
+
+    def validate_border(self, border: int) -> int:
+        """
+        Validate the border width.
+
+        Raises:
+            TypeError: If `border` is not an integer.
+            ValueError: If `border` is less than 1.
+        """
+        validator = ConfigValidator(key=self.key())
+        return validator.validate_number(value=border, value_name="border", allowed_types=(int,))
@@ -24,6 +24,10 @@ class ContainImage(Transformation):
         """
         return "contain"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [{"size": [128, 128]}]
+
     def apply(self, image: Image.Image, config: dict) -> Image.Image:
         """
         Apply “contain” resizing on the provided image.
@@ -37,6 +41,36 @@ class ContainImage(Transformation):
         Returns:
             Image.Image: A new image resized to fit within `size`.
 
+        Raises:
+            TypeError: If `config` is not a dict, if `size` or `method` types are invalid.
+            ValueError: If `size` values are non-positive, or `method` is unsupported.
+        """
+        size, method_key = self.validate_config(config)
+        return ImageOps.contain(image, size=size, method=RESAMPLING_FILTERS[method_key])
+
+    def output_shape(self, size: tuple[int, int], mode: str, config: dict) -> tuple[tuple[int, int], str]:
+        """
+        Predict the output size with the same aspect-ratio rounding as `ImageOps.contain`; the mode is unchanged.
+        """
+        target, _ = self.validate_config(config)
+        width, height = size
+        image_ratio, target_ratio = width / height, target[0] / target[1]
+        if image_ratio > target_ratio:
+            target = (target[0], round(height / width * target[0]))
+        elif image_ratio < target_ratio:
+            target = (round(width / height * target[1]), target[1])
+        return tuple(target), mode
+
+    def validate_config(self, config: dict) -> tuple[tuple[int, int], str]:
+        """
+        Validate the contain configuration.
+
+        Args:
+            config (dict): Must contain "size"; "method" is optional.
+
+        Returns:
+            tuple: The target (width, height) and the resampling filter name.
+
         Raises:
             TypeError: If `config` is not a dict, if `size` or `method` types are invalid.
             ValueError: If `size` values are non-positive, or `method` is unsupported.
@@ -58,6 +92,4 @@ class ContainImage(Transformation):
             value=config.get("method", "BICUBIC"),
             options=list(RESAMPLING_FILTERS.keys())
         )
-
-        resample_filter = RESAMPLING_FILTERS[method_key]
-        return ImageOps.contain(image, size=size, method=resample_filter)
+        return size, method_key
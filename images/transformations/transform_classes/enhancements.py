@@ -1,5 +1,11 @@
-from PIL import Image, ImageEnhance
-
+from PIL import Image, ImageEnhance, ImageFilter
+
+from images.transformations import color
+from images.transformations.bands import filter_halo
+from images.transformations.color import ColorMatrix
+from images.transformations.geometry import Box, grow
+from images.transformations.histogram import TableFn, sampled_table
+from images.transformations.palette import map_palette, palettized
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 from images.transformations.validators import ConfigValidator
@@ -37,6 +43,10 @@ class ImageEnhancer(Transformation):
         """
         return self._key
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [0.5, 1.5]
+
     def apply(self, image: Image.Image, factor: float | int) -> Image.Image:
         """
         Apply the enhancement to the given PIL image.
@@ -54,16 +64,15 @@ class ImageEnhancer(Transformation):
             ValueError: If `enhancement_value` is not an int or float, or if it is
                 negative.
         """
-        validator = ConfigValidator(key=self.key())
-        enhancement_value = validator.validate_number(
-            value=factor,
-            value_name="enhancement_value",
-            min_value=0
-        )
-
+        enhancement_value = self.factor(factor)
         enhancer = self._enhancer_class(image)
         return enhancer.enhance(enhancement_value)
 
+    def factor(self, factor: float | int) -> float | int:
+        """Validate and return the enhancement factor."""
+        validator = ConfigValidator(key=self.key())
+        return validator.validate_number(value=factor, value_name="enhancement_value", min_value=0)
+
 
 @register_transform
 class SharpnessEnhancement(ImageEnhancer):
@@ -75,17 +84,41 @@ class SharpnessEnhancement(ImageEnhancer):
     def __init__(self):
         super().__init__(key_name="sharpness", enhancer_class=ImageEnhance.Sharpness)
 
+    def input_region(self, box: Box, size: tuple[int, int], mode: str, factor: float | int) -> Box:
+        """Return `box` widened by the reach of the smoothing kernel sharpness blends against."""
+        return grow(box, filter_halo(ImageFilter.SMOOTH), size)
+
 
 @register_transform
 class BrightnessEnhancement(ImageEnhancer):
     """
     Adjust brightness of an image.
 
-    Uses PIL.ImageEnhance.Brightness to modify the brightness level.
+    Uses PIL.ImageEnhance.Brightness to modify the brightness level; palette
+    images have their palette scaled instead of their pixels.
     """
+    pointwise = True
+
     def __init__(self):
         super().__init__(key_name="brightness", enhancer_class=ImageEnhance.Brightness)
 
+    def apply(self, image: Image.Image, factor: float | int) -> Image.Image:
+        """Apply the enhancement, to the palette alone for palette images."""
+        if palettized(image):
+            enhancement_value = self.factor(factor)
+            table = sampled_table("RGB", lambda ramp: ImageEnhance.Brightness(ramp).enhance(enhancement_value))
+            return map_palette(image, table)
+        return super().apply(image, factor)
+
+    def color_matrix(self, mode: str, factor: float | int) -> ColorMatrix:
+        """Return the matrix scaling every channel by `factor`."""
+        return color.scale(self.factor(factor))
+
+    def lookup_table(self, mode: str, factor: float | int) -> TableFn:
+        """Return the table scaling each value by `factor`."""
+        table = sampled_table(mode, lambda ramp: self.apply(ramp, factor))
+        return lambda histogram: table
+
 
 @register_transform
 class ContrastEnhancement(ImageEnhancer):
@@ -105,5 +138,11 @@ class ColorEnhancement(ImageEnhancer):
 
     Uses PIL.ImageEnhance.Color to adjust color balance and intensity.
     """
+    pointwise = True
+
     def __init__(self):
         super().__init__(key_name="color", enhancer_class=ImageEnhance.Color)
+
+    def color_matrix(self, mode: str, factor: float | int) -> ColorMatrix:
+        """Return the matrix blending each pixel with its luma by `factor`."""
+        return color.saturate(self.factor(factor))
@@ -1,5 +1,6 @@
 from PIL import Image, ImageOps
 
+from images.transformations.histogram import TableFn, equalize_table
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 
@@ -43,3 +44,9 @@ class EqualizeImage(Transformation):
         if params not in (None, {}, []):
             raise TypeError(f"{self.key()} does not accept parameters; got: {params!r}")
         return ImageOps.equalize(image)
+
+    def lookup_table(self, mode: str, params=None) -> TableFn:
+        """Return a function building the equalizing table from the input's histogram."""
+        if params not in (None, {}, []):
+            raise TypeError(f"{self.key()} does not accept parameters; got: {params!r}")
+        return lambda histogram: equalize_table(histogram())
@@ -1,5 +1,6 @@
 from PIL import Image, ImageOps
 
+from images.transformations.geometry import Geometry, normalize_fill, translation
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 from images.transformations.validators import ConfigValidator
@@ -25,6 +26,10 @@ class ExpandImage(Transformation):
         """
         return "expand"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [{"border": 16, "fill": 128}]
+
     def apply(self, image: Image.Image, config: dict) -> Image.Image:
         """
         Apply border expansion to the provided image.
@@ -38,6 +43,40 @@ class ExpandImage(Transformation):
         Returns:
             Image.Image: A new image with the specified border.
 
+        Raises:
+            TypeError: If `config` is not a dict, or types of `border`/`fill` are incorrect.
+            ValueError: If `border` values are negative, or tuple length is not 4.
+        """
+        border, fill = self.validate_config(config)
+        return ImageOps.expand(image, border=border, fill=fill)
+
+    def output_shape(self, size: tuple[int, int], mode: str, config: dict) -> tuple[tuple[int, int], str]:
+        """
+        Predict the output size (the input grown by the border); the mode is unchanged.
+        """
+        border, _ = self.validate_config(config)
+        left, top, right, bottom = (border,) * 4 if isinstance(border, int) else border
+        return (left + size[0] + right, top + size[1] + bottom), mode
+
+    def geometry(self, size: tuple[int, int], mode: str, config: dict) -> Geometry:
+        """
+        Return the border as a translation onto a larger canvas filled with `fill`.
+        """
+        border, fill = self.validate_config(config)
+        left, top, _, _ = (border,) * 4 if isinstance(border, int) else border
+        output_size, _ = self.output_shape(size, mode, config)
+        return translation(-left, -top, output_size, fill=normalize_fill(fill, mode))
+
+    def validate_config(self, config: dict) -> tuple[int | tuple[int, ...], str | int | tuple[int, ...]]:
+        """
+        Validate the expand configuration and return its border and fill.
+
+        Args:
+            config (dict): Must contain "border"; "fill" is optional.
+
+        Returns:
+            tuple: The validated (border, fill).
+
         Raises:
             TypeError: If `config` is not a dict, or types of `border`/`fill` are incorrect.
             ValueError: If `border` values are negative, or tuple length is not 4.
@@ -51,7 +90,7 @@ class ExpandImage(Transformation):
 
         fill: str | int | tuple[int, ...] = validator.validate_color(value=config.get("fill", 0), value_name="fill")
 
-        return ImageOps.expand(image, border=border, fill=fill)
+        return border, fill
 
     @staticmethod
     def validate_border(value: int | tuple[int, ...], validator: ConfigValidator) -> int | tuple[int, ...]:
@@ -1,6 +1,9 @@
-from PIL import Image
+from PIL import Image, ImageFilter
 
-from images.transformations.filters_mapping import BASIC_FILTERS, RANK_FILTERS, MULTIBAND_FILTERS
+from images.transformations.bands import filter_halo, filter_in_bands
+from images.transformations.geometry import Box, grow
+from images.transformations.filters_mapping import BASIC_FILTERS, MORPHOLOGY_FILTERS, RANK_FILTERS, MULTIBAND_FILTERS
+from images.transformations.rank import MAX_MEDIAN_SIZE, rank_cost, rank_filter
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 from images.transformations.validators import ConfigValidator
@@ -26,6 +29,10 @@ class BasicImageFilter(Transformation):
         """
         return "basic_filter"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return ["SHARPEN", ["SMOOTH", "SHARPEN", "DETAIL"]]
+
     def apply(self, image: Image.Image, image_filter: str | list[str]) -> Image.Image:
         """
         Apply one or more PIL basic filters to an image.
@@ -48,6 +55,10 @@ class BasicImageFilter(Transformation):
             ValueError:
                 If any filter name is not one of the supported keys.
         """
+        return filter_in_bands(image, self.filters(image_filter))
+
+    def filters(self, image_filter: str | list[str]) -> list[type[ImageFilter.Filter]]:
+        """Validate `image_filter` and return the PIL filters it names, in order."""
         validator = ConfigValidator(key=self.key())
         filters: list[str] = validator.validate_str(
             value=image_filter,
@@ -55,18 +66,24 @@ class BasicImageFilter(Transformation):
             allowed=list(BASIC_FILTERS.keys()),
             multiple=True
         )
+        return [BASIC_FILTERS[validated_fiter] for validated_fiter in filters]
 
-        for validated_fiter in filters:
-            image = image.filter(BASIC_FILTERS[validated_fiter])
+    def input_region(self, box: Box, size: tuple[int, int], mode: str, image_filter: str | list[str]) -> Box:
+        """Return `box` widened by the pixels each filter's kernel reaches beyond it."""
+        return grow(box, sum(filter_halo(basic_filter) for basic_filter in self.filters(image_filter)), size)
 
-        return image
+    def cost_units(self, size: tuple[int, int], output_size: tuple[int, int], image_filter: str | list[str]) -> float:
+        """Return one pass over the image per listed filter."""
+        passes = len(image_filter) if isinstance(image_filter, list) else 1
+        return float(size[0] * size[1] * passes)
 
 
 @register_transform
 class RankImageFilter(Transformation):
     """
     Transformation that applies a rank-based PIL filter (Min, Max, Median)
-    with a specified window size.
+    with a specified window size, or a morphological opening (Min then Max)
+    or closing (Max then Min) built from them.
     """
     def __init__(self):
         super().__init__()
@@ -80,6 +97,15 @@ class RankImageFilter(Transformation):
         """
         return "rank_filter"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [
+            {"size": 3, "filter_name": "MEDIAN"},
+            {"size": 9, "filter_name": "MAX"},
+            {"size": 31, "filter_name": "MIN"},
+            {"size": 7, "filter_name": "OPEN"},
+        ]
+
     def apply(self, image: Image.Image, config: dict) -> Image.Image:
         """
         Apply a rank filter to the given image using parameters from config.
@@ -87,29 +113,59 @@ class RankImageFilter(Transformation):
         Args:
             image (Image.Image): The source image to transform.
             config (dict): Configuration object containing:
-                - size (int): positive integer window size for the filter.
-                - filter_name (str): name of the rank filter to apply.
+                - size (int): positive odd window size for the filter.
+                - filter_name (str): name of the rank filter or morphological
+                  operation to apply.
 
         Returns:
             Image.Image: The filtered image.
 
         Raises:
-            TypeError: If config is not a dict, if 'size' is not a positive int,
+            TypeError: If config is not a dict, if 'size' is not an int,
                        or if 'filter_name' is not a string.
-            ValueError: If required keys are missing or filter_name is invalid.
+            ValueError: If required keys are missing, 'size' is not a positive
+                        odd number (at most MAX_MEDIAN_SIZE for MEDIAN), or
+                        filter_name is invalid.
         """
+        return rank_filter(image, self.filters(config))
+
+    def filters(self, config: dict) -> list[ImageFilter.RankFilter]:
+        """Validate `config` and return the PIL rank filters it describes, in order."""
         validator = ConfigValidator(key=self.key())
         config = validator.validate_dictionary(config_dict=config)
         validator.validate_required_keys(config_dict=config, required=["size"])
 
-        size: int = validator.validate_number(value=config.get("size"), value_name="size", allowed_types=(int,))
+        size: int = validator.validate_number(
+            value=config.get("size"), value_name="size", allowed_types=(int,), min_value=1
+        )
+        if size % 2 == 0:
+            raise ValueError(validator.error(value_name="size", message=f"must be odd; got {size}"))
 
         method_name: str = validator.validate_choice(
             value=config.get("filter_name"),
-            options=list(RANK_FILTERS.keys()),
+            options=list(RANK_FILTERS.keys()) + list(MORPHOLOGY_FILTERS.keys()),
             value_name="filter_name",
         )
-        return image.filter(RANK_FILTERS[method_name](size=size))
+        if method_name == "MEDIAN" and size > MAX_MEDIAN_SIZE:
+            raise ValueError(validator.error(
+                value_name="size", message=f"must be at most {MAX_MEDIAN_SIZE} for MEDIAN; got {size}"
+            ))
+        if method_name in MORPHOLOGY_FILTERS:
+            return [filter_class(size=size) for filter_class in MORPHOLOGY_FILTERS[method_name]]
+        return [RANK_FILTERS[method_name](size=size)]
+
+    def input_region(self, box: Box, size: tuple[int, int], mode: str, config: dict) -> Box:
+        """Return `box` widened by half the window of each filter applied."""
+        return grow(box, sum(filter_halo(image_filter) for image_filter in self.filters(config)), size)
+
+    def cost_units(self, size: tuple[int, int], output_size: tuple[int, int], config: dict) -> float:
+        """
+        Return pixels times the work per pixel of each filter applied.
+
+        A median ranks all size² neighbours; a min or max runs as separable
+        passes whose count grows with log2(size) (see `rank_cost`).
+        """
+        return float(size[0] * size[1] * sum(rank_cost(image_filter) for image_filter in self.filters(config)))
 
 
 @register_transform
@@ -136,6 +192,10 @@ class MultibandImageFilter(Transformation):
         """
         return "multiband_filter"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [{"radius": 2, "filter_name": "GAUSSIANBLUR"}, {"radius": 2, "filter_name": "UNSHARPMASK"}]
+
     def apply(self, image: Image.Image, config: dict) -> Image.Image:
         """
         Apply a multiband filter to the given image using parameters from config.
@@ -154,6 +214,10 @@ class MultibandImageFilter(Transformation):
                        or if 'filter_name' is not a string.
             ValueError: If required keys are missing or filter_name is invalid.
         """
+        return filter_in_bands(image, [self.filter(config)])
+
+    def filter(self, config: dict) -> ImageFilter.MultibandFilter:
+        """Validate `config` and return the PIL multiband filter it describes."""
         validator = ConfigValidator(key=self.key())
         config = validator.validate_dictionary(config_dict=config)
 
@@ -165,4 +229,8 @@ class MultibandImageFilter(Transformation):
             value_name="filter_name"
         )
 
-        return image.filter(MULTIBAND_FILTERS[method_name](radius=radius))
+        return MULTIBAND_FILTERS[method_name](radius=radius)
+
+    def input_region(self, box: Box, size: tuple[int, int], mode: str, config: dict) -> Box:
+        """Return `box` widened by the reach of the filter's blur passes."""
+        return grow(box, filter_halo(self.filter(config)), size)
@@ -1,5 +1,6 @@
 from PIL import Image, ImageOps
 
+from images.transformations.geometry import Geometry, transposition
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 
@@ -42,3 +43,11 @@ class FlipImage(Transformation):
         if params not in (None, {}, []):
             raise TypeError(f"{self.key()} does not accept parameters; got: {params!r}")
         return ImageOps.flip(image)
+
+    def geometry(self, size: tuple[int, int], mode: str, params=None) -> Geometry:
+        """
+        Return the vertical flip as an exact reflection.
+        """
+        if params not in (None, {}, []):
+            raise TypeError(f"{self.key()} does not accept parameters; got: {params!r}")
+        return transposition(Image.Transpose.FLIP_TOP_BOTTOM, size)
@@ -13,6 +13,8 @@ class ConvertImageFormat(Transformation):
 
     Uses FORMAT_CHOICES from the models to validate allowed output formats.
     """
+    pointwise = True
+
     def __init__(self):
         super().__init__()
 
@@ -25,6 +27,10 @@ class ConvertImageFormat(Transformation):
         """
         return "format"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return ["PNG", "JPEG"]
+
     def apply(self, image: Image.Image, new_format: str) -> Image.Image:
         """
         Convert the input image to a specified format.
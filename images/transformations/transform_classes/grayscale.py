@@ -1,5 +1,7 @@
 from PIL import Image, ImageOps
 
+from images.transformations import color
+from images.transformations.color import ColorMatrix
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 
@@ -13,6 +15,8 @@ class GrayscaleImage(Transformation):
     luminance equivalent, discarding color information. No parameters
     are required.
     """
+    pointwise = True
+
     def __init__(self):
         super().__init__()
 
@@ -43,3 +47,9 @@ class GrayscaleImage(Transformation):
         if params not in (None, {}, []):
             raise TypeError(f"{self.key()} does not accept parameters; got: {params!r}")
         return ImageOps.grayscale(image)
+
+    def color_matrix(self, mode: str, params=None) -> ColorMatrix:
+        """Return the luma projection, with an L output."""
+        if params not in (None, {}, []):
+            raise TypeError(f"{self.key()} does not accept parameters; got: {params!r}")
+        return color.grayscale()
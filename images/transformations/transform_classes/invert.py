@@ -1,5 +1,9 @@
 from PIL import Image, ImageOps
 
+from images.transformations import color
+from images.transformations.color import ColorMatrix
+from images.transformations.histogram import TableFn, sampled_table
+from images.transformations.palette import map_palette, palettized
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 
@@ -10,8 +14,11 @@ class InvertImage(Transformation):
     Invert an image’s colors.
 
     This transform produces a photographic negative by mapping each pixel
-    value to 255 − original. Only works on “L”, “RGB”, or multi-band images.
+    value to 255 − original. Only works on “L”, “RGB”, or multi-band images,
+    and on palette images, whose palette is inverted instead of their pixels.
     """
+    pointwise = True
+
     def __init__(self):
         super().__init__()
 
@@ -41,4 +48,17 @@ class InvertImage(Transformation):
         """
         if params not in (None, {}, []):
             raise TypeError(f"{self.key()} does not accept parameters; got: {params!r}")
+        if palettized(image):
+            return map_palette(image, sampled_table("RGB", ImageOps.invert))
         return ImageOps.invert(image)
+
+    def color_matrix(self, mode: str, params=None) -> ColorMatrix:
+        """Return the matrix mapping each channel value v to 255 − v."""
+        if params not in (None, {}, []):
+            raise TypeError(f"{self.key()} does not accept parameters; got: {params!r}")
+        return color.invert()
+
+    def lookup_table(self, mode: str, params=None) -> TableFn:
+        """Return the table mapping each value v to 255 − v."""
+        table = sampled_table(mode, lambda ramp: self.apply(ramp, params))
+        return lambda histogram: table
@@ -1,5 +1,6 @@
 from PIL import Image, ImageOps
 
+from images.transformations.geometry import Geometry, transposition
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 
@@ -42,3 +43,11 @@ class MirrorImage(Transformation):
         if params not in (None, {}, []):
             raise TypeError(f"{self.key()} does not accept parameters; got: {params!r}")
         return ImageOps.mirror(image)
+
+    def geometry(self, size: tuple[int, int], mode: str, params=None) -> Geometry:
+        """
+        Return the horizontal mirror as an exact reflection.
+        """
+        if params not in (None, {}, []):
+            raise TypeError(f"{self.key()} does not accept parameters; got: {params!r}")
+        return transposition(Image.Transpose.FLIP_LEFT_RIGHT, size)
@@ -27,6 +27,10 @@ class PadImage(Transformation):
         """
         return "pad"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [{"size": [300, 200], "color": 255}]
+
     def apply(self, image: Image.Image, config: dict) -> Image.Image:
         """
         Apply padding or cropping to the provided image.
@@ -43,6 +47,36 @@ class PadImage(Transformation):
         Returns:
             Image.Image: A new image of size `size`.
 
+        Raises:
+            TypeError: If `config` is not a dict or contains wrong types.
+            ValueError: If numeric values are out of allowed ranges.
+        """
+        size, resample_filter, color, centering = self.validate_config(config)
+
+        return ImageOps.pad(
+            image,
+            size=size,
+            method=resample_filter,
+            color=color,
+            centering=centering
+        )
+
+    def output_shape(self, size: tuple[int, int], mode: str, config: dict) -> tuple[tuple[int, int], str]:
+        """
+        Return the requested size; the mode is unchanged.
+        """
+        return tuple(self.validate_config(config)[0]), mode
+
+    def validate_config(self, config: dict) -> tuple:
+        """
+        Validate the pad configuration.
+
+        Args:
+            config (dict): Must contain "size"; "method", "color" and "centering" are optional.
+
+        Returns:
+            tuple: The validated (size, resample filter, color, centering).
+
         Raises:
             TypeError: If `config` is not a dict or contains wrong types.
             ValueError: If numeric values are out of allowed ranges.
@@ -77,13 +111,7 @@ class PadImage(Transformation):
             value_name="centering"
         )
 
-        return ImageOps.pad(
-            image,
-            size=size,
-            method=resample_filter,
-            color=color,
-            centering=centering
-        )
+        return size, resample_filter, color, centering
 
     @staticmethod
     def validate_centering(
@@ -1,5 +1,7 @@
 from PIL import Image, ImageOps
 
+from images.transformations.histogram import TableFn, sampled_table
+from images.transformations.palette import map_palette, palettized
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 from images.transformations.validators import ConfigValidator
@@ -12,8 +14,11 @@ class PosterizeImage(Transformation):
 
     Posterization limits the number of color levels by keeping only the most significant
     `bits` for each channel. For example, `bits=4` reduces each channel from 8 bits to 4 bits,
-    resulting in 16 discrete levels per channel.
+    resulting in 16 discrete levels per channel. Palette images have their
+    palette posterized instead of their pixels.
     """
+    pointwise = True
+
     def __init__(self):
         super().__init__()
 
@@ -26,6 +31,10 @@ class PosterizeImage(Transformation):
         """
         return "posterize"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [4]
+
     def apply(self, image: Image.Image, bits: int) -> Image.Image:
         """
         Apply posterization to the provided image.
@@ -44,4 +53,11 @@ class PosterizeImage(Transformation):
         validator = ConfigValidator(key=self.key())
         bits: int = validator.validate_number(value=bits, value_name="bits", allowed_types=(int,), max_value=8)
 
+        if palettized(image):
+            return map_palette(image, sampled_table("RGB", lambda ramp: ImageOps.posterize(image=ramp, bits=bits)))
         return ImageOps.posterize(image=image, bits=bits)
+
+    def lookup_table(self, mode: str, bits: int) -> TableFn:
+        """Return the table keeping the top `bits` bits of each value."""
+        table = sampled_table(mode, lambda ramp: self.apply(ramp, bits))
+        return lambda histogram: table
@@ -1,5 +1,6 @@
 from PIL import Image
 
+from images.transformations.geometry import Geometry, translation
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 from images.transformations.validators import ConfigValidator
@@ -24,6 +25,10 @@ class CropImageRegion(Transformation):
         """
         return "region_crop"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [{"left": 8, "upper": 8, "right": 120, "lower": 72}]
+
     def apply(self, image: Image.Image, config: dict) -> Image.Image:
         """
         Crop the input image according to the given configuration.
@@ -44,16 +49,49 @@ class CropImageRegion(Transformation):
             ValueError: If any coordinate cannot be converted to an integer,
                         or if the resulting box is invalid or out of bounds.
         """
+        return image.crop(box=self.crop_box(config=config, size=image.size))
+
+    def output_shape(self, size: tuple[int, int], mode: str, config: dict) -> tuple[tuple[int, int], str]:
+        """
+        Predict the output size (the crop box's); the mode is unchanged.
+        """
+        left, upper, right, lower = self.crop_box(config=config, size=size)
+        return (right - left, lower - upper), mode
+
+    def geometry(self, size: tuple[int, int], mode: str, config: dict) -> Geometry:
+        """
+        Return the crop as a translation to the box's corner.
+        """
+        left, upper, right, lower = self.crop_box(config=config, size=size)
+        return translation(left, upper, (right - left, lower - upper))
+
+    def crop_box(self, config: dict, size: tuple[int, int]) -> tuple[int, int, int, int]:
+        """
+        Resolve and validate the crop box for an image of `size`.
+
+        Missing coordinates default to the image edges.
+
+        Args:
+            config (dict): Dictionary with optional "left", "upper", "right", "lower".
+            size (tuple[int, int]): The image (width, height).
+
+        Returns:
+            tuple[int, int, int, int]: The validated (left, upper, right, lower).
+
+        Raises:
+            TypeError: If config is not a dictionary.
+            ValueError: If the resulting box is invalid or out of bounds.
+        """
         validator = ConfigValidator(key=self.key())
         config = validator.validate_dictionary(config_dict=config)
 
-        img_width, img_height = image.size
+        img_width, img_height = size
         left: int = config.get("left", 0)
         right: int = config.get("right", img_width)
         upper: int = config.get("upper", 0)
         lower: int = config.get("lower", img_height)
 
-        left, upper, right, lower = self.validate_crop_box(
+        return self.validate_crop_box(
             left=left,
             upper=upper,
             right=right,
@@ -63,8 +101,6 @@ class CropImageRegion(Transformation):
             validator=validator
         )
 
-        return image.crop(box=(left, upper, right, lower))
-
     @staticmethod
     def validate_crop_box(
         left: int, upper: int, right: int, lower: int,
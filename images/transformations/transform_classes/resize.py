@@ -1,5 +1,7 @@
 from PIL import Image
 
+from images.transformations.bands import resize_in_bands
+from images.transformations.geometry import Geometry, scaling
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 from images.transformations.validators import ConfigValidator
@@ -24,6 +26,10 @@ class ResizeImage(Transformation):
         """
         return "resize"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [{"width": 128, "height": 96}, {"width": 512, "height": 384}]
+
     def apply(self, image: Image.Image, config: dict) -> Image.Image:
         """
         Resize the input image according to the provided configuration.
@@ -37,6 +43,37 @@ class ResizeImage(Transformation):
         Returns:
             Image.Image: The resized image.
 
+        Raises:
+            TypeError: If config is not a dictionary.
+            ValueError: If width or height cannot be converted to an integer.
+        """
+        return resize_in_bands(image, self.validate_size(config))
+
+    def output_shape(self, size: tuple[int, int], mode: str, config: dict) -> tuple[tuple[int, int], str]:
+        """
+        Return the requested (width, height); the mode is unchanged.
+        """
+        return self.validate_size(config), mode
+
+    def geometry(self, size: tuple[int, int], mode: str, config: dict) -> Geometry | None:
+        """
+        Return the resize as a bicubic stretch, or None for sizes `Image.resize` rejects.
+        """
+        width, height = self.validate_size(config)
+        if width <= 0 or height <= 0:
+            return None
+        return scaling(size, (width, height), Image.Resampling.BICUBIC)
+
+    def validate_size(self, config: dict) -> tuple[int, int]:
+        """
+        Validate the resize configuration and return the target size.
+
+        Args:
+            config (dict): Dictionary with "width" and "height" ints.
+
+        Returns:
+            tuple[int, int]: The target (width, height).
+
         Raises:
             TypeError: If config is not a dictionary.
             ValueError: If width or height cannot be converted to an integer.
@@ -54,5 +91,4 @@ class ResizeImage(Transformation):
             value_name="height",
             allowed_types=(int,)
         )
-
-        return image.resize((width, height))
+        return width, height
@@ -1,5 +1,8 @@
-from PIL import Image
+import math
 
+from PIL import Image, ImageColor
+
+from images.transformations.geometry import Geometry, rotation
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 from images.transformations.validators import ConfigValidator
@@ -25,6 +28,10 @@ class RotateImage(Transformation):
         """
         return "rotate"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [{"angle": 30}, {"angle": 45, "expand": True}]
+
     def apply(self, image: Image.Image, config: dict) -> Image.Image:
         """
         Apply a rotation transformation to a PIL Image based on the provided configuration.
@@ -43,6 +50,35 @@ class RotateImage(Transformation):
             TypeError: If config is not a dictionary.
             ValueError: If config is not a dict or contains invalid types for angle, expand, or fillColor.
         """
+        angle, expand, fill_color = self.validate_config(config)
+
+        rotate_args: dict = {"angle": angle, "expand": expand}
+        if fill_color:
+            rotate_args["fillcolor"] = fill_color
+
+        return image.rotate(**rotate_args)
+
+    def geometry(self, size: tuple[int, int], mode: str, config: dict) -> Geometry:
+        """
+        Return the rotation with the matrix, canvas and nearest-neighbour sampling `Image.rotate` uses.
+        """
+        angle, expand, fill_color = self.validate_config(config)
+        return rotation(angle, expand, size, fill=fill_color)
+
+    def validate_config(self, config: dict) -> tuple[int | float, bool, tuple[int, ...] | None]:
+        """
+        Validate the rotate configuration.
+
+        Args:
+            config (dict): Must contain "angle"; "expand" and "fill_color" are optional.
+
+        Returns:
+            tuple: The angle, whether to expand, and the fill color as an RGB tuple (or None).
+
+        Raises:
+            TypeError: If config is not a dictionary.
+            ValueError: If config contains invalid types for angle, expand, or fill_color.
+        """
         validator = ConfigValidator(key=self.key())
         config = validator.validate_dictionary(config_dict=config)
         validator.validate_required_keys(config_dict=config, required=["angle"])
@@ -54,10 +90,26 @@ class RotateImage(Transformation):
             value_name="fill_color",
             optional=True,
         )
+        return angle, expand, ImageColor.getcolor(color=fill_color, mode='RGB') if fill_color else None
 
-        rotate_args: dict = {"angle": angle, "expand": expand}
-        if fill_color:
-            from PIL import ImageColor
-            rotate_args["fillcolor"] = ImageColor.getcolor(color=fill_color, mode='RGB')
+    def output_shape(self, size: tuple[int, int], mode: str, config: dict) -> tuple[tuple[int, int], str]:
+        """
+        Predict the output size and mode.
 
-        return image.rotate(**rotate_args)
+        Without `expand` the size is unchanged; with it, the bounding box of the
+        rotated corners is computed exactly as `Image.rotate` does.
+        """
+        size, mode = super().output_shape(size, mode, config)
+        angle = config["angle"] % 360.0
+        if not config.get("expand") or angle == 0:
+            return size, mode
+
+        width, height = size
+        radians = -math.radians(angle)
+        a, b = round(math.cos(radians), 15), round(math.sin(radians), 15)
+        d, e = -b, a
+        c = a * -width / 2 + b * -height / 2 + width / 2
+        f = d * -width / 2 + e * -height / 2 + height / 2
+        corners = [(a * x + b * y + c, d * x + e * y + f) for x, y in ((0, 0), (width, 0), (width, height), (0, height))]
+        xs, ys = [x for x, _ in corners], [y for _, y in corners]
+        return (math.ceil(max(xs)) - math.floor(min(xs)), math.ceil(max(ys)) - math.floor(min(ys))), mode
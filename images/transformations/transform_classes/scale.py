@@ -25,6 +25,10 @@ class ScaleImage(Transformation):
         """
         return "scale"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [{"factor": 0.5}]
+
     def apply(self, image: Image.Image, config: dict) -> Image.Image:
         """
         Applies the scale transformation to the image.
@@ -38,6 +42,31 @@ class ScaleImage(Transformation):
         Returns:
             Image.Image: Scaled image.
 
+        Raises:
+            TypeError: If inputs are of the wrong type or missing required keys.
+        """
+        factor, resample = self.validate_config(config)
+        return ImageOps.scale(image=image, factor=factor, resample=RESAMPLING_FILTERS[resample])
+
+    def output_shape(self, size: tuple[int, int], mode: str, config: dict) -> tuple[tuple[int, int], str]:
+        """
+        Predict the output size with the same rounding as `ImageOps.scale`; the mode is unchanged.
+        """
+        factor, _ = self.validate_config(config)
+        if factor <= 0:
+            raise ValueError("the factor must be greater than 0")
+        return (round(factor * size[0]), round(factor * size[1])), mode
+
+    def validate_config(self, config: dict) -> tuple[float | int, str]:
+        """
+        Validate the scale configuration.
+
+        Args:
+            config (dict): Must contain "factor"; "resample" is optional.
+
+        Returns:
+            tuple: The scale factor and the resampling filter name.
+
         Raises:
             TypeError: If inputs are of the wrong type or missing required keys.
         """
@@ -51,5 +80,4 @@ class ScaleImage(Transformation):
             value_name="resample",
             options=list(RESAMPLING_FILTERS.keys())
         )
-
-        return ImageOps.scale(image=image, factor=factor, resample=RESAMPLING_FILTERS[resample])
+        return factor, resample
@@ -1,5 +1,7 @@
 from PIL import Image, ImageOps
 
+from images.transformations.histogram import TableFn, sampled_table
+from images.transformations.palette import map_palette, palettized
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 from images.transformations.validators import ConfigValidator
@@ -13,7 +15,11 @@ class SolarizeImage(Transformation):
     Solarization maps each pixel value v to:
         - v,                if v < threshold
         - 255 – v,          if v >= threshold
+
+    Palette images have their palette solarized instead of their pixels.
     """
+    pointwise = True
+
     def __init__(self):
         super().__init__()
 
@@ -26,6 +32,10 @@ class SolarizeImage(Transformation):
         """
         return "solarize"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return [128]
+
     def apply(self, image: Image.Image, threshold: int = 128) -> Image.Image:
         """
         Apply the solarize effect to the provided image.
@@ -49,4 +59,13 @@ class SolarizeImage(Transformation):
             max_value=255
         )
 
+        if palettized(image):
+            return map_palette(
+                image, sampled_table("RGB", lambda ramp: ImageOps.solarize(image=ramp, threshold=threshold))
+            )
         return ImageOps.solarize(image=image, threshold=threshold)
+
+    def lookup_table(self, mode: str, threshold: int = 128) -> TableFn:
+        """Return the table inverting each value at or above `threshold`."""
+        table = sampled_table(mode, lambda ramp: self.apply(ramp, threshold))
+        return lambda histogram: table
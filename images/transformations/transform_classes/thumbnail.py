@@ -1,3 +1,5 @@
+import math
+
 from PIL import Image
 
 from images.transformations.filters_mapping import RESAMPLING_FILTERS
@@ -14,7 +16,27 @@ class ThumbnailImage(Transformation):
     def key(self) -> str:
         return "thumbnail"
 
+    def benchmark_params(self) -> list:
+        return [{"size": [128.0, 128.0]}]
+
     def apply(self, image: Image.Image, config: dict) -> Image.Image:
+        size, resample, reducing_gap = self.validate_config(config)
+
+        # Same result as Image.thumbnail on a loaded image, without resizing the caller's image in place.
+        target = thumbnail_size(image.size, size)
+        if target == image.size:
+            return image
+        return image.resize(target, resample=RESAMPLING_FILTERS[resample], reducing_gap=reducing_gap)
+
+    def output_shape(self, size: tuple[int, int], mode: str, config: dict) -> tuple[tuple[int, int], str]:
+        """
+        Predict the output size with the same rounding as `Image.thumbnail`; the mode is unchanged.
+        """
+        bounds, _, _ = self.validate_config(config)
+        return thumbnail_size(size, bounds), mode
+
+    def validate_config(self, config: dict) -> tuple[tuple[float, float], str, float | None]:
+        """Validate `config` and return the bounding size, the resampling filter name and the reducing gap."""
         validator = ConfigValidator(key=self.key())
         config = validator.validate_dictionary(config_dict=config)
         validator.validate_required_keys(config_dict=config, required=["size"])
@@ -35,7 +57,21 @@ class ThumbnailImage(Transformation):
             value_name="reducing_gap",
             allowed_types=(float,)
         )
+        return size, resample, reducing_gap
+
 
-        image.thumbnail(size=size, resample=RESAMPLING_FILTERS[resample], reducing_gap=reducing_gap)
+def thumbnail_size(size: tuple[int, int], bounds: tuple[float, float]) -> tuple[int, int]:
+    """Return the size Image.thumbnail picks for an image of `size` fitted within `bounds`."""
+    width, height = size
+    max_width, max_height = (math.floor(bound) for bound in bounds)
+    if max_width >= width and max_height >= height:
+        return size
 
-        return image
+    aspect = width / height
+    if max_width / max_height >= aspect:
+        candidates = (math.floor(max_height * aspect), math.ceil(max_height * aspect))
+        max_width = max(min(candidates, key=lambda n: abs(aspect - n / max_height)), 1)
+    else:
+        candidates = (math.floor(max_width / aspect), math.ceil(max_width / aspect))
+        max_height = max(min(candidates, key=lambda n: 0 if n == 0 else abs(aspect - max_width / n)), 1)
+    return max_width, max_height
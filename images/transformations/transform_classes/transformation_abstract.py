@@ -2,6 +2,12 @@ from abc import ABC, abstractmethod
 
 from PIL import Image
 
+from images.transformations.color import ColorMatrix
+from images.transformations.geometry import Box, Geometry
+from images.transformations.histogram import TableFn
+
+PROXY_SIZE: tuple[int, int] = (8, 8)
+
 
 class Transformation(ABC):
     """Base class for image transformations.
@@ -10,9 +16,37 @@ class Transformation(ABC):
     dict, and `.apply()` to perform the actual image operation.
 
     Methods:
-        key:     Return the config key (e.g. "resize", "format", etc.).
-        apply:   Perform the transformation on a PIL Image.
+        key:               Return the config key (e.g. "resize", "format", etc.).
+        apply:             Perform the transformation on a PIL Image.
+        benchmark_params:  Representative params used by the micro-benchmark suite.
+        output_shape:      Predict the output size and mode without touching pixels.
+        cost_units:        The work done by `apply`, in pixels, for the cost model.
+        geometry:          Describe `apply` as an affine resample, for geometric fusion.
+        color_matrix:      Describe `apply` as a linear color matrix, for color fusion.
+        lookup_table:      Describe `apply` as a per-band lookup table, for histogram sharing.
+        input_region:      The part of the input a part of the output depends on, for crop pushdown.
+
+    Registered instances are shared by every thread running a pipeline, so
+    they are frozen once registered: `apply` must keep per-call state in
+    locals, never on `self`, and must not modify the image it receives in place.
+
+    Transforms whose output pixel depends only on the input pixel at the same
+    position, by a mapping that does not depend on the rest of the image, set
+    `pointwise`; the micro-batcher applies them once to a stack of images.
     """
+    pointwise: bool = False
+    _frozen: bool = False
+
+    def __setattr__(self, name: str, value) -> None:
+        if self._frozen:
+            raise AttributeError(
+                f"{type(self).__name__} is shared between threads; keep per-call state out of its attributes"
+            )
+        super().__setattr__(name, value)
+
+    def freeze(self) -> None:
+        """Forbid further attribute assignment; called once the instance is registered."""
+        object.__setattr__(self, "_frozen", True)
 
     @abstractmethod
     def key(self) -> str:
@@ -38,3 +72,140 @@ class Transformation(ABC):
             ValueError: If `params` is invalid (e.g. missing keys, bad types).
         """
         ...
+
+    def benchmark_params(self) -> list:
+        """Return representative `params` values for the micro-benchmark suite.
+
+        Every registered transform is benchmarked with each entry. The default
+        suits transforms that take no parameters; parameterised transforms
+        override it.
+
+        Returns:
+            list: Valid `params` values for `apply`.
+        """
+        return [None]
+
+    def output_shape(self, size: tuple[int, int], mode: str, params) -> tuple[tuple[int, int], str]:
+        """Predict the size and mode `apply` would produce for an image of `size` and `mode`.
+
+        The default applies the transformation to a tiny proxy image of `mode`,
+        which validates `params` and reveals the output mode; it suits
+        transforms that keep the image size. Transforms that change the
+        geometry override it.
+
+        Args:
+            size (tuple[int, int]): Input (width, height).
+            mode (str):             Input PIL mode.
+            params (any):           Configuration parameters for this transform.
+
+        Returns:
+            tuple[tuple[int, int], str]: Output (width, height) and mode.
+
+        Raises:
+            ValueError: If `params` is invalid, as `apply` would raise.
+        """
+        return size, self.apply(Image.new(mode, PROXY_SIZE), params).mode
+
+    def cost_units(self, size: tuple[int, int], output_size: tuple[int, int], params) -> float:
+        """Return the work `apply` does, in pixels, for the cost model.
+
+        The default is the larger of the input and output pixel counts;
+        transforms whose cost also grows with a parameter (e.g. a window
+        size) override it.
+
+        Args:
+            size (tuple[int, int]):        Input (width, height).
+            output_size (tuple[int, int]): Output (width, height).
+            params (any):                  Configuration parameters for this transform.
+
+        Returns:
+            float: Cost units, calibrated to milliseconds by `images.cost_model`.
+        """
+        return float(max(size[0] * size[1], output_size[0] * output_size[1]))
+
+    def geometry(self, size: tuple[int, int], mode: str, params) -> Geometry | None:
+        """Describe `apply` on an image of `size` and `mode` as an affine map, if it is one.
+
+        Geometric transforms (crops, borders, resizes, rotations, flips)
+        override it so that adjacent ones can be fused into a single
+        resample; the default, None, keeps a transform out of fusion.
+
+        Args:
+            size (tuple[int, int]): Input (width, height).
+            mode (str):             Input PIL mode.
+            params (any):           Configuration parameters for this transform.
+
+        Returns:
+            Geometry | None: The output canvas, output → input map, resampling
+                filter and fill color, or None.
+
+        Raises:
+            ValueError, TypeError: If `params` is invalid, as `apply` would raise.
+        """
+        return None
+
+    def color_matrix(self, mode: str, params) -> ColorMatrix | None:
+        """Describe `apply` on an image of `mode` as a 3×4 color matrix, if it is one.
+
+        Per-pixel linear color steps (grayscale, brightness, saturation,
+        inversion) override it so that adjacent ones can be fused into a
+        single `Image.convert` pass; the default, None, keeps a transform out
+        of color fusion.
+
+        Args:
+            mode (str):   Input PIL mode ("RGB", or "L" after a grayscale step).
+            params (any): Configuration parameters for this transform.
+
+        Returns:
+            ColorMatrix | None: The step's matrix and output mode, or None.
+
+        Raises:
+            ValueError, TypeError: If `params` is invalid, as `apply` would raise.
+        """
+        return None
+
+    def lookup_table(self, mode: str, params) -> TableFn | None:
+        """Describe `apply` on an image of `mode` as a per-band lookup table, if it is one.
+
+        Point operations (inversion, posterization, solarization, brightness)
+        and histogram-driven ones (autocontrast, equalize) override it, so
+        that adjacent ones run as one `Image.point` pass that counts the
+        histogram once; the default, None, keeps a transform out of that.
+
+        Args:
+            mode (str):   Input PIL mode, one of `LOOKUP_MODES`.
+            params (any): Configuration parameters for this transform.
+
+        Returns:
+            TableFn | None: A function that, given one returning the band
+                histogram of the step's input, returns the 256-entry-per-band
+                table `apply` would map that input through; or None.
+
+        Raises:
+            ValueError, TypeError: If `params` is invalid, as `apply` would raise.
+        """
+        return None
+
+    def input_region(self, box: Box, size: tuple[int, int], mode: str, params) -> Box | None:
+        """Return the part of the input that the `box` part of the output depends on.
+
+        Running `apply` on just that part must give the same pixels inside
+        `box` as running it on the whole image, so a later crop can be pushed
+        in front of this step. Pointwise transforms read exactly `box`; local
+        filters override it to add the margin their window reaches. The
+        default for everything else, None, means the step needs the whole
+        image (it moves pixels or uses image-wide statistics).
+
+        Args:
+            box (Box):              The needed part of the output, within `size`.
+            size (tuple[int, int]): Input (width, height); the output is the same size.
+            mode (str):             Input PIL mode.
+            params (any):           Configuration parameters for this transform.
+
+        Returns:
+            Box | None: The needed part of the input, or None.
+
+        Raises:
+            ValueError, TypeError: If `params` is invalid, as `apply` would raise.
+        """
+        return box if self.pointwise else None
@@ -1,5 +1,6 @@
 from PIL import Image
 
+from images.transformations.geometry import Geometry, transposition
 from images.transformations.registry import register_transform
 from images.transformations.transform_classes.transformation_abstract import Transformation
 from images.transformations.validators import ConfigValidator
@@ -14,6 +15,8 @@ TRANSPOSE_METHODS = {
     'TRANSVERSE': Image.Transpose.TRANSVERSE,
 }
 
+SIDEWAYS_METHODS = ('ROTATE_90', 'ROTATE_270', 'TRANSPOSE', 'TRANSVERSE')
+
 
 @register_transform
 class TransposeImage(Transformation):
@@ -35,6 +38,10 @@ class TransposeImage(Transformation):
         """
         return "transpose"
 
+    def benchmark_params(self) -> list:
+        """Return representative params for the micro-benchmark suite."""
+        return ["ROTATE_90", "TRANSPOSE"]
+
     def apply(self, image: Image.Image, transpose_method: str) -> Image.Image:
         """
         Apply a transpose transformation to a PIL Image based on the provided configuration.
@@ -60,3 +67,24 @@ class TransposeImage(Transformation):
         )
 
         return image.transpose(TRANSPOSE_METHODS[transpose_method])
+
+    def output_shape(self, size: tuple[int, int], mode: str, transpose_method: str) -> tuple[tuple[int, int], str]:
+        """
+        Predict the output size and mode; width and height swap for the sideways methods.
+        """
+        size, mode = super().output_shape(size, mode, transpose_method)
+        if transpose_method in SIDEWAYS_METHODS:
+            size = (size[1], size[0])
+        return size, mode
+
+    def geometry(self, size: tuple[int, int], mode: str, transpose_method: str) -> Geometry:
+        """
+        Return the flip or quarter turn as an exact affine map.
+        """
+        validator = ConfigValidator(key=self.key())
+        transpose_method = validator.validate_choice(
+            value=transpose_method,
+            value_name="transpose_method",
+            options=list(TRANSPOSE_METHODS.keys())
+        )
+        return transposition(TRANSPOSE_METHODS[transpose_method], size)
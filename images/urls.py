@@ -1,12 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from images.views import ImageViewSet
+from images.views import AsyncImageView, ImageViewSet
 
 router = DefaultRouter()
 
 router.register(prefix='image', viewset=ImageViewSet, basename='image')
 
 urlpatterns = [
+    path('image/async/', AsyncImageView.as_view(), name='image-async'),
     path('', include(router.urls)),
 ]
@@ -1,21 +1,149 @@
+import os
+from io import BytesIO
+
+from asgiref.sync import sync_to_async
+from django.core.files.uploadedfile import UploadedFile
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import viewsets, status
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, Throttled
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
 
+from .admission import get_admission_controller
+from .batching import get_batching
+from .executor import convert_on_pool, get_pipeline_executor, get_worker_pool
+from .instrumentation import StageTimings
+from .metrics import render_metrics
 from .models import ImageConversion
 from .permissions import IsOwner
 from .pipeline import process_image_pipeline
-from .serializers import ImageSerializer, UploadImageSerializer
-from .services import save_conversion, parse_config, save_authenticated, respond_anonymous
+from .planner import explain_pipeline
+from .profiling import PROFILE_NAME_PATTERN, profile_request, profile_storage
+from .scheduler import get_scheduler
+from .serializers import ImageSerializer, UploadImageSerializer, ExplainSerializer
+from .services import (
+    save_conversion, conversion_filename, parse_config, save_authenticated, asave_authenticated, respond_anonymous, config_hash,
+)
+from .tracing import current_span, get_tracer
+from .warmup import warm_up
+
+
+def render_response(response: Response) -> Response:
+    """Render a DRF `Response` as JSON outside an `APIView`, e.g. in a plain async Django view."""
+    response.accepted_renderer = JSONRenderer()
+    response.accepted_media_type = "application/json"
+    response.renderer_context = {}
+    return response.render()
+
+
+def validate_upload(request, timings: StageTimings) -> tuple[UploadedFile, dict] | Response:
+    """
+    Parse the config and verify the uploaded image of a conversion request.
+
+    Returns:
+        tuple: The verified image and the parsed config.
+        Response: 400 describing what was wrong with either.
+    """
+    with timings.stage("parse"):
+        config = parse_config(request)
+    if isinstance(config, Response):
+        return config
+    current_span().set_attribute("image.config_hash", config_hash(config))
+
+    uploaded_file = request.FILES.get("image")
+    with timings.stage("verify"):
+        serializer = UploadImageSerializer(data={"image": uploaded_file})
+        is_valid = serializer.is_valid()
+    if not is_valid:
+        return Response(data=serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    return serializer.validated_data["image"], config
+
+
+def run_conversion(
+        request, image: UploadedFile, config: dict, timings: StageTimings
+) -> tuple[str, BytesIO, str, str] | Response:
+    """
+    Admit, schedule, transform and encode one verified upload.
+
+    Conversions run on the request thread, on the worker pool
+    (`images.executor`) or batched with concurrent same-config requests
+    (`images.batching`), as configured.
+
+    Blocks while the conversion waits for in-flight budget and an execution
+    slot, so async callers run it on the pipeline executor.
+
+    Returns:
+        tuple: The new filename, the encoded buffer, its format and the original format.
+        Response: 400, 413 or 503 from admission, scheduling or the pipeline.
+    """
+    with timings.stage("admission"):
+        admission = get_admission_controller().admit(request, image, config)
+    if isinstance(admission, Response):
+        return admission
+
+    with admission:
+        with timings.stage("queue"):
+            slot = get_scheduler().schedule(request, admission)
+        if isinstance(slot, Response):
+            return slot
+
+        with slot:
+            if get_batching().accepts(admission.plan):
+                stage, convert_upload = "batch", get_batching().convert
+            elif get_worker_pool() is not None:
+                stage, convert_upload = "pool", convert_on_pool
+            else:
+                stage, convert_upload = None, None
+
+            if convert_upload is not None:
+                try:
+                    with timings.stage(stage):
+                        data, new_format, original_format = convert_upload(image, config)
+                except (ValueError, TypeError) as e:
+                    return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+                new_filename, buffer = conversion_filename(image.name, new_format), BytesIO(data)
+            else:
+                try:
+                    processed_image, original_format = process_image_pipeline(image, config, timings=timings)
+                except (ValueError, TypeError) as e:
+                    return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+                with timings.stage("encode"):
+                    new_filename, buffer, new_format = save_conversion(
+                        processed_image, image.name, original_format, config
+                    )
+                del processed_image
+    current_span().set_attribute("image.output_format", new_format)
+    return new_filename, buffer, new_format, original_format
 
 
 class ImageViewSet(viewsets.ModelViewSet):
     queryset = ImageConversion.objects.all()
     serializer_class = ImageSerializer
 
+    def dispatch(self, request, *args, **kwargs):
+        with get_tracer().start_span(type(self).__name__) as span:
+            response = super().dispatch(request, *args, **kwargs)
+            span.update_name(f"{type(self).__name__}.{self.action}")
+            return response
+
+    def perform_authentication(self, request):
+        with get_tracer().start_span("auth") as span:
+            super().perform_authentication(request)
+            span.set_attribute("enduser.authenticated", request.user.is_authenticated)
+
     def get_permissions(self):
-        if self.action == 'create':
+        if self.action in ('create', 'explain'):
             return [AllowAny()]
+        if self.action == 'profile':
+            return [IsAdminUser()]
         return [IsAuthenticated(), IsOwner()]
 
     def list(self, request, *args, **kwargs):
@@ -23,31 +151,171 @@ class ImageViewSet(viewsets.ModelViewSet):
         serializer = ImageSerializer(queryset, many=True)
         return Response(serializer.data)
 
-    def create(self, request, *args, **kwargs):
-        config = parse_config(request)
-        if isinstance(config, Response):
-            return config
-
-        uploaded_file = request.FILES.get("image")
-        serializer = UploadImageSerializer(data={"image": uploaded_file})
+    @action(detail=False, methods=['post'])
+    def explain(self, request, *args, **kwargs):
+        """
+        Return the plan a conversion would run, with predicted sizes and costs, without running it.
+        """
+        serializer = ExplainSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(data=serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        image = serializer.validated_data["image"]
-
+        data = serializer.validated_data
         try:
-            processed_image, original_format = process_image_pipeline(image, config)
-        except (ValueError, TypeError) as e:
+            plan = explain_pipeline(
+                config=data["config"],
+                size=(data["width"], data["height"]),
+                mode=data["mode"],
+                image_format=data["format"],
+            )
+        except (ValueError, TypeError, OSError, NotImplementedError) as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        new_filename, buffer, new_format = save_conversion(processed_image, image.name, original_format, config)
+        return Response(plan)
+
+    @action(detail=False, methods=['get'], url_path=f'profiles/(?P<name>{PROFILE_NAME_PATTERN})')
+    def profile(self, request, name: str, *args, **kwargs):
+        """
+        Download a profile saved by an `X-Profile` request. Staff only.
+        """
+        storage = profile_storage()
+        if not storage.exists(name):
+            raise Http404
+        return FileResponse(storage.open(name, "rb"), as_attachment=True, filename=name)
+
+    def create(self, request, *args, **kwargs):
+        profile_mode = request.headers.get("X-Profile")
+        if profile_mode and request.user.is_staff:
+            return profile_request(request, profile_mode, lambda: self.convert(request))
+        return self.convert(request)
+
+    def convert(self, request):
+        timings = StageTimings()
+
+        upload = validate_upload(request, timings)
+        if isinstance(upload, Response):
+            return timings.attach(upload)
+        image, config = upload
+
+        result = run_conversion(request, image, config, timings)
+        if isinstance(result, Response):
+            return timings.attach(result)
+        new_filename, buffer, new_format, original_format = result
 
         if not request.user.is_authenticated:
-            return respond_anonymous(buffer, new_filename)
-
-        conversion = save_authenticated(
-            user=request.user,
-            buffer=buffer,
-            conversion_format=original_format,
-            filename=new_filename)
-        serializer = self.get_serializer(conversion)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+            response = respond_anonymous(buffer, new_filename)
+        else:
+            with timings.stage("storage"):
+                conversion = save_authenticated(
+                    user=request.user,
+                    buffer=buffer,
+                    conversion_format=original_format,
+                    filename=new_filename)
+            serializer = self.get_serializer(conversion)
+            response = Response(serializer.data, status=status.HTTP_201_CREATED)
+
+        timings.observe(output_format=new_format)
+        return timings.attach(response)
+
+
+class AsyncImageView(View):
+    """
+    `POST /api/image/async/`: the conversion endpoint for ASGI deployments.
+
+    Accepts and answers exactly like `POST /api/image/`, but never blocks the
+    event loop. The ASGI handler awaits the upload body, so slow clients hold
+    no thread; parsing and validation run in worker threads; admission,
+    scheduling, transforms and encode run on the bounded pipeline executor
+    (`images.executor`); and the result is uploaded to storage from a worker
+    thread before its row is inserted with the async ORM. One worker can
+    therefore keep many uploads in flight while CPU work stays capped.
+    """
+    action = "create"
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Authentication is by token, as in every DRF view, so CSRF does not apply.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def post(self, request):
+        with get_tracer().start_span(f"{type(self).__name__}.{self.action}"):
+            return await self.convert(request)
+
+    def initial(self, request: Request) -> None:
+        """Authenticate and throttle `request` as the DRF view would."""
+        with get_tracer().start_span("auth") as span:
+            span.set_attribute("enduser.authenticated", request.user.is_authenticated)
+        for throttle in (throttle_class() for throttle_class in self.throttle_classes):
+            if not throttle.allow_request(request, self):
+                raise Throttled(throttle.wait())
+
+    async def convert(self, django_request):
+        timings = StageTimings()
+        request = Request(
+            django_request,
+            parsers=[MultiPartParser(), FormParser()],
+            authenticators=[authenticator() for authenticator in self.authentication_classes],
+        )
+        try:
+            await sync_to_async(self.initial)(request)
+        except APIException as e:
+            return timings.attach(render_response(exception_handler(e, {"view": self, "request": request})))
+
+        upload = await sync_to_async(validate_upload, thread_sensitive=False)(request, timings)
+        if isinstance(upload, Response):
+            return timings.attach(render_response(upload))
+        image, config = upload
+
+        result = await sync_to_async(run_conversion, thread_sensitive=False, executor=get_pipeline_executor())(
+            request, image, config, timings
+        )
+        if isinstance(result, Response):
+            return timings.attach(render_response(result))
+        new_filename, buffer, new_format, original_format = result
+
+        if not request.user.is_authenticated:
+            response = respond_anonymous(buffer, new_filename)
+        else:
+            with timings.stage("storage"):
+                conversion = await asave_authenticated(
+                    user=request.user,
+                    buffer=buffer,
+                    conversion_format=original_format,
+                    filename=new_filename)
+            serializer = ImageSerializer(conversion, context={"request": request})
+            response = render_response(Response(serializer.data, status=status.HTTP_201_CREATED))
+
+        timings.observe(output_format=new_format)
+        return timings.attach(response)
+
+
+class MetricsView(View):
+    """Expose this process's conversion histograms in the Prometheus text format."""
+
+    def get(self, request):
+        return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+class LivenessView(View):
+    """`/healthz`: the process is up and serving requests."""
+
+    def get(self, request):
+        return JsonResponse({"status": "alive", "pid": os.getpid()})
+
+
+class ReadinessView(View):
+    """
+    `/readyz`: the process has preloaded the registry and primed every codec.
+
+    Pre-fork servers warm up in the master (see `config/gunicorn.py`); elsewhere
+    the first probe runs the warmup. Answers 503 if a codec failed to prime.
+    """
+
+    def get(self, request):
+        warmup = warm_up()
+        ready = warmup["state"] == "ready"
+        return JsonResponse(
+            {"status": "ready" if ready else "not ready", "warmup": warmup},
+            status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+from io import BytesIO
+from typing import Any
+
+from PIL import Image
+
+from .models import FORMAT_CHOICES
+
+WARMUP_SIZE = (8, 8)
+
+_lock = threading.Lock()
+_status: dict[str, Any] = {"state": "pending", "pid": None, "codecs": {}, "errors": {}}
+
+
+def preload() -> None:
+    """
+    Import everything a conversion touches, so a pre-fork server shares it with its workers.
+
+    Imports every transform module (the registry is otherwise lazy), every
+    Pillow codec plugin and the cost model. Called in the gunicorn master after
+    the Django app is loaded.
+    """
+    from .cost_model import get_cost_model
+    from .transformations import TRANSFORM_MAP
+
+    Image.init()
+    get_cost_model()
+    for key in TRANSFORM_MAP:
+        TRANSFORM_MAP[key]
+
+
+def prime_codec(image_format: str) -> float:
+    """Encode and decode a tiny image in `image_format`; return the milliseconds it took."""
+    start = time.perf_counter()
+    buffer = BytesIO()
+    Image.new("RGB", WARMUP_SIZE, color="white").save(buffer, format=image_format)
+    buffer.seek(0)
+    with Image.open(buffer) as image:
+        image.load()
+    return (time.perf_counter() - start) * 1000
+
+
+def warm_up() -> dict[str, Any]:
+    """
+    Preload and prime every output codec once, recording the outcome for `/readyz`.
+
+    Runs once per process (forked workers inherit the master's result);
+    concurrent callers wait for the first one to finish.
+
+    Returns:
+        dict: The warmup status, see `warmup_status`.
+    """
+    with _lock:
+        if _status["state"] != "pending":
+            return warmup_status()
+        _status["state"] = "running"
+        started = time.perf_counter()
+        preload()
+        for image_format, _ in FORMAT_CHOICES:
+            try:
+                _status["codecs"][image_format] = round(prime_codec(image_format), 3)
+            except Exception as e:
+                _status["errors"][image_format] = str(e)
+        _status["pid"] = os.getpid()
+        _status["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        _status["state"] = "failed" if _status["errors"] else "ready"
+        return warmup_status()
+
+
+def warmup_status() -> dict[str, Any]:
+    """
+    Return this process's warmup status.
+
+    Returns:
+        dict: "state" ("pending", "running", "ready" or "failed"), the pid that
+            ran it, the milliseconds each codec took to prime and any errors.
+    """
+    return {**_status, "codecs": dict(_status["codecs"]), "errors": dict(_status["errors"])}
+
+
+def reset_warmup() -> None:
+    """Forget the warmup outcome; meant for tests."""
+    with _lock:
+        _status.update(state="pending", pid=None, codecs={}, errors={})
+        _status.pop("duration_ms", None)
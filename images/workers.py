@@ -0,0 +1,83 @@
+import os
+from io import BytesIO
+
+
+def init_worker(settings_module: str) -> None:
+    """
+    Prepare a pool worker process to run conversions.
+
+    A spawned process starts with nothing imported, so it configures Django
+    (transform modules import the models) and preloads the transform registry
+    and codecs once, instead of on its first conversion. Forked processes
+    inherit both and return almost immediately.
+
+    Args:
+        settings_module (str): The caller's DJANGO_SETTINGS_MODULE.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+    from .warmup import preload
+
+    preload()
+
+
+def convert(data: bytes, config: dict) -> tuple[bytes, str, str]:
+    """
+    Decode, transform and encode one upload inside a pool worker.
+
+    Only the encoded input, the config and the encoded output cross the
+    worker boundary; decoded images never leave the worker.
+
+    Args:
+        data (bytes): The uploaded file's content.
+        config (dict): A validated conversion config.
+
+    Returns:
+        tuple[bytes, str, str]: The encoded output, its format and the original format.
+
+    Raises:
+        ValueError, TypeError: If a transformation rejects its parameters.
+    """
+    from .pipeline import process_image_pipeline
+    from .services import save_conversion
+
+    image, original_format = process_image_pipeline(BytesIO(data), config)
+    _, buffer, new_format = save_conversion(image, "", original_format, config)
+    return buffer.getvalue(), new_format, original_format
+
+
+def convert_batch(data: list[bytes], config: dict) -> list[tuple[bytes, str, str] | Exception]:
+    """
+    Convert several uploads with the same config in one call, as `convert` does each.
+
+    Pointwise transforms run once for all same-shaped images (see
+    `process_batch`); each image is still encoded on its own.
+
+    Args:
+        data (list[bytes]): The uploaded files' content.
+        config (dict): A validated conversion config shared by all of them.
+
+    Returns:
+        list: For each upload, the `convert` result or the exception it raised.
+    """
+    from .pipeline import process_batch
+    from .services import save_conversion
+
+    results: list[tuple[bytes, str, str] | Exception] = []
+    for processed in process_batch([BytesIO(item) for item in data], config):
+        if isinstance(processed, Exception):
+            results.append(processed)
+            continue
+        image, original_format = processed
+        try:
+            _, buffer, new_format = save_conversion(image, "", original_format, config)
+            results.append((buffer.getvalue(), new_format, original_format))
+        except Exception as e:
+            results.append(e)
+    return results